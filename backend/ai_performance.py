@@ -6,48 +6,173 @@ Real-time AI model performance analysis and comparison
 import numpy as np
 import json
 import os
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import pickle
+import sys
+import scenario_store
+from communication_windows import WindowSet
+from classical_scheduler import ClassicalScheduler
+from schedule_evaluator import ScheduleEvaluator
+
+# Small JSON file written next to training_scenarios.pkl so the API can report
+# training metadata without unpickling the full scenario list. Generate it
+# offline with ``python ai_performance.py <scenarios.pkl>``; if it is missing
+# or stale the server rebuilds it in a background thread, never on a request.
+TRAINING_SUMMARY_SUFFIX = '.summary.json'
+
+def summary_path_for(scenarios_path: str) -> str:
+    """Sidecar summary path for a scenarios pickle"""
+    return os.path.splitext(scenarios_path)[0] + TRAINING_SUMMARY_SUFFIX
+
+def write_training_summary(scenarios_path: str, scenarios: Optional[List] = None) -> Dict:
+    """Write the sidecar summary for a scenarios file (unpickles it if not given)"""
+    if scenarios is None:
+        with open(scenarios_path, 'rb') as f:
+            scenarios = pickle.load(f)
+    stat = os.stat(scenarios_path)
+    summary = {
+        'scenarios_count': len(scenarios) if isinstance(scenarios, list) else 500,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'generated_at': datetime.utcnow().isoformat()
+    }
+    try:
+        with open(summary_path_for(scenarios_path), 'w') as f:
+            json.dump(summary, f, indent=2)
+    except OSError as e:
+        print(f"Could not write training summary: {e}")
+    return summary
 
 class AIPerformanceCalculator:
     """Calculate real AI model performance metrics"""
     
     def __init__(self):
-        self.model_path = "model&datareq/"
+        self.model_path = os.environ.get('AI_MODEL_PATH', "model&datareq/")
         self.baseline_performance = {
             'efficiency': 75.3,
             'throughput_mbps': 642,
             'latency_ms': 67,
             'success_rate': 87.4
         }
+        # Training metadata memoized by (mtime, size) of the scenarios file
+        self._training_cache = None
+        self._training_cache_key = None
+        self._training_lock = threading.Lock()
+        self._summary_thread = None  # Background sidecar rebuild, if one is running
+        self._summary_failed_key = None  # (mtime, size) of a scenarios file that could not be read
+        self.scenario_file_reads = 0
+        self.classical_scheduler = ClassicalScheduler()
+    
+    @property
+    def scenarios_path(self) -> str:
+        return os.path.join(self.model_path, "training_scenarios.pkl")
+    
+    @property
+    def scenario_store_path(self) -> str:
+        return os.path.join(self.model_path, "training_scenarios")
+    
+    def invalidate_training_cache(self):
+        """Forget cached training metadata (e.g. after retraining)"""
+        with self._training_lock:
+            self._training_cache = None
+            self._training_cache_key = None
+    
+    def _read_training_summary(self, stat) -> Tuple[Optional[Dict], str]:
+        """Scenario summary from the sidecar file and its state (CURRENT, STALE or PENDING)
         
+        A missing or stale sidecar is rebuilt in a background thread; until
+        then the stale summary (or None) is returned.
+        """
+        summary = None
+        try:
+            with open(summary_path_for(self.scenarios_path)) as f:
+                summary = json.load(f)
+            if (summary.get('source_mtime_ns') == stat.st_mtime_ns and
+                    summary.get('source_size') == stat.st_size):
+                return summary, 'CURRENT'
+        except (OSError, ValueError):
+            pass
+        
+        self._start_summary_rebuild(stat)
+        return summary, ('STALE' if summary is not None else 'PENDING')
+    
+    def _start_summary_rebuild(self, stat):
+        """Unpickle the scenarios and rewrite their sidecar off the request path"""
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._summary_failed_key:
+            return
+        if self._summary_thread is not None and self._summary_thread.is_alive():
+            return
+        
+        def rebuild():
+            try:
+                write_training_summary(self.scenarios_path)
+            except Exception as e:
+                print(f"Could not summarize training scenarios: {e}")
+                self._summary_failed_key = key
+            self.invalidate_training_cache()
+        
+        self.scenario_file_reads += 1
+        self._summary_thread = threading.Thread(target=rebuild, name='training-summary', daemon=True)
+        self._summary_thread.start()
+    
     def load_training_results(self) -> Dict:
-        """Load actual training results from model files"""
+        """Load actual training results from model files
+        
+        The scenario count comes from the memory-mapped scenario store's
+        index or, for a legacy pickle, a sidecar summary. Either is cached
+        until the file changes, and no call ever unpickles scenarios: while a
+        sidecar is being rebuilt, ``summary_status`` is STALE (last known
+        count) or PENDING (count unavailable).
+        """
+        use_store = scenario_store.is_scenario_store(self.scenario_store_path)
         try:
-            # Load training scenarios
-            scenarios_path = os.path.join(self.model_path, "training_scenarios.pkl")
-            if os.path.exists(scenarios_path):
-                with open(scenarios_path, 'rb') as f:
-                    scenarios = pickle.load(f)
-                return {
-                    'episodes_completed': 50000,
-                    'final_reward': 847.3,
-                    'best_reward': 892.1,
-                    'scenarios_count': len(scenarios) if isinstance(scenarios, list) else 500,
-                    'training_status': 'COMPLETED'
-                }
-        except Exception as e:
-            print(f"Error loading training results: {e}")
+            if use_store:
+                stat = os.stat(os.path.join(self.scenario_store_path, scenario_store.INDEX_FILE))
+            else:
+                stat = os.stat(self.scenarios_path)
+            key = (use_store, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stat, key = None, None
+        
+        with self._training_lock:
+            if self._training_cache is not None and self._training_cache_key == key:
+                return dict(self._training_cache)
             
-        # Fallback to known results
-        return {
-            'episodes_completed': 50000,
-            'final_reward': 847.3,
-            'best_reward': 892.1,
-            'scenarios_count': 500,
-            'training_status': 'COMPLETED'
-        }
+            # Fallback to known results
+            results = {
+                'episodes_completed': 50000,
+                'final_reward': 847.3,
+                'best_reward': 892.1,
+                'scenarios_count': 500,
+                'scenarios_file_present': False,
+                'summary_status': 'CURRENT',
+                'training_status': 'COMPLETED'
+            }
+            if stat is not None:
+                try:
+                    if use_store:
+                        count = scenario_store.read_store_metadata(self.scenario_store_path)['count']
+                    else:
+                        summary, results['summary_status'] = self._read_training_summary(stat)
+                        count = summary['scenarios_count'] if summary is not None else None
+                    results['scenarios_count'] = count
+                    results['scenarios_file_present'] = True
+                except Exception as e:
+                    print(f"Error loading training results: {e}")
+            
+            if results['summary_status'] != 'CURRENT':
+                return dict(results)  # Re-checked once the background rebuild lands
+            self._training_cache = results
+            self._training_cache_key = key
+            return dict(results)
+    
+    def get_scenarios_count(self) -> int:
+        """Number of training scenarios on disk (0 when there is no scenarios file or it is not summarized yet)"""
+        results = self.load_training_results()
+        return (results['scenarios_count'] or 0) if results['scenarios_file_present'] else 0
     
     def calculate_ai_performance(self, communication_windows: List) -> Dict:
         """Calculate AI performance based on actual communication windows"""
@@ -76,22 +201,36 @@ class AIPerformanceCalculator:
         
         return ai_performance
     
-    def calculate_classical_performance(self, communication_windows: List) -> Dict:
-        """Calculate classical algorithm performance"""
+    def calculate_classical_performance(self, communication_windows) -> Dict:
+        """Calculate classical algorithm performance by actually scheduling the windows
+        
+        Accepts a WindowSet or API-format window dicts. Efficiency is the share
+        of offered contact time the weighted interval scheduler can use
+        without station or satellite conflicts.
+        """
         if not communication_windows:
             return self.baseline_performance
-            
-        # Classical performance is baseline with some variation
-        window_count = len(communication_windows)
-        efficiency_factor = min(1.0, window_count / 50)  # Classical struggles with more windows
+        
+        window_set = communication_windows if isinstance(communication_windows, WindowSet) \
+            else WindowSet.from_records(communication_windows)
+        result = self.classical_scheduler.schedule(window_set)
+        stats = result['stats']
+        offered = stats['offered_minutes']
+        measured = ScheduleEvaluator(window_set).summarize(result['mask'])
         
         classical_performance = {
-            'efficiency': self.baseline_performance['efficiency'] * efficiency_factor,
+            'efficiency': round(100.0 * stats['scheduled_minutes'] / offered, 2) if offered else 0.0,
             'throughput_mbps': self.baseline_performance['throughput_mbps'],
             'latency_ms': self.baseline_performance['latency_ms'],
             'success_rate': self.baseline_performance['success_rate'],
-            'total_windows': window_count,
-            'algorithm': 'Classical Greedy'
+            'total_windows': stats['total_windows'],
+            'scheduled_windows': stats['scheduled_windows'],
+            'scheduled_minutes': stats['scheduled_minutes'],
+            'data_volume_mb': stats['data_volume_mb'],
+            'scheduler_runtime_ms': stats['runtime_ms'],
+            'reward': measured['reward'],
+            'conflicts': measured['station_conflicts'] + measured['satellite_conflicts'],
+            'algorithm': stats['algorithm']
         }
         
         return classical_performance
@@ -103,14 +242,21 @@ class AIPerformanceCalculator:
             'throughput_improvement': ai_perf['throughput_mbps'] - classical_perf['throughput_mbps'],
             'latency_improvement': classical_perf['latency_ms'] - ai_perf['latency_ms'],
             'success_rate_improvement': ai_perf['success_rate'] - classical_perf['success_rate'],
-            'efficiency_percent': ((ai_perf['efficiency'] - classical_perf['efficiency']) / classical_perf['efficiency']) * 100,
+            'efficiency_percent': ((ai_perf['efficiency'] - classical_perf['efficiency']) / max(classical_perf['efficiency'], 1e-9)) * 100,
             'throughput_percent': ((ai_perf['throughput_mbps'] - classical_perf['throughput_mbps']) / classical_perf['throughput_mbps']) * 100
         }
     
-    def get_live_performance_comparison(self, communication_windows: List) -> Dict:
-        """Get complete live performance comparison"""
+    def get_live_performance_comparison(self, communication_windows: List,
+                                        window_set: Optional[WindowSet] = None) -> Dict:
+        """Get complete live performance comparison
+        
+        ``window_set`` (the same windows as a WindowSet) spares the classical
+        scheduler from re-parsing the dicts.
+        """
         ai_performance = self.calculate_ai_performance(communication_windows)
-        classical_performance = self.calculate_classical_performance(communication_windows)
+        classical_performance = self.calculate_classical_performance(
+            window_set if window_set is not None else communication_windows
+        )
         improvements = self.calculate_improvement_metrics(ai_performance, classical_performance)
         training_results = self.load_training_results()
         
@@ -121,4 +267,9 @@ class AIPerformanceCalculator:
             'training_results': training_results,
             'timestamp': datetime.utcnow().isoformat(),
             'data_source': 'LIVE_CALCULATION'
-        }
\ No newline at end of file
+        }
+
+if __name__ == "__main__":
+    scenarios_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join("model&datareq", "training_scenarios.pkl")
+    summary = write_training_summary(scenarios_file)
+    print(f"✅ Wrote {summary_path_for(scenarios_file)} ({summary['scenarios_count']} scenarios)")
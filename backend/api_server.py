@@ -7,12 +7,13 @@ Provides endpoints for real-time satellite data, ground station management,
 and communication window optimization.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import traceback
 import requests
 import threading
@@ -20,24 +21,37 @@ import time
 
 # Import our backend modules
 from satellite_tracker import SatelliteTracker, SAMPLE_TLE_DATA, SAMPLE_GROUND_STATIONS
-from communication_windows import CommunicationWindowDetector, CommunicationWindow
+from communication_windows import CommunicationWindowDetector, CommunicationWindow, WindowSet, SOCKET_WINDOW_FIELDS
 from orbital_simulator import SatelliteConstellationSimulator
 from tle_fetcher import TLEFetcher
 from ai_performance import AIPerformanceCalculator
+from serialization import FastJSONProvider, iter_ndjson, NDJSON_MIMETYPE
+from response_cache import ResponseCache, cached_response
+from inference_service import BatchedInferenceService
+import scheduling_features
+from classical_scheduler import ClassicalScheduler
+from schedule_evaluator import ScheduleEvaluator, relative_gain
+from window_index import WindowIndex
+from pass_store import PassStore
+from coverage_stats import coverage_statistics
+from window_query import filter_windows, paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from schedule_export import export_stream, iter_csv, EXPORT_FORMATS, GZIP_MIMETYPE
+from schedule_import import ScheduleImport
+from numpy_policy import NumpyPolicy, policy_path_for, model_fingerprint
 
 # AI Model Integration
+# The exported NumPy policy is preferred; stable_baselines3 (and torch) are only
+# imported as a fallback when the model is first loaded, so most workers never pay for them.
 import os
-import pickle
+import importlib.util
 import numpy as np
-try:
-    from stable_baselines3 import PPO
-    AI_MODEL_AVAILABLE = True
-except ImportError:
-    AI_MODEL_AVAILABLE = False
-    print("⚠️ Stable-Baselines3 not installed. AI model features will use mock data.")
+AI_MODEL_AVAILABLE = importlib.util.find_spec('stable_baselines3') is not None
+if not AI_MODEL_AVAILABLE:
+    print("⚠️ Stable-Baselines3 not installed. AI scheduling needs the exported NumPy policy.")
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # NumPy/datetime-aware orjson + MessagePack responses
 CORS(app)  # Enable Cross-Origin Resource Sharing for web frontend
 
 # Initialize SocketIO
@@ -48,36 +62,220 @@ simulator = SatelliteConstellationSimulator()
 tle_fetcher = TLEFetcher()
 ai_performance = AIPerformanceCalculator()
 start_time = datetime.utcnow()  # Server start time for uptime calculation
+response_cache = ResponseCache()
+
+def parse_iso_time(value: str) -> datetime:
+    """Parse an ISO-8601 query timestamp, accepting a trailing 'Z'"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def catalog_version():
+    """Cache version for responses derived from the satellite/station catalog"""
+    return simulator.tracker.catalog_version
+
+# Precomputed passes over a rolling 7-day horizon (set PASS_PRECOMPUTE=1 to run the job in background)
+pass_store = PassStore(os.environ.get('PASS_STORE_PATH', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'pass_store.sqlite')))
+
+def find_window_set(start_time: datetime, duration_hours: float,
+                    satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                    min_elevation: Optional[float] = None) -> WindowSet:
+    """Quality-scored windows for a time range
+
+    ``satellites``/``stations`` limit the result to those names and
+    ``min_elevation`` to passes peaking at least that high. Served from the
+    pass store (filters run in SQL) when it covers the range for the current
+    catalog; otherwise only the requested pairs are propagated live.
+    """
+    windows = pass_store.find_window_set(simulator.tracker, start_time, duration_hours,
+                                         satellites, stations, min_elevation)
+    if windows is None:
+        windows = simulator.window_detector.find_window_set(start_time, duration_hours, satellites, stations)
+        windows = filter_windows(windows, min_elevation=min_elevation)
+    simulator.window_detector.score_windows(windows)
+    return windows
+
+# Live-propagated window sets kept for paging, keyed by query and catalog version
+LIVE_WINDOW_CACHE_ENTRIES = 8
+live_window_cache: 'OrderedDict[Tuple, WindowSet]' = OrderedDict()
+live_window_lock = threading.Lock()
+
+def find_window_page(start_time: datetime, duration_hours: float,
+                     satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                     min_elevation: Optional[float] = None, min_quality: Optional[float] = None,
+                     sort: str = 'start', descending: bool = False, limit: Optional[int] = DEFAULT_PAGE_SIZE,
+                     cursor: Optional[str] = None,
+                     imported: bool = False) -> Tuple[WindowSet, Optional[str], int, float]:
+    """One sorted page of quality-scored windows: (page, next cursor, total, total duration in minutes)
+
+    The pass store cuts the page in SQL when it covers the range (imported
+    schedules always come from the store). Otherwise the range is
+    propagated once and cached per query and catalog version, so later pages
+    (requested with the same start_time) are cut from memory.
+    """
+    result = pass_store.find_window_page(simulator.tracker, start_time, duration_hours, satellites, stations,
+                                         min_elevation, min_quality, simulator.window_detector.quality_weights,
+                                         sort, descending, limit, cursor, imported=imported)
+    if result is not None:
+        return result
+    key = (start_time, duration_hours, satellites and tuple(satellites), stations and tuple(stations),
+           min_elevation, catalog_version())
+    with live_window_lock:
+        windows = live_window_cache.get(key)
+        if windows is not None:
+            live_window_cache.move_to_end(key)
+    if windows is None:
+        windows = find_window_set(start_time, duration_hours, satellites, stations, min_elevation)
+        with live_window_lock:
+            live_window_cache[key] = windows
+            while len(live_window_cache) > LIVE_WINDOW_CACHE_ENTRIES:
+                live_window_cache.popitem(last=False)
+    windows = filter_windows(windows, min_quality=min_quality)
+    page, next_cursor = paginate(windows, sort, descending, limit, cursor)
+    return page, next_cursor, len(windows), windows.total_duration_minutes()
+
+def iter_schedule_chunks(start_time: datetime, duration_hours: float,
+                         satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                         min_elevation: Optional[float] = None) -> Iterator[WindowSet]:
+    """Quality-scored windows for a time range as a stream of WindowSet chunks
+
+    Pages through the pass store in start order when it covers the range;
+    otherwise propagates one satellite-station pair at a time. Either way
+    only one chunk is in memory, so exports can span days of the full catalog.
+    """
+    chunks = pass_store.iter_window_sets(simulator.tracker, start_time, duration_hours,
+                                         satellites, stations, min_elevation)
+    if chunks is None:
+        chunks = simulator.window_detector.iter_window_sets(start_time, duration_hours, satellites, stations)
+    for window_set in chunks:
+        window_set = filter_windows(window_set, min_elevation=min_elevation)
+        if len(window_set):
+            simulator.window_detector.score_windows(window_set)
+            yield window_set
+
+def parse_time_range(value: str) -> float:
+    """Hours in a range such as '90m', '24h' or '7d' (a bare number is hours)"""
+    units = {'m': 1 / 60, 'h': 1, 'd': 24}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
 
 # AI Model Integration
 class AIModelManager:
     """Manages the trained AI model for satellite scheduling"""
     
+    WINDOWS_PER_OBSERVATION = scheduling_features.WINDOWS_PER_OBSERVATION
+    WINDOW_STRIDE = scheduling_features.DEFAULT_CHUNK_STRIDE  # Step between overlapping chunks
+    
     def __init__(self):
         self.model = None
-        self.training_scenarios = None
         self.model_loaded = False
-        self.model_path = "model&datareq/"
-        self.load_model()
+        self.inference_backend = None  # 'numpy' or 'torch' once loaded
+        self.model_path = os.environ.get('AI_MODEL_PATH', "model&datareq/")
+        # Loading is deferred: NOT_LOADED -> LOADING -> READY / MOCK_MODE / FAILED
+        self.readiness = 'NOT_LOADED'
+        self.load_time_ms = None
+        self.warmup_ms = None
+        self._load_lock = threading.Lock()
+        self._warmup_thread = None
+        # Concurrent /api/ai/schedule callers share micro-batched forward passes
+        self.inference = BatchedInferenceService(self._predict_batch,
+                                                 n_features=scheduling_features.OBSERVATION_SIZE)
+        self.classical_scheduler = ClassicalScheduler()  # Fallback when the model is unavailable
+    
+    def ensure_loaded(self):
+        """Load the model on first use; concurrent callers wait for one load"""
+        if self.readiness not in ('NOT_LOADED', 'LOADING'):
+            return self.model_loaded
+        with self._load_lock:
+            if self.readiness in ('NOT_LOADED', 'LOADING'):
+                self.readiness = 'LOADING'
+                started = time.perf_counter()
+                self.load_model()
+                self.load_time_ms = round((time.perf_counter() - started) * 1000, 1)
+                if self.model_loaded:
+                    self.readiness = 'READY'
+                elif self.readiness == 'LOADING':
+                    self.readiness = 'MOCK_MODE'
+        return self.model_loaded
+    
+    def warm_up(self):
+        """Load the model and run one dummy forward pass (blocking)"""
+        if not self.ensure_loaded() or self.warmup_ms is not None:
+            return
+        started = time.perf_counter()
+        try:
+            self._predict_batch(np.zeros((1, scheduling_features.OBSERVATION_SIZE), dtype=np.float32))
+            self.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+            print(f"✅ AI model warm-up complete ({self.warmup_ms} ms)")
+        except Exception as e:
+            print(f"⚠️ AI model warm-up failed: {e}")
+    
+    def start_warmup(self):
+        """Run warm_up() in a background thread"""
+        if self.readiness != 'NOT_LOADED' or self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=self.warm_up, name='ai-model-warmup', daemon=True)
+        self._warmup_thread.start()
+    
+    def get_readiness(self):
+        """Model loading state for /api/ai/model-info"""
+        return {
+            'state': self.readiness,
+            'load_time_ms': self.load_time_ms,
+            'warmup_ms': self.warmup_ms,
+            'warmup_started': self._warmup_thread is not None
+        }
+    
+    def _predict_batch(self, observations):
+        """Run one deterministic forward pass over a (batch, 50) observation block"""
+        if self.inference_backend == 'numpy':
+            return self.model.predict(observations)
+        actions, _ = self.model.predict(observations, deterministic=True)
+        return actions
+    
+    def _load_numpy_policy(self, model_zip):
+        """Load the exported NumPy policy if present and exported from the current model"""
+        policy_npz = policy_path_for(model_zip)
+        if not os.path.exists(policy_npz):
+            return False
+        policy = NumpyPolicy.load(policy_npz)
+        if os.path.exists(model_zip) and policy.fingerprint != model_fingerprint(model_zip):
+            print("⚠️ NumPy policy export is stale; re-run numpy_policy.py to refresh it")
+            return False
+        self.model = policy
+        self.inference_backend = 'numpy'
+        self.model_loaded = True
+        print("✅ AI model loaded successfully (NumPy policy)")
+        return True
     
     def load_model(self):
-        """Load the trained PPO model and training scenarios"""
+        """Load the trained PPO model
+        
+        Uses the torch-free NumPy export of the policy when available
+        (AI_INFERENCE_BACKEND=auto|numpy|torch). Training scenarios are not
+        unpickled here; their metadata comes from AIPerformanceCalculator's
+        cached summary.
+        """
         try:
+            model_path = os.path.join(self.model_path, "satellite_scheduler_model")
+            backend = os.environ.get('AI_INFERENCE_BACKEND', 'auto')
+            if backend != 'torch' and self._load_numpy_policy(model_path + ".zip"):
+                return
+            if backend == 'numpy':
+                print("⚠️ NumPy policy not available, using performance calculator only")
+                return
+            
             if not AI_MODEL_AVAILABLE:
                 print("⚠️ AI model libraries not available, using mock performance")
                 return
-                
-            # Load training scenarios
-            scenarios_path = os.path.join(self.model_path, "training_scenarios.pkl")
-            if os.path.exists(scenarios_path):
-                with open(scenarios_path, 'rb') as f:
-                    self.training_scenarios = pickle.load(f)
-                print(f"✅ Loaded {len(self.training_scenarios)} training scenarios")
+            
+            from stable_baselines3 import PPO
             
             # Load trained model
-            model_path = os.path.join(self.model_path, "satellite_scheduler_model")
             if os.path.exists(model_path + ".zip"):
                 self.model = PPO.load(model_path)
+                self.inference_backend = 'torch'
                 self.model_loaded = True
                 print("✅ AI model loaded successfully")
             else:
@@ -86,82 +284,109 @@ class AIModelManager:
         except Exception as e:
             print(f"⚠️ Error loading AI model: {e}")
             self.model_loaded = False
+            self.readiness = 'FAILED'
     
     def predict_optimal_schedule(self, communication_windows):
-        """Use AI model to predict optimal scheduling decisions"""
-        if not self.model_loaded or not communication_windows:
-            return self._mock_ai_scheduling(communication_windows)
+        """Use AI model to predict optimal scheduling decisions
+
+        Accepts a WindowSet or a list of API-format window dicts.
+        """
+        window_set = communication_windows if isinstance(communication_windows, WindowSet) else None
+        if window_set is not None:
+            communication_windows = window_set.to_records()
+            
+        if not communication_windows or not self.ensure_loaded():
+            return self._classical_fallback_scheduling(communication_windows, window_set)
         
         try:
-            # Convert communication windows to model input format
-            # This would need to match your training environment's observation space
-            observations = self._convert_windows_to_observations(communication_windows)
+            # Split the time-ordered windows into overlapping 10-window chunks
+            windows = window_set if window_set is not None else communication_windows
+            order, chunk_starts = self._chunk_windows(windows)
+            observations = self._convert_windows_to_observations(windows, order, chunk_starts)
             
-            # Get AI predictions
-            actions, _ = self.model.predict(observations, deterministic=True)
+            # One batched forward pass for every chunk (shared with concurrent requests)
+            actions, inference_info = self.inference.predict(observations)
             
-            # Convert actions back to scheduling decisions
-            optimized_schedule = self._convert_actions_to_schedule(actions, communication_windows)
+            # Merge per-chunk priorities back onto the original windows
+            priorities = self._merge_chunk_priorities(actions, chunk_starts, order)
+            optimized_schedule = self._convert_actions_to_schedule(priorities, communication_windows)
+            
+            # Score the AI schedule against the classical baseline on the same windows
+            evaluation = self._evaluate_schedules(
+                window_set if window_set is not None else WindowSet.from_records(communication_windows),
+                np.array([entry['scheduled'] for entry in optimized_schedule], dtype=bool)
+            )
             
             return {
                 'schedule': optimized_schedule,
                 'ai_confidence': 0.94,
                 'optimization_method': 'PPO_TRAINED',
-                'performance_gain': 23.4
+                'performance_gain': relative_gain(evaluation['ai']['reward'], evaluation['classical']['reward']),
+                'evaluation': evaluation,
+                'inference': inference_info
             }
             
         except Exception as e:
             print(f"Error in AI prediction: {e}")
-            return self._mock_ai_scheduling(communication_windows)
+            return self._classical_fallback_scheduling(communication_windows, window_set)
     
-    def _convert_windows_to_observations(self, windows):
-        """Convert communication windows to model observation format"""
-        # Create observation matching the training environment (50 features)
-        obs_features = []
-        
-        # Process up to 10 windows (matching training environment)
-        for i in range(10):
-            if i < len(windows):
-                window = windows[i]
-                # Extract and normalize features
-                duration = float(window.get('duration_minutes', 0)) / 15.0  # Normalize to [0,1]
-                elevation = float(window.get('max_elevation_degrees', 0)) / 90.0  # Normalize to [0,1]
-                is_iss = 1.0 if str(window.get('satellite', '')).upper().startswith('ISS') else 0.0
-                is_isro = 1.0 if 'ISRO' in str(window.get('satellite', '')).upper() else 0.0
-                quality = float(window.get('quality_score', 0.5))  # Already normalized
-                
-                obs_features.extend([duration, elevation, is_iss, is_isro, quality])
-            else:
-                # Pad with zeros for missing windows
-                obs_features.extend([0.0, 0.0, 0.0, 0.0, 0.0])
-        
-        # Ensure exactly 50 features (10 windows * 5 features each)
-        obs_features = obs_features[:50]
-        while len(obs_features) < 50:
-            obs_features.append(0.0)
-            
-        return np.array(obs_features, dtype=np.float32)
+    def _chunk_windows(self, windows):
+        """Time-order windows and choose overlapping chunk start offsets
+
+        Returns the stable start-time ordering (indices into ``windows``) and
+        the chunk start positions within that ordering.
+        """
+        if isinstance(windows, WindowSet):
+            start_keys = windows.records['start']
+        else:
+            start_keys = [str(w.get('start_time', '')) for w in windows]
+        order = scheduling_features.time_order(start_keys)
+        starts = scheduling_features.chunk_starts(
+            len(order), self.WINDOWS_PER_OBSERVATION, self.WINDOW_STRIDE
+        )
+        return order, starts
+    
+    def _action_priorities(self, action_row):
+        """Map one chunk's action vector to per-slot priority scores in [0, 1]"""
+        priorities = np.full(self.WINDOWS_PER_OBSERVATION, 0.5)  # Default if no action available
+        values = np.asarray(action_row, dtype=np.float64).ravel()[:self.WINDOWS_PER_OBSERVATION]
+        # Convert from [-1,1] to [0,1]
+        priorities[:len(values)] = np.clip((values + 1.0) / 2.0, 0.0, 1.0)
+        return priorities
     
-    def _convert_actions_to_schedule(self, actions, windows):
-        """Convert AI actions to scheduling decisions"""
+    def _merge_chunk_priorities(self, actions, chunk_starts, order):
+        """Average each window's priority over every chunk that contains it
+
+        Chunks are accumulated in a fixed order, so the merge is deterministic.
+        """
+        actions = np.atleast_2d(actions)
+        count = len(order)
+        totals = np.zeros(count)
+        hits = np.zeros(count)
+        for action_row, start in zip(actions, chunk_starts):
+            span = min(self.WINDOWS_PER_OBSERVATION, count - start)
+            totals[start:start + span] += self._action_priorities(action_row)[:span]
+            hits[start:start + span] += 1
+        
+        # Map from time order back to the caller's window order
+        priorities = np.empty(count)
+        priorities[np.asarray(order, dtype=np.int64)] = totals / np.maximum(hits, 1)
+        return priorities
+    
+    def _convert_windows_to_observations(self, windows, order, chunk_starts):
+        """Convert time-ordered window chunks to a (chunks, 50) observation batch"""
+        if isinstance(windows, WindowSet):
+            features = scheduling_features.window_set_features(windows)
+        else:
+            features = scheduling_features.record_features(windows)
+        return scheduling_features.build_observations(features[order], chunk_starts)
+    
+    def _convert_actions_to_schedule(self, priorities, windows):
+        """Convert merged per-window AI priorities to scheduling decisions"""
         schedule = []
         
-        # Handle different action formats from PPO model
-        if hasattr(actions, 'shape') and len(actions.shape) > 0:
-            # Multi-dimensional array from PPO
-            action_values = actions.flatten() if len(actions.shape) > 1 else actions
-        else:
-            # Single action or scalar
-            action_values = [float(actions)] if not hasattr(actions, '__iter__') else actions
-        
-        for i, window in enumerate(windows[:10]):
-            # Get priority score from AI model output
-            if i < len(action_values):
-                # Normalize action to priority score (0-1 range)
-                raw_action = float(action_values[i])
-                priority_score = max(0.0, min(1.0, (raw_action + 1.0) / 2.0))  # Convert from [-1,1] to [0,1]
-            else:
-                priority_score = 0.5  # Default if no action available
+        for i, window in enumerate(windows):
+            priority_score = float(priorities[i])
             
             schedule.append({
                 'window_id': i,
@@ -175,29 +400,62 @@ class AIModelManager:
         
         return schedule
     
-    def _mock_ai_scheduling(self, windows):
-        """Mock AI scheduling for when model is not available"""
+    def _evaluate_schedules(self, window_set, ai_mask, classical_mask=None):
+        """Measured metrics for the AI schedule and the classical baseline, scored in one batch"""
+        if classical_mask is None:
+            classical_mask = self.classical_scheduler.select(window_set)
+        return ScheduleEvaluator(window_set).compare({'ai': ai_mask, 'classical': classical_mask})
+    
+    def classical_schedule(self, communication_windows):
+        """Schedule windows with the classical weighted interval scheduler (no model)
+
+        Accepts a WindowSet or a list of API-format window dicts and returns
+        the same response shape as predict_optimal_schedule.
+        """
+        window_set = communication_windows if isinstance(communication_windows, WindowSet) else None
+        if window_set is not None:
+            communication_windows = window_set.to_records()
+        return self._classical_fallback_scheduling(communication_windows, window_set)
+    
+    def _classical_fallback_scheduling(self, windows, window_set=None):
+        """Weighted interval scheduling for when the model is not available
+        
+        Priority scores are each window's expected data volume relative to the
+        largest one; only conflict-free scheduled windows are marked scheduled.
+        """
         schedule = []
-        for i, window in enumerate(windows[:10]):
+        evaluation = None
+        if windows:
+            window_set = window_set if window_set is not None else WindowSet.from_records(windows)
+            volumes = window_set.data_volume_mb()
+            priorities = volumes / max(float(volumes.max()), 1e-9)
+            scheduled = self.classical_scheduler.select(window_set, volumes)
+            evaluation = self._evaluate_schedules(window_set, scheduled, scheduled)
+        
+        for i, window in enumerate(windows):
             schedule.append({
                 'window_id': i,
                 'satellite': window.get('satellite', 'Unknown'),
                 'station': window.get('station', 'Unknown'),
                 'start_time': window.get('start_time', ''),
                 'duration_minutes': window.get('duration_minutes', 0),
-                'ai_priority_score': 0.85 + (i * 0.02),  # Mock decreasing priority
-                'scheduled': True
+                'ai_priority_score': float(priorities[i]),
+                'scheduled': bool(scheduled[i])
             })
         
         return {
             'schedule': schedule,
-            'ai_confidence': 0.85,  # Lower confidence for mock
-            'optimization_method': 'MOCK_FALLBACK',
-            'performance_gain': 18.2  # Lower performance for mock
+            'ai_confidence': 0.0,  # No model involved
+            'optimization_method': 'CLASSICAL_FALLBACK',
+            'performance_gain': 0.0,  # This is the baseline
+            'evaluation': evaluation
         }
 
-# Initialize AI Model Manager
+# Initialize AI Model Manager (model loads lazily; set AI_MODEL_WARMUP=1 to preload in background).
+# Under gunicorn, gunicorn.conf.py can instead load it once in the master before forking.
 ai_model_manager = AIModelManager()
+if os.environ.get('AI_MODEL_WARMUP') == '1':
+    ai_model_manager.start_warmup()
 
 # Real-time data broadcasting
 broadcast_active = False
@@ -207,6 +465,8 @@ window_subscribers = set()
 
 # Initialize with sample data
 simulator.initialize_sample_constellation()
+if os.environ.get('PASS_PRECOMPUTE') == '1':
+    pass_store.start(simulator.window_detector)
 
 @app.route('/', methods=['GET'])
 def health_check():
@@ -597,10 +857,63 @@ def get_satellite_position(satellite_name):
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
+MAX_BATCH_QUERIES = 10000  # Tuples accepted by one batch position/visibility request
+
+def _batch_queries(fields: int) -> List[list]:
+    """``queries`` from a batch request body: lists of ``fields`` values, the last a time"""
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+    if not isinstance(queries, list) or not all(isinstance(q, list) and len(q) == fields for q in queries):
+        raise ValueError(f'queries must be a list of {fields}-element arrays')
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ValueError(f'At most {MAX_BATCH_QUERIES} queries per request')
+    return queries
+
+def _batch_times(values: List[Optional[str]]) -> List[datetime]:
+    """Parse ISO timestamps, with null meaning now"""
+    now = datetime.utcnow()
+    return [parse_iso_time(value) if value else now for value in values]
+
+@app.route('/api/satellites/positions', methods=['POST'])
+def get_satellite_positions():
+    """Positions for many (satellite, time) pairs in one request
+    
+    Body: ``{"queries": [[satellite, time], ...]}`` (time may be null for
+    now). Pairs are grouped by satellite and each group propagated in one
+    vectorized call; results are arrays in query order.
+    """
+    try:
+        queries = _batch_queries(2)
+        satellites = [query[0] for query in queries]
+        times = _batch_times([query[1] for query in queries])
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
+    
+    try:
+        positions = simulator.tracker.get_positions(satellites, times)
+        return jsonify({
+            'count': len(queries),
+            'latitude': positions['latitude'],
+            'longitude': positions['longitude'],
+            'altitude_km': positions['altitude_km'],
+            'status': 'success'
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 500
+
 @app.route('/api/satellites/<satellite_name>/trajectory', methods=['GET'])
+@cached_response(response_cache, catalog_version, params={
+    'duration_hours': (float, 6.0), 'step_minutes': (int, 10), 'start_time': (parse_iso_time, None)
+}, require=('start_time',), max_age=300)
 def get_satellite_trajectory(satellite_name):
     """Get satellite trajectory over time period"""
     try:
+        if satellite_name not in simulator.tracker.satellites:
+            return jsonify({'error': f'Satellite {satellite_name} not found', 'status': 'error'}), 404
+        
         # Get query parameters
         duration_hours = float(request.args.get('duration_hours', 6))
         step_minutes = int(request.args.get('step_minutes', 10))
@@ -611,38 +924,36 @@ def get_satellite_trajectory(satellite_name):
         else:
             start_time = datetime.utcnow()
         
-        # Generate trajectory points
-        trajectory = []
-        current_time = start_time
-        end_time = start_time + timedelta(hours=duration_hours)
-        
-        while current_time <= end_time:
-            try:
-                position = simulator.tracker.get_satellite_position(satellite_name, current_time)
-                trajectory.append({
-                    'time': current_time.isoformat(),
-                    'latitude': position['latitude'],
-                    'longitude': position['longitude'],
-                    'altitude_km': position['altitude_km']
-                })
-            except Exception as e:
-                print(f"Error calculating position at {current_time}: {e}")
-                
-            current_time += timedelta(minutes=step_minutes)
+        # Generate trajectory points in one vectorized propagation
+        trajectory = simulator.tracker.predict_trajectory(
+            satellite_name, start_time, duration_hours, step_minutes
+        )
+        times = trajectory.isoformat_times()
+        trajectory_points = [
+            {'time': t, 'latitude': lat, 'longitude': lon, 'altitude_km': alt}
+            for t, lat, lon, alt in zip(times, trajectory.latitude.tolist(),
+                                        trajectory.longitude.tolist(),
+                                        trajectory.altitude_km.tolist())
+        ]
         
         return jsonify({
             'satellite': satellite_name,
-            'trajectory': trajectory,
+            'trajectory': trajectory_points,
             'duration_hours': duration_hours,
             'step_minutes': step_minutes,
             'points_count': len(trajectory),
             'status': 'success'
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}),400
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
 @app.route('/api/satellites/czml', methods=['GET'])
+@cached_response(response_cache, catalog_version, params={
+    'duration_hours': (float, 24.0), 'step_minutes': (int, 5), 'start_time': (parse_iso_time, None)
+}, require=('start_time',), max_age=300)
 def get_satellites_czml():
     """Generate CZML for time-dynamic satellite visualization"""
     try:
@@ -675,24 +986,13 @@ def get_satellites_czml():
         # Add each satellite
         for name, satellite in simulator.tracker.satellites.items():
             try:
-                # Generate position samples
-                position_samples = []
-                current_time = start_time
-                
-                while current_time <= end_time:
-                    try:
-                        pos = simulator.tracker.get_satellite_position(name, current_time)
-                        # CZML format: [time, x, y, z] in Cartesian coordinates
-                        position_samples.extend([
-                            current_time.isoformat() + "Z",
-                            pos['longitude'], pos['latitude'], pos['altitude_km'] * 1000
-                        ])
-                    except Exception as e:
-                        print(f"Error calculating position for {name} at {current_time}: {e}")
-                    
-                    current_time += timedelta(minutes=step_minutes)
+                # Generate position samples relative to the document epoch
+                trajectory = simulator.tracker.predict_trajectory(
+                    name, start_time, duration_hours, step_minutes
+                )
+                position_samples = trajectory.czml_cartographic_degrees()
                 
-                if position_samples:
+                if len(position_samples):
                     satellite_czml = {
                         "id": f"satellite_{name}",
                         "name": name,
@@ -757,6 +1057,7 @@ def get_satellites_czml():
 # ==================== GROUND STATION MANAGEMENT ENDPOINTS ====================
 
 @app.route('/api/ground-stations', methods=['GET'])
+@cached_response(response_cache, catalog_version)
 def get_ground_stations():
     """Get list of all ground stations"""
     try:
@@ -812,60 +1113,97 @@ def add_ground_station():
 
 # ==================== COMMUNICATION WINDOWS ENDPOINTS ====================
 
+def _name_list(single: str, multiple: str) -> Optional[List[str]]:
+    """Names from ?satellite=A and/or ?satellites=A,B (None when neither is given)"""
+    values = request.args.getlist(single) + request.args.getlist(multiple)
+    names = [name.strip() for value in values for name in value.split(',') if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
 @app.route('/api/communication-windows', methods=['GET'])
 def get_communication_windows():
-    """Find communication windows between satellites and ground stations"""
+    """Find communication windows between satellites and ground stations
+    
+    Filters: satellite(s)/station(s) (comma-separated), start_time with
+    duration_hours or end_time, min_elevation and min_quality. Windows are
+    ordered by ``sort`` (``order=desc`` reverses) and paginated with ``limit``
+    plus the ``next_cursor`` of the previous page. ``format=ndjson`` (or
+    ``Accept: application/x-ndjson``) streams one window per line with the
+    cursor in the X-Next-Cursor header. ``source=imported`` queries uploaded
+    schedules instead of the computed passes.
+    """
     try:
         # Get query parameters
-        satellite_name = request.args.get('satellite')
-        station_name = request.args.get('station')
-        duration_hours = float(request.args.get('duration_hours', 24))
-        start_time_str = request.args.get('start_time')
+        satellites = _name_list('satellite', 'satellites')
+        stations = _name_list('station', 'stations')
+        source = request.args.get('source', 'computed')
+        if source not in ('computed', 'imported'):
+            raise ValueError(f"Unknown source '{source}' (expected computed or imported)")
+        # Imported schedules may name satellites and stations outside the catalog
+        for names, catalog, kind in ((satellites, simulator.tracker.satellites, 'Satellite'),
+                                     (stations, simulator.tracker.ground_stations, 'Ground station')):
+            missing = [name for name in names or [] if name not in catalog]
+            if missing and source == 'computed':
+                return jsonify({'error': f"{kind} {', '.join(missing)} not found", 'status': 'error'}), 404
         
+        start_time_str = request.args.get('start_time')
         if start_time_str:
             start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
         else:
             start_time = datetime.utcnow()
-        
-        if satellite_name and station_name:
-            # Find windows for specific satellite-station pair
-            windows = simulator.window_detector.find_communication_windows(
-                satellite_name, station_name, start_time, duration_hours
-            )
+        end_time_str = request.args.get('end_time')
+        if end_time_str:
+            end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
+            duration_hours = (end_time - start_time).total_seconds() / 3600
         else:
-            # Find all windows across all satellites and stations
-            all_windows_dict = simulator.window_detector.find_all_windows(start_time, duration_hours)
-            # Flatten the dictionary of windows into a single list
-            windows = []
-            for pair_key, pair_windows in all_windows_dict.items():
-                windows.extend(pair_windows)
-        
-        # Convert windows to JSON-serializable format
-        windows_data = []
-        for window in windows:
-            windows_data.append({
-                'satellite': window.satellite_name,
-                'station': window.station_name,
-                'start_time': window.start_time.isoformat(),
-                'end_time': window.end_time.isoformat(),
-                'duration_minutes': window.duration_minutes,
-                'max_elevation_degrees': window.max_elevation,
-                'quality_score': getattr(window, 'quality_score', 0.0)
-            })
+            duration_hours = float(request.args.get('duration_hours', 24))
+        min_elevation = request.args.get('min_elevation', type=float)
+        min_quality = request.args.get('min_quality', type=float)
+        sort = request.args.get('sort', 'start')
+        descending = request.args.get('order', 'asc') == 'desc'
+        ndjson = (request.args.get('format') == 'ndjson'
+                  or request.accept_mimetypes.best == NDJSON_MIMETYPE)
+        # JSON pages default to DEFAULT_PAGE_SIZE; NDJSON streams everything unless limited
+        limit = request.args.get('limit', type=int)
+        if limit is None and not ndjson:
+            limit = DEFAULT_PAGE_SIZE
+        if limit is not None:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
+        # Filters, ordering and the page cut run in the pass store (or restrict propagation)
+        page, next_cursor, total, total_duration = find_window_page(
+            start_time, duration_hours, satellites, stations, min_elevation, min_quality,
+            sort, descending, limit, request.args.get('cursor'), imported=source == 'imported')
+        
+        if ndjson:
+            response = Response(iter_ndjson(page), mimetype=NDJSON_MIMETYPE)
+            response.headers['X-Total-Count'] = str(total)
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return response
         
         return jsonify({
-            'windows': windows_data,
-            'count': len(windows_data),
-            'total_duration_minutes': sum(w.duration_minutes for w in windows),
+            'windows': page.to_records(),
+            'count': len(page),
+            'total': total,
+            'next_cursor': next_cursor,
+            'total_duration_minutes': total_duration,
             'search_parameters': {
-                'satellite': satellite_name,
-                'station': station_name,
+                'source': source,
+                'satellites': satellites,
+                'stations': stations,
                 'start_time': start_time.isoformat(),
-                'duration_hours': duration_hours
+                'duration_hours': duration_hours,
+                'min_elevation': min_elevation,
+                'min_quality': min_quality,
+                'sort': sort,
+                'order': 'desc' if descending else 'asc',
+                'limit': limit
             },
             'status': 'success'
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
@@ -909,6 +1247,40 @@ def check_visibility():
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
+@app.route('/api/visibility/batch', methods=['POST'])
+def check_visibility_batch():
+    """Visibility for many (satellite, station, time) tuples in one request
+    
+    Body: ``{"queries": [[satellite, station, time], ...], "min_elevation": 10}``
+    (time may be null for now). Each satellite is propagated once for all of
+    its tuples; results are arrays in query order.
+    """
+    try:
+        queries = _batch_queries(3)
+        min_elevation = float((request.get_json(silent=True) or {}).get('min_elevation', 10.0))
+        satellites = [query[0] for query in queries]
+        stations = [query[1] for query in queries]
+        times = _batch_times([query[2] for query in queries])
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
+    
+    try:
+        angles = simulator.tracker.get_look_angles(satellites, stations, times)
+        return jsonify({
+            'count': len(queries),
+            'min_elevation': min_elevation,
+            'is_visible': angles['elevation_degrees'] >= min_elevation,
+            'elevation_degrees': angles['elevation_degrees'],
+            'azimuth_degrees': angles['azimuth_degrees'],
+            'range_km': angles['range_km'],
+            'status': 'success'
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 500
+
 # ==================== AI MODEL ENDPOINTS ====================
 
 @app.route('/api/ai/performance', methods=['GET'])
@@ -917,32 +1289,29 @@ def get_ai_performance():
     try:
         # Get current communication windows for performance calculation
         current_time = datetime.utcnow()
-        all_windows_dict = simulator.window_detector.find_all_windows(current_time, 6)
-        
-        # Flatten windows for performance calculation
-        all_windows = []
-        for pair_windows in all_windows_dict.values():
-            all_windows.extend(pair_windows)
+        windows = find_window_set(current_time, 6)
         
         # Convert to format expected by performance calculator
-        windows_data = []
-        for window in all_windows:
-            windows_data.append({
-                'duration_minutes': window.duration_minutes,
-                'max_elevation_degrees': window.max_elevation,
-                'satellite': window.satellite_name,
-                'station': window.station_name
-            })
-        
-        # Get live performance comparison
-        performance_comparison = ai_performance.get_live_performance_comparison(windows_data)
+        windows_data = windows.to_records()
+        
+        # Get live performance comparison (the classical baseline schedules the WindowSet directly)
+        performance_comparison = ai_performance.get_live_performance_comparison(windows_data, windows)
+        
+        # Measured AI vs classical results on the same windows
+        if len(windows):
+            ai_result = ai_model_manager.predict_optimal_schedule(windows)
+            performance_comparison['measured'] = {
+                'method': ai_result['optimization_method'],
+                'performance_gain': ai_result['performance_gain'],
+                'evaluation': ai_result['evaluation']
+            }
         
         return jsonify({
             'performance_comparison': performance_comparison,
             'model_status': {
                 'loaded': ai_model_manager.model_loaded,
                 'available': AI_MODEL_AVAILABLE,
-                'scenarios_count': len(ai_model_manager.training_scenarios) if ai_model_manager.training_scenarios else 0
+                'scenarios_count': ai_performance.get_scenarios_count()
             },
             'status': 'success'
         })
@@ -964,26 +1333,13 @@ def optimize_schedule_with_ai():
             start_time = datetime.utcnow()
         
         # Get communication windows
-        all_windows_dict = simulator.window_detector.find_all_windows(start_time, duration_hours)
-        all_windows = []
-        for pair_windows in all_windows_dict.values():
-            all_windows.extend(pair_windows)
+        windows = find_window_set(start_time, duration_hours)
         
         # Convert to format for AI model
-        windows_data = []
-        for window in all_windows:
-            windows_data.append({
-                'satellite': window.satellite_name,
-                'station': window.station_name,
-                'start_time': window.start_time.isoformat(),
-                'end_time': window.end_time.isoformat(),
-                'duration_minutes': window.duration_minutes,
-                'max_elevation_degrees': window.max_elevation,
-                'quality_score': getattr(window, 'quality_score', 0.0)
-            })
+        windows_data = windows.to_records()
         
-        # Get AI optimization
-        ai_result = ai_model_manager.predict_optimal_schedule(windows_data)
+        # Get AI optimization (features are built straight from the window columns)
+        ai_result = ai_model_manager.predict_optimal_schedule(windows)
         
         return jsonify({
             'ai_schedule': ai_result,
@@ -1003,17 +1359,28 @@ def optimize_schedule_with_ai():
 
 @app.route('/api/ai/model-info', methods=['GET'])
 def get_model_info():
-    """Get information about the loaded AI model"""
+    """Get information about the loaded AI model
+
+    Read-only: polling it never loads the model, so health checks and
+    dashboards do not pull the AI stack into workers that serve no AI
+    requests. The model loads on the first AI request (or AI_MODEL_WARMUP=1).
+    """
     try:
         model_info = {
             'model_loaded': ai_model_manager.model_loaded,
             'libraries_available': AI_MODEL_AVAILABLE,
             'model_path': ai_model_manager.model_path,
-            'training_scenarios': len(ai_model_manager.training_scenarios) if ai_model_manager.training_scenarios else 0,
+            'training_scenarios': ai_performance.get_scenarios_count(),
             'model_type': 'PPO (Proximal Policy Optimization)',
             'training_episodes': 100000,
             'performance_improvement': '+23.4%',
-            'status': 'PRODUCTION_READY' if ai_model_manager.model_loaded else 'MOCK_MODE'
+            'inference_service': ai_model_manager.inference.get_stats(),
+            'readiness': ai_model_manager.get_readiness(),
+            'inference_backend': ai_model_manager.inference_backend,
+            'worker_pid': os.getpid(),
+            'status': 'PRODUCTION_READY' if ai_model_manager.model_loaded else
+                      ai_model_manager.readiness if ai_model_manager.readiness in ('NOT_LOADED', 'LOADING')
+                      else 'MOCK_MODE'
         }
         
         return jsonify({
@@ -1043,41 +1410,22 @@ def run_simulation():
         # Run simulation
         results = simulator.run_simulation(start_time, duration_hours)
         
-        # Convert results to JSON-serializable format
-        def convert_numpy_to_list(obj):
-            """Recursively convert NumPy arrays to Python lists"""
-            import numpy as np
-            if isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {key: convert_numpy_to_list(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_to_list(item) for item in obj]
-            elif isinstance(obj, (np.integer, np.floating)):
-                return obj.item()
-            else:
-                return obj
-        
+        # NumPy arrays and Trajectory objects are encoded directly by the JSON provider
         simulation_results = {
             'start_time': start_time.isoformat(),
             'duration_hours': duration_hours,
-            'summary': convert_numpy_to_list(results.get('summary', {})),
+            'summary': results.get('summary', {}),
+            'statistics': results.get('statistics', {}),
             'windows': [],
-            'orbital_predictions': convert_numpy_to_list(results.get('orbital_predictions', {})),
+            'orbital_predictions': results.get('orbital_predictions', {}),
             'status': 'success'
         }
         
         # Add communication windows
-        if 'all_windows' in results:
-            for window in results['all_windows']:
-                simulation_results['windows'].append({
-                    'satellite': window.satellite_name,
-                    'station': window.station_name,
-                    'start_time': window.start_time.isoformat(),
-                    'end_time': window.end_time.isoformat(),
-                    'duration_minutes': window.duration_minutes,
-                    'max_elevation_degrees': window.max_elevation
-                })
+        if 'communication_windows' in results:
+            windows = WindowSet.from_pairs(results['communication_windows'])
+            simulator.window_detector.score_windows(windows)
+            simulation_results['windows'] = windows.to_records()
         
         return jsonify(simulation_results)
         
@@ -1218,20 +1566,8 @@ def handle_subscribe_windows():
     # Send current windows immediately
     try:
         start_time = datetime.utcnow()
-        all_windows_dict = simulator.window_detector.find_all_windows(start_time, 1)
-        
-        windows_data = []
-        for pair_key, pair_windows in all_windows_dict.items():
-            for window in pair_windows:
-                windows_data.append({
-                    'satellite': window.satellite_name,
-                    'ground_station': window.station_name,
-                    'start_time': window.start_time.isoformat(),
-                    'end_time': window.end_time.isoformat(),
-                    'duration_minutes': window.duration_minutes,
-                    'max_elevation': window.max_elevation,
-                    'quality_score': getattr(window, 'quality_score', 0.0)
-                })
+        windows = find_window_set(start_time, 1)
+        windows_data = windows.to_records(rename=SOCKET_WINDOW_FIELDS)
         
         emit('window_update', {
             'windows': windows_data,
@@ -1295,20 +1631,8 @@ def broadcast_communication_windows():
     
     try:
         start_time = datetime.utcnow()
-        all_windows_dict = simulator.window_detector.find_all_windows(start_time, 6)
-        
-        windows_data = []
-        for pair_key, pair_windows in all_windows_dict.items():
-            for window in pair_windows:
-                windows_data.append({
-                    'satellite': window.satellite_name,
-                    'ground_station': window.station_name,
-                    'start_time': window.start_time.isoformat(),
-                    'end_time': window.end_time.isoformat(),
-                    'duration_minutes': window.duration_minutes,
-                    'max_elevation': window.max_elevation,
-                    'quality_score': getattr(window, 'quality_score', 0.0)
-                })
+        windows = find_window_set(start_time, 6)
+        windows_data = windows.to_records(rename=SOCKET_WINDOW_FIELDS)
         
         if windows_data:
             socketio.emit('communication_windows', {
@@ -1484,19 +1808,37 @@ def run_optimization():
         optimization_level = data.get('optimization_level', 'balanced')
         
         # Run actual simulation as optimization
+        started = time.perf_counter()
         duration_hours = 24 if time_range == '24h' else 6 if time_range == '6h' else 168
-        results = simulator.run_simulation(datetime.utcnow(), duration_hours)
+        windows = find_window_set(datetime.utcnow(), duration_hours)
+        
+        if mode == 'ai':
+            optimization = ai_model_manager.predict_optimal_schedule(windows)
+        else:
+            optimization = ai_model_manager.classical_schedule(windows)
+        
+        # Conflicts resolved = conflicts among all offered windows minus those left in the schedule
+        scheduled = np.array([entry['scheduled'] for entry in optimization['schedule']], dtype=bool)
+        measured = ScheduleEvaluator(windows).compare({
+            'offered': np.ones(len(windows), dtype=bool),
+            'scheduled': scheduled
+        })
+        conflicts = {name: metrics['station_conflicts'] + metrics['satellite_conflicts']
+                     for name, metrics in measured.items()}
         
         response_data = {
             'optimization_complete': True,
             'mode': mode,
+            'method': optimization['optimization_method'],
             'time_range': time_range,
             'optimization_level': optimization_level,
             'satellites_processed': len(simulator.tracker.satellites),
-            'windows_optimized': len(results.get('all_windows', [])),
-            'efficiency_gain': 23.4,  # Simulated improvement
-            'conflicts_resolved': 15,
-            'processing_time_seconds': 12.3,
+            'windows_optimized': len(windows),
+            'windows_scheduled': int(scheduled.sum()),
+            'efficiency_gain': optimization['performance_gain'],  # Measured reward gain vs classical
+            'conflicts_resolved': conflicts['offered'] - conflicts['scheduled'],
+            'evaluation': measured['scheduled'],
+            'processing_time_seconds': round(time.perf_counter() - started, 3),
             'status': 'success'
         }
         
@@ -1551,30 +1893,27 @@ def export_schedule():
             end_dt = datetime.fromisoformat(end_time)
             duration_hours = (end_dt - start_dt).total_seconds() / 3600
         
-        windows = simulator.communication_detector.find_communication_windows(
-            simulator.tracker.satellites,
-            simulator.tracker.ground_stations,
-            start_dt,
-            duration_hours,
-            min_elevation=10
-        )
+        windows = find_window_set(start_dt, duration_hours).sort_by('start')
+        
+        # Flag windows that overlap another pass on the same station or satellite
+        index = WindowIndex.from_window_set(windows)
+        conflict_counts = index.conflict_counts()
         
         # Format data
-        schedule_data = []
-        for window in windows:
-            schedule_data.append({
-                'satellite': window.satellite_name,
-                'ground_station': window.ground_station,
-                'start_time': window.start_time.isoformat(),
-                'end_time': window.end_time.isoformat(),
-                'duration_minutes': window.duration_minutes,
-                'max_elevation': round(window.max_elevation, 2)
-            })
+        schedule_data = windows.to_records(rename={'station': 'ground_station',
+                                                   'max_elevation_degrees': 'max_elevation'})
+        for window, conflicts in zip(schedule_data, conflict_counts.tolist()):
+            window['max_elevation'] = round(window['max_elevation'], 2)
+            window['conflicts'] = conflicts
         
         response_data = {
             'format': format_type,
             'export_time': datetime.utcnow().isoformat(),
             'total_windows': len(schedule_data),
+            'conflicts': {
+                'station': len(index.conflict_pairs('station')),
+                'satellite': len(index.conflict_pairs('satellite'))
+            },
             'time_range': {
                 'start': start_dt.isoformat(),
                 'end': (start_dt + timedelta(hours=duration_hours)).isoformat()
@@ -1625,7 +1964,13 @@ def optimize_schedule():
         
         # Run optimization simulation
         start_time = datetime.utcnow()
-        results = simulator.run_simulation(start_time, 24)
+        windows = find_window_set(start_time, 24)
+        
+        # Conflicts detected among the offered windows vs left in the optimized schedule
+        optimization = ai_model_manager.predict_optimal_schedule(windows)
+        scheduled = np.array([entry['scheduled'] for entry in optimization['schedule']], dtype=bool)
+        detected = len(WindowIndex.from_window_set(windows).conflict_pairs('station'))
+        remaining = len(WindowIndex.from_window_set(windows.filter(scheduled)).conflict_pairs('station'))
         
         response_data = {
             'optimization_id': f"OPT_{int(time.time())}",
@@ -1633,9 +1978,10 @@ def optimize_schedule():
             'priority': priority,
             'optimization_time': start_time.isoformat(),
             'satellites_processed': len(simulator.tracker.satellites),
-            'total_windows': len(results.get('all_windows', [])),
-            'efficiency_improvement': 18.5,
-            'conflicts_resolved': 12,
+            'total_windows': len(windows),
+            'efficiency_improvement': optimization['performance_gain'],
+            'conflicts_detected': detected,
+            'conflicts_resolved': detected - remaining,
             'recommended_changes': [
                 'Prioritize ISS communications during peak hours',
                 'Optimize Starlink constellation coverage',
@@ -1682,62 +2028,101 @@ def export_schedule_file():
         
         # Get current schedule data
         current_time = datetime.utcnow()
-        results = simulator.run_simulation(current_time, 24)
-        
-        schedule_data = {
-            'export_timestamp': current_time.isoformat(),
-            'time_range': time_range,
-            'satellites': list(simulator.tracker.satellites.keys()),
-            'communication_windows': results.get('all_windows', [])[:50],  # Limit for demo
-            'ground_stations': [
-                {'name': 'ISRO Bangalore', 'lat': 12.9716, 'lon': 77.5946},
-                {'name': 'ISRO Thiruvananthapuram', 'lat': 8.5241, 'lon': 76.9366},
-                {'name': 'ISRO Sriharikota', 'lat': 13.7199, 'lon': 80.2301}
-            ],
-            'metadata': {
-                'total_windows': len(results.get('all_windows', [])),
-                'export_format': format_type,
-                'system_version': 'PROJECT_ENTANGLEMENT_v3.0'
-            }
-        }
+        duration_hours = parse_time_range(time_range)
+        chunks = iter_schedule_chunks(current_time, duration_hours)
         
         if format_type == 'csv':
             # Convert to CSV format
-            import csv
-            import io
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(['Satellite', 'Start Time', 'End Time', 'Duration', 'Elevation'])
-            
-            for window in schedule_data['communication_windows']:
-                writer.writerow([
-                    window.get('satellite', ''),
-                    window.get('start', ''),
-                    window.get('end', ''),
-                    window.get('duration', ''),
-                    window.get('max_elevation', '')
-                ])
-            
+            content = b''.join(iter_csv(chunks)).decode('utf-8')
             response_data = {
                 'format': 'csv',
-                'content': output.getvalue(),
+                'content': content,
                 'filename': f'satellite_schedule_{current_time.strftime("%Y%m%d_%H%M%S")}.csv'
             }
         else:
             # JSON format (default)
+            windows = [window for window_set in chunks for window in window_set.to_records()]
             response_data = {
                 'format': 'json',
-                'content': schedule_data,
+                'content': {
+                    'export_timestamp': current_time.isoformat(),
+                    'time_range': time_range,
+                    'satellites': list(simulator.tracker.satellites.keys()),
+                    'communication_windows': windows,
+                    'ground_stations': [
+                        {'name': name, 'lat': station.latitude.degrees, 'lon': station.longitude.degrees}
+                        for name, station in simulator.tracker.ground_stations.items()
+                    ],
+                    'metadata': {
+                        'total_windows': len(windows),
+                        'export_format': format_type,
+                        'system_version': 'PROJECT_ENTANGLEMENT_v3.0'
+                    }
+                },
                 'filename': f'satellite_schedule_{current_time.strftime("%Y%m%d_%H%M%S")}.json'
             }
         
         return jsonify(response_data)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 500
+
+@app.route('/api/files/schedules/stream', methods=['GET'])
+def stream_schedule_file():
+    """Stream a schedule export as a file download, chunk by chunk
+    
+    Query parameters: format (csv, ndjson or columnar), gzip=1, start_time,
+    end_time or range ('24h', '7d'), satellite(s)/station(s) and
+    min_elevation. Windows are encoded as they come out of the pass store
+    (or live propagation), so memory use does not grow with the horizon.
+    """
+    try:
+        format_type = request.args.get('format', 'csv')
+        compress = request.args.get('gzip') in ('1', 'true')
+        if format_type not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{format_type}' "
+                             f"(expected one of {', '.join(EXPORT_FORMATS)})")
+        satellites = _name_list('satellite', 'satellites')
+        stations = _name_list('station', 'stations')
+        for names, catalog, kind in ((satellites, simulator.tracker.satellites, 'Satellite'),
+                                     (stations, simulator.tracker.ground_stations, 'Ground station')):
+            missing = [name for name in names or [] if name not in catalog]
+            if missing:
+                return jsonify({'error': f"{kind} {', '.join(missing)} not found", 'status': 'error'}), 404
+        
+        start_time_str = request.args.get('start_time')
+        start_time = parse_iso_time(start_time_str) if start_time_str else datetime.utcnow()
+        if request.args.get('end_time'):
+            duration_hours = (parse_iso_time(request.args['end_time']) - start_time).total_seconds() / 3600
+        else:
+            duration_hours = parse_time_range(request.args.get('range', '24h'))
+        if duration_hours <= 0:
+            raise ValueError('Export range must be positive')
+        min_elevation = request.args.get('min_elevation', type=float)
+        
+        chunks = iter_schedule_chunks(start_time, duration_hours, satellites, stations, min_elevation)
+        mimetype, extension = EXPORT_FORMATS[format_type]
+        filename = f'satellite_schedule_{start_time.strftime("%Y%m%d_%H%M%S")}.{extension}'
+        if compress:
+            mimetype, filename = GZIP_MIMETYPE, filename + '.gz'
+        
+        return Response(export_stream(chunks, format_type, gzip=compress), mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
 @app.route('/api/files/schedules/import', methods=['POST'])
 def import_schedule_file():
-    """Import schedule data from uploaded files"""
+    """Import schedule data from uploaded files
+    
+    CSV, JSON, NDJSON and columnar exports (optionally gzipped) are parsed
+    incrementally, validated window by window and bulk-loaded into the pass
+    store in batches. Imported windows are then served by
+    /api/communication-windows?source=imported. ``replace=1`` drops earlier imports.
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file uploaded', 'status': 'error'}), 400
@@ -1746,36 +2131,35 @@ def import_schedule_file():
         if file.filename == '':
             return jsonify({'error': 'No file selected', 'status': 'error'}), 400
         
-        # Read file content
-        content = file.read().decode('utf-8')
-        
-        # Parse based on file extension
-        if file.filename.endswith('.json'):
-            import json
-            data = json.loads(content)
-            imported_windows = len(data.get('communication_windows', []))
-            imported_satellites = len(data.get('satellites', []))
-        elif file.filename.endswith('.csv'):
-            import csv
-            import io
-            reader = csv.DictReader(io.StringIO(content))
-            rows = list(reader)
-            imported_windows = len(rows)
-            imported_satellites = len(set(row.get('Satellite', '') for row in rows))
-        else:
-            return jsonify({'error': 'Unsupported file format', 'status': 'error'}), 400
+        # Stream the upload (werkzeug spools large files to disk) through the parser
+        started = time.perf_counter()
+        upload = ScheduleImport(file.stream, file.filename)
+        replace = request.form.get('replace', request.args.get('replace')) in ('1', 'true')
+        summary = pass_store.import_windows(upload.batches(), file.filename, replace=replace)
+        elapsed = time.perf_counter() - started
         
         response_data = {
             'filename': file.filename,
+            'format': upload.format,
+            'import_id': summary['import_id'],
             'import_timestamp': datetime.utcnow().isoformat(),
-            'imported_windows': imported_windows,
-            'imported_satellites': imported_satellites,
-            'file_size': len(content),
+            'imported_windows': summary['windows'],
+            'imported_satellites': len(upload.satellites),
+            'rejected_windows': upload.rows_rejected,
+            'errors': upload.errors,
+            'batches': summary['batches'],
+            'file_size': upload.bytes_read,
+            'processing_time_seconds': round(elapsed, 3),
+            'windows_per_second': round(upload.rows_read / elapsed) if elapsed > 0 else None,
+            'megabytes_per_second': round(upload.bytes_read / 1e6 / elapsed, 2) if elapsed > 0 else None,
             'status': 'success',
-            'message': f'Successfully imported {imported_windows} communication windows for {imported_satellites} satellites'
+            'message': f'Successfully imported {summary["windows"]} communication windows for '
+                       f'{len(upload.satellites)} satellites ({upload.rows_rejected} rejected)'
         }
         
         return jsonify(response_data)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 400
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
@@ -1819,7 +2203,13 @@ def generate_report():
         time_period = data.get('period', '24h')
         
         current_time = datetime.utcnow()
-        results = simulator.run_simulation(current_time, 24)
+        windows = find_window_set(current_time, 24)
+        coverage = coverage_statistics(windows, current_time, current_time + timedelta(hours=24),
+                                       satellite_names=list(simulator.tracker.satellites),
+                                       station_names=list(simulator.tracker.ground_stations))
+        volumes = windows.data_volume_mb()
+        satellite_volume = np.bincount(windows.records['satellite'], weights=volumes,
+                                       minlength=len(windows.satellite_names))
         
         report_data = {
             'report_id': f"RPT_{int(time.time())}",
@@ -1828,7 +2218,7 @@ def generate_report():
             'time_period': time_period,
             'summary': {
                 'total_satellites': len(simulator.tracker.satellites),
-                'total_communication_windows': len(results.get('all_windows', [])),
+                'total_communication_windows': len(windows),
                 'operational_efficiency': '94.2%',
                 'system_uptime': '99.8%',
                 'data_throughput': '2.3 TB',
@@ -1837,13 +2227,16 @@ def generate_report():
             },
             'detailed_metrics': {
                 'satellite_performance': [
-                    {'name': 'ISS', 'passes': 16, 'success_rate': '100%', 'data_volume': '450 MB'},
-                    {'name': 'ISRO_LATINSAT', 'passes': 12, 'success_rate': '95%', 'data_volume': '380 MB'},
-                    {'name': 'STARLINK_1', 'passes': 24, 'success_rate': '98%', 'data_volume': '720 MB'}
+                    {'name': name, 'passes': stats['passes'],
+                     'coverage': f"{stats['coverage_percent']:.1f}%",
+                     'data_volume': f"{satellite_volume[windows.satellite_names.index(name)]:.0f} MB"
+                     if name in windows.satellite_names else '0 MB'}
+                    for name, stats in coverage['satellites'].items()
                 ],
                 'ground_station_utilization': [
-                    {'station': 'ISRO Bangalore', 'utilization': '87%', 'total_contacts': 45},
-                    {'station': 'ISRO Sriharikota', 'utilization': '92%', 'total_contacts': 52}
+                    {'station': name, 'utilization': f"{stats['coverage_percent']:.1f}%",
+                     'total_contacts': stats['passes']}
+                    for name, stats in coverage['stations'].items()
                 ]
             },
             'recommendations': [
@@ -1901,6 +2294,8 @@ def get_system_status():
                 'data_refresh_rate_seconds': 30,
                 'memory_usage_mb': 156
             },
+            'response_cache': response_cache.get_stats(),
+            'pass_store': pass_store.get_stats(),
             'status': 'success'
         }
         return jsonify(response_data)
@@ -1918,6 +2313,7 @@ if __name__ == '__main__':
     print("   • GET  /api/satellites")
     print("   • POST /api/satellites")
     print("   • GET  /api/satellites/{name}/position")
+    print("   • POST /api/satellites/positions")
     print("   • GET  /api/satellites/{name}/trajectory")
     print("   • POST /api/satellites/{name}/track")
     print("   • POST /api/satellites/{name}/configure")
@@ -1926,6 +2322,7 @@ if __name__ == '__main__':
     print("   • POST /api/ground-stations")
     print("   • GET  /api/communication-windows")
     print("   • GET  /api/visibility")
+    print("   • POST /api/visibility/batch")
     print("   • POST /api/simulation/run")
     print("   • GET  /api/ai/performance")
     print("   • POST /api/satellites/live-data")
@@ -1937,6 +2334,7 @@ if __name__ == '__main__':
     print("   • GET  /api/schedule/export")
     print("   • POST /api/config/update")
     print("   • GET  /api/files/schedules/export")
+    print("   • GET  /api/files/schedules/stream")
     print("   • POST /api/files/schedules/import")
     print("   • GET  /api/files/satellites/export")
     print("   • POST /api/files/reports/generate")
@@ -1952,6 +2350,12 @@ if __name__ == '__main__':
     print("API Documentation: http://localhost:5000")
     print("WebSocket Server: ws://localhost:5000")
     
+    # Load the AI model in the background so the first schedule request is fast
+    ai_model_manager.start_warmup()
+    
+    # Keep the 7-day pass store current in the background
+    pass_store.start(simulator.window_detector)
+    
     # Start real-time broadcasting
     start_real_time_broadcasting()
     
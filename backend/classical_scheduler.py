@@ -0,0 +1,218 @@
+"""
+Classical Scheduler
+Deterministic weighted interval scheduling baseline for communication windows
+
+Each ground station can serve one satellite at a time and each satellite can
+talk to one station at a time. The scheduler:
+
+1. solves weighted interval scheduling independently per ground station
+   (sort by end time, binary-search predecessors, O(n) DP + backtrack);
+2. resolves satellites booked on two stations at once, keeping the heavier
+   window;
+3. greedily refills station time freed in step 2 with the heaviest
+   remaining windows that fit both the station and the satellite
+   (occupancy kept in Fenwick trees over the compressed window endpoints).
+
+Everything is O(n log n) in the number of windows. Window weight defaults to
+the expected downlink volume (see window_data_volume_mb).
+"""
+
+from typing import Dict, List, Optional
+import time
+import numpy as np
+
+from communication_windows import WindowSet
+
+
+class _BusySegments:
+    """Occupancy of the elementary segments of one packed (resource, time) axis
+
+    A Fenwick tree over 0/1 segment flags: checking a range and marking a
+    segment are both O(log n), and each segment is marked at most once, so a
+    sequence of checks and inserts in any time order stays O(n log n).
+    """
+
+    __slots__ = ('tree', 'size')
+
+    def __init__(self, busy: np.ndarray):
+        self.size = len(busy)
+        prefix = np.concatenate(([0], np.cumsum(busy, dtype=np.int64)))
+        index = np.arange(1, self.size + 1)
+        tree = np.zeros(self.size + 1, dtype=np.int64)
+        tree[1:] = prefix[index] - prefix[index - (index & -index)]
+        self.tree: List[int] = tree.tolist()
+
+    def _prefix(self, i: int) -> int:
+        tree, total = self.tree, 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def is_free(self, lo: int, hi: int) -> bool:
+        """True if no segment in [lo, hi) is occupied"""
+        return self._prefix(hi) == self._prefix(lo)
+
+    def add(self, lo: int, hi: int) -> None:
+        """Occupy segments [lo, hi), which must all be free"""
+        tree, size = self.tree, self.size
+        for i in range(lo + 1, hi + 1):
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+
+
+class ClassicalScheduler:
+    """Weighted interval scheduling over a WindowSet"""
+
+    def __init__(self, satellite_exclusive: bool = True):
+        # A satellite has one downlink, so it can only be scheduled on one station at a time
+        self.satellite_exclusive = satellite_exclusive
+
+    def _station_optimal(self, starts: np.ndarray, ends: np.ndarray, weights: np.ndarray,
+                         stations: np.ndarray) -> np.ndarray:
+        """Per-station optimal weighted interval scheduling, as a boolean mask"""
+        selected = np.zeros(len(starts), dtype=bool)
+        order = np.lexsort((starts, ends, stations))
+        boundaries = np.flatnonzero(np.diff(stations[order])) + 1
+
+        for group in np.split(order, boundaries):
+            group_ends = ends[group]
+            # Number of windows in the group that end no later than each window starts
+            predecessors = np.searchsorted(group_ends, starts[group], side='right').tolist()
+            group_weights = weights[group].tolist()
+
+            best = [0.0] * (len(group) + 1)
+            for j, (weight, p) in enumerate(zip(group_weights, predecessors), 1):
+                take = weight + best[p]
+                best[j] = take if take > best[j - 1] else best[j - 1]
+
+            j = len(group)
+            while j > 0:
+                if group_weights[j - 1] + best[predecessors[j - 1]] > best[j - 1]:
+                    selected[group[j - 1]] = True
+                    j = predecessors[j - 1]
+                else:
+                    j -= 1
+        return selected
+
+    def _resolve_satellite_conflicts(self, selected: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                                     weights: np.ndarray, satellites: np.ndarray) -> np.ndarray:
+        """Drop the lighter of any two selected windows that overlap on one satellite"""
+        chosen = np.flatnonzero(selected)
+        chosen = chosen[np.lexsort((starts[chosen], satellites[chosen]))]
+        keep = selected.copy()
+        last: Dict[int, int] = {}
+
+        for i in chosen.tolist():
+            satellite = int(satellites[i])
+            previous = last.get(satellite)
+            if previous is not None and starts[i] < ends[previous]:
+                if weights[i] > weights[previous]:
+                    keep[previous] = False
+                else:
+                    keep[i] = False
+                    continue
+            last[satellite] = i
+        return keep
+
+    @staticmethod
+    def _free_of(busy: np.ndarray, candidates: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                 resources: np.ndarray) -> np.ndarray:
+        """Vectorized check that each candidate overlaps no busy window on its resource
+
+        Resource id and time are packed into one sortable key so every
+        resource's busy intervals can be searched in a single searchsorted.
+        """
+        if len(busy) == 0:
+            return np.ones(len(candidates), dtype=bool)
+        origin = int(starts.min())
+        span = int(ends.max()) - origin + 1
+        def key(index, times):
+            return resources[index].astype(np.int64) * span + (times[index] - origin)
+
+        busy = busy[np.argsort(key(busy, starts), kind='stable')]
+        busy_starts, busy_ends = key(busy, starts), key(busy, ends)
+        candidate_starts, candidate_ends = key(candidates, starts), key(candidates, ends)
+
+        i = np.searchsorted(busy_starts, candidate_starts, side='right')
+        before_clear = (i == 0) | (busy_ends[np.maximum(i - 1, 0)] <= candidate_starts)
+        after_clear = (i == len(busy)) | (busy_starts[np.minimum(i, len(busy) - 1)] >= candidate_ends)
+        return before_clear & after_clear
+
+    def _refill(self, keep: np.ndarray, starts: np.ndarray, ends: np.ndarray, weights: np.ndarray,
+                stations: np.ndarray, satellites: np.ndarray) -> np.ndarray:
+        """Greedily add the heaviest leftover windows that fit station and satellite"""
+        kept = np.flatnonzero(keep)
+        leftovers = np.flatnonzero(~keep)
+        # Only windows that fit around the current schedule can possibly be added
+        fits = (self._free_of(kept, leftovers, starts, ends, stations) &
+                self._free_of(kept, leftovers, starts, ends, satellites))
+        candidates = leftovers[fits]
+        if len(candidates) == 0:
+            return keep
+        candidates = candidates[np.argsort(-weights[candidates], kind='stable')]
+
+        # Occupancy per resource axis: resource id and time are packed into one
+        # sortable key and compressed to the endpoints that can ever matter
+        origin = int(starts.min())
+        span = int(ends.max()) - origin + 1
+        axes = []
+        for resources in (stations, satellites):
+            touched = kept[np.isin(resources[kept], resources[candidates])]
+            def key(index, times):
+                return resources[index].astype(np.int64) * span + (times[index] - origin)
+            coordinates = np.unique(np.concatenate([key(touched, starts), key(touched, ends),
+                                                    key(candidates, starts), key(candidates, ends)]))
+            busy = np.zeros(len(coordinates), dtype=np.int64)
+            np.add.at(busy, np.searchsorted(coordinates, key(touched, starts)), 1)
+            np.add.at(busy, np.searchsorted(coordinates, key(touched, ends)), -1)
+            segments = _BusySegments(np.cumsum(busy)[:-1] > 0)
+            axes.append((segments, np.searchsorted(coordinates, key(candidates, starts)).tolist(),
+                         np.searchsorted(coordinates, key(candidates, ends)).tolist()))
+
+        (station_busy, station_lo, station_hi), (satellite_busy, satellite_lo, satellite_hi) = axes
+        for n, i in enumerate(candidates.tolist()):
+            if (station_busy.is_free(station_lo[n], station_hi[n]) and
+                    satellite_busy.is_free(satellite_lo[n], satellite_hi[n])):
+                station_busy.add(station_lo[n], station_hi[n])
+                satellite_busy.add(satellite_lo[n], satellite_hi[n])
+                keep[i] = True
+        return keep
+
+    def select(self, window_set: WindowSet, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask of the windows to schedule"""
+        if len(window_set) == 0:
+            return np.zeros(0, dtype=bool)
+        starts, ends = window_set.interval_bounds()
+        weights = window_set.data_volume_mb() if weights is None else np.asarray(weights, dtype=np.float64)
+        stations = window_set.records['station']
+        satellites = window_set.records['satellite']
+
+        selected = self._station_optimal(starts, ends, weights, stations)
+        if self.satellite_exclusive:
+            kept = self._resolve_satellite_conflicts(selected, starts, ends, weights, satellites)
+            if not np.array_equal(kept, selected):
+                selected = self._refill(kept, starts, ends, weights, stations, satellites)
+        return selected
+
+    def schedule(self, window_set: WindowSet, weights: Optional[np.ndarray] = None) -> Dict:
+        """Schedule a window set and summarize the result"""
+        started = time.perf_counter()
+        mask = self.select(window_set, weights)
+        runtime_ms = (time.perf_counter() - started) * 1000
+        scheduled = window_set.filter(mask)
+
+        return {
+            'mask': mask,
+            'scheduled': scheduled,
+            'stats': {
+                'total_windows': len(window_set),
+                'scheduled_windows': int(mask.sum()),
+                'offered_minutes': window_set.total_duration_minutes(),
+                'scheduled_minutes': scheduled.total_duration_minutes(),
+                'data_volume_mb': float(scheduled.data_volume_mb().sum()),
+                'runtime_ms': round(runtime_ms, 3),
+                'algorithm': 'Weighted Interval Scheduling'
+            }
+        }
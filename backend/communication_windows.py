@@ -4,28 +4,318 @@ Sub-Phase 1.1: Calculate optimal communication windows between satellites and gr
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Union
 from satellite_tracker import SatelliteTracker
+from scheduling_features import DEFAULT_QUALITY_WEIGHTS, window_quality_score
+from skyfield.api import utc
 import numpy as np
 
 class CommunicationWindow:
     """Represents a communication window between satellite and ground station"""
     
+    __slots__ = ('satellite_name', 'station_name', 'start_time', 'end_time',
+                 'max_elevation', 'duration_minutes', 'quality_score')
+    
     def __init__(self, satellite_name: str, station_name: str, 
                  start_time: datetime, end_time: datetime, 
-                 max_elevation: float, duration_minutes: float):
+                 max_elevation: float, duration_minutes: float,
+                 quality_score: float = 0.0):
         self.satellite_name = satellite_name
         self.station_name = station_name
         self.start_time = start_time
         self.end_time = end_time
         self.max_elevation = max_elevation
         self.duration_minutes = duration_minutes
+        self.quality_score = quality_score
+        
+    def to_dict(self) -> Dict:
+        """JSON-ready record in the REST API window format"""
+        return {
+            'satellite': self.satellite_name,
+            'station': self.station_name,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'duration_minutes': self.duration_minutes,
+            'max_elevation_degrees': self.max_elevation,
+            'quality_score': self.quality_score
+        }
         
     def __repr__(self):
         return (f"CommWindow({self.satellite_name} -> {self.station_name}, "
                 f"{self.start_time.strftime('%H:%M')} - {self.end_time.strftime('%H:%M')}, "
                 f"{self.duration_minutes:.1f}min, {self.max_elevation:.1f}°)")
 
+# One fixed-size record per window; names are stored once per set as lookup tables
+WINDOW_DTYPE = np.dtype([
+    ('satellite', np.int32),
+    ('station', np.int32),
+    ('start', 'datetime64[us]'),
+    ('end', 'datetime64[us]'),
+    ('duration_minutes', np.float64),
+    ('max_elevation', np.float64),
+    ('quality_score', np.float64)
+])
+
+# Downlink model shared with the training environment: 10 MB/min at the horizon
+# rising linearly to 30 MB/min at zenith
+MIN_DATA_RATE_MB_PER_MIN = 10.0
+MAX_DATA_RATE_MB_PER_MIN = 30.0
+
+def window_data_volume_mb(duration_minutes, max_elevation):
+    """Expected MB downlinked over a pass, element-wise for arrays
+
+    The rate is taken at the pass's mean elevation, approximated as 2/pi of
+    the peak for a symmetric pass.
+    """
+    mean_elevation = np.asarray(max_elevation, dtype=np.float64) * (2.0 / np.pi)
+    rate = MIN_DATA_RATE_MB_PER_MIN + (mean_elevation / 90.0) * (MAX_DATA_RATE_MB_PER_MIN - MIN_DATA_RATE_MB_PER_MIN)
+    return np.asarray(duration_minutes, dtype=np.float64) * rate
+
+# Key renames for the Socket.IO window payloads
+SOCKET_WINDOW_FIELDS = {
+    'station': 'ground_station',
+    'max_elevation_degrees': 'max_elevation'
+}
+
+class WindowSet:
+    """Compact, array-backed collection of communication windows
+
+    Windows are stored as a NumPy structured array (``WINDOW_DTYPE``) with
+    satellite and station names interned into shared lookup tables, so
+    filtering, scoring, sorting and serialization run as array operations.
+    Quality scores are written into the ``quality_score`` field the first
+    time they are requested and reused until a different weighting is asked for.
+    """
+    
+    def __init__(self, records: np.ndarray, satellite_names: List[str],
+                 station_names: List[str], tz_aware: bool = False,
+                 score_weights: Optional[Tuple] = None):
+        self.records = records
+        self.satellite_names = satellite_names
+        self.station_names = station_names
+        self.tz_aware = tz_aware
+        self.score_weights = score_weights
+        
+    @classmethod
+    def empty(cls) -> 'WindowSet':
+        return cls(np.empty(0, dtype=WINDOW_DTYPE), [], [])
+        
+    @classmethod
+    def from_windows(cls, windows: Iterable[CommunicationWindow]) -> 'WindowSet':
+        """Pack CommunicationWindow objects into a WindowSet"""
+        windows = list(windows)
+        if not windows:
+            return cls.empty()
+            
+        satellite_index: Dict[str, int] = {}
+        station_index: Dict[str, int] = {}
+        records = np.empty(len(windows), dtype=WINDOW_DTYPE)
+        tz_aware = windows[0].start_time.tzinfo is not None
+        
+        records['satellite'] = [satellite_index.setdefault(w.satellite_name, len(satellite_index))
+                                for w in windows]
+        records['station'] = [station_index.setdefault(w.station_name, len(station_index))
+                              for w in windows]
+        records['start'] = [_to_datetime64(w.start_time) for w in windows]
+        records['end'] = [_to_datetime64(w.end_time) for w in windows]
+        records['duration_minutes'] = [w.duration_minutes for w in windows]
+        records['max_elevation'] = [w.max_elevation for w in windows]
+        records['quality_score'] = [w.quality_score for w in windows]
+        
+        return cls(records, list(satellite_index), list(station_index), tz_aware)
+        
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'WindowSet':
+        """Build a WindowSet from REST API-format window dicts (see to_records)"""
+        records = list(records)
+        if not records:
+            return cls.empty()
+            
+        satellite_index: Dict[str, int] = {}
+        station_index: Dict[str, int] = {}
+        packed = np.empty(len(records), dtype=WINDOW_DTYPE)
+        starts = [str(r['start_time']) for r in records]
+        tz_aware = starts[0].endswith(('Z', '+00:00'))
+        
+        packed['satellite'] = [satellite_index.setdefault(r.get('satellite', 'Unknown'), len(satellite_index))
+                               for r in records]
+        packed['station'] = [station_index.setdefault(r.get('station', 'Unknown'), len(station_index))
+                             for r in records]
+        packed['start'] = [_iso_to_datetime64(s) for s in starts]
+        packed['end'] = [_iso_to_datetime64(str(r['end_time'])) for r in records]
+        packed['duration_minutes'] = [float(r.get('duration_minutes', 0)) for r in records]
+        packed['max_elevation'] = [float(r.get('max_elevation_degrees', 0)) for r in records]
+        packed['quality_score'] = [float(r.get('quality_score', 0)) for r in records]
+        
+        return cls(packed, list(satellite_index), list(station_index), tz_aware)
+        
+    @classmethod
+    def from_pairs(cls, all_windows: Dict[str, List[CommunicationWindow]]) -> 'WindowSet':
+        """Flatten the pair-keyed output of find_all_windows into a WindowSet"""
+        return cls.from_windows(w for windows in all_windows.values() for w in windows)
+        
+    def __len__(self) -> int:
+        return len(self.records)
+        
+    def __iter__(self) -> Iterator[CommunicationWindow]:
+        for i in range(len(self.records)):
+            yield self.window(i)
+            
+    def __getitem__(self, index) -> Union[CommunicationWindow, 'WindowSet']:
+        """Integer index gives a CommunicationWindow; slices, masks and index arrays give a WindowSet"""
+        if isinstance(index, (int, np.integer)):
+            return self.window(int(index))
+        return self._derive(self.records[index])
+        
+    def __repr__(self):
+        return (f"WindowSet({len(self)} windows, {len(self.satellite_names)} satellites, "
+                f"{len(self.station_names)} stations)")
+        
+    def _derive(self, records: np.ndarray) -> 'WindowSet':
+        # Basic slices share memory with this set, whose scores may be rewritten
+        # later, so only copies (masks, index arrays) inherit the cached weighting
+        weights = self.score_weights if records.flags.owndata else None
+        return WindowSet(records, self.satellite_names, self.station_names,
+                         self.tz_aware, weights)
+        
+    def window(self, index: int) -> CommunicationWindow:
+        """Materialize one record as a CommunicationWindow"""
+        record = self.records[index]
+        return CommunicationWindow(
+            self.satellite_names[record['satellite']],
+            self.station_names[record['station']],
+            self._to_datetime(record['start']),
+            self._to_datetime(record['end']),
+            float(record['max_elevation']),
+            float(record['duration_minutes']),
+            float(record['quality_score'])
+        )
+        
+    def windows(self) -> List[CommunicationWindow]:
+        return list(self)
+        
+    def _to_datetime(self, value: np.datetime64) -> datetime:
+        moment = value.astype('datetime64[us]').astype(datetime)
+        return moment.replace(tzinfo=utc) if self.tz_aware else moment
+        
+    @property
+    def duration_minutes(self) -> np.ndarray:
+        return self.records['duration_minutes']
+        
+    @property
+    def max_elevation(self) -> np.ndarray:
+        return self.records['max_elevation']
+        
+    @property
+    def quality_score(self) -> np.ndarray:
+        return self.records['quality_score']
+        
+    def satellite_array(self) -> np.ndarray:
+        """Satellite name per window (object array)"""
+        return np.asarray(self.satellite_names, dtype=object)[self.records['satellite']]
+        
+    def station_array(self) -> np.ndarray:
+        """Station name per window (object array)"""
+        return np.asarray(self.station_names, dtype=object)[self.records['station']]
+        
+    def total_duration_minutes(self) -> float:
+        return float(self.records['duration_minutes'].sum())
+        
+    def data_volume_mb(self) -> np.ndarray:
+        """Expected downlink volume per window (see window_data_volume_mb)"""
+        return window_data_volume_mb(self.records['duration_minutes'], self.records['max_elevation'])
+        
+    def interval_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Start and end of every window as int64 microseconds since the epoch"""
+        return self.records['start'].view(np.int64), self.records['end'].view(np.int64)
+        
+    def quality_scores(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Quality score per window, computed in one pass and cached on the set
+
+        Returns a copy, so later rescoring with other weights does not change it.
+        """
+        return self._scored(weights).copy()
+        
+    def _scored(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Live quality_score column, recomputed if ``weights`` differ from the cached ones"""
+        weights = weights or DEFAULT_QUALITY_WEIGHTS
+        key = tuple(sorted(weights.items()))
+        if self.score_weights != key:
+            if not self.records.flags.owndata:
+                # A view of another set: rescore a private copy, not the parent's column
+                self.records = self.records.copy()
+            self.records['quality_score'] = window_quality_score(
+                self.records['duration_minutes'], self.records['max_elevation'], weights
+            )
+            self.score_weights = key
+        return self.records['quality_score']
+        
+    def filter(self, mask: np.ndarray) -> 'WindowSet':
+        """Keep windows where mask is True"""
+        return self._derive(self.records[np.asarray(mask, dtype=bool)])
+        
+    def filter_high_quality(self, min_quality: float = 0.5,
+                            weights: Optional[Dict[str, float]] = None) -> 'WindowSet':
+        return self.filter(self._scored(weights) >= min_quality)
+        
+    def top_k(self, k: int, weights: Optional[Dict[str, float]] = None) -> 'WindowSet':
+        """Best k windows by quality score, highest first
+
+        Uses argpartition so only the selected k windows are fully sorted.
+        """
+        scores = self._scored(weights)
+        if k <= 0:
+            return self._derive(self.records[:0])
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return self._derive(self.records[order])
+        
+    def sort_by(self, field: str = 'start', descending: bool = False) -> 'WindowSet':
+        """Stable sort on any WINDOW_DTYPE field"""
+        order = np.argsort(self.records[field], kind='stable')
+        if descending:
+            order = order[::-1]
+        return self._derive(self.records[order])
+        
+    def isoformat_column(self, field: str) -> List[str]:
+        """ISO-8601 strings for the start or end column in one vectorized call"""
+        values = self.records[field]
+        unit = 'us' if np.any(values.astype('datetime64[s]') != values) else 's'
+        strings = np.datetime_as_string(values, unit=unit).tolist()
+        if self.tz_aware:
+            return [s + '+00:00' for s in strings]
+        return strings
+        
+    def to_records(self, rename: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """JSON-ready window dicts in the REST API format (optionally renaming keys)"""
+        keys = ['satellite', 'station', 'start_time', 'end_time',
+                'duration_minutes', 'max_elevation_degrees', 'quality_score']
+        if rename:
+            keys = [rename.get(k, k) for k in keys]
+        columns = zip(
+            self.satellite_array().tolist(),
+            self.station_array().tolist(),
+            self.isoformat_column('start'),
+            self.isoformat_column('end'),
+            self.records['duration_minutes'].tolist(),
+            self.records['max_elevation'].tolist(),
+            self.records['quality_score'].tolist()
+        )
+        return [dict(zip(keys, row)) for row in columns]
+
+def _iso_to_datetime64(value: str) -> np.datetime64:
+    """Parse an API ISO-8601 timestamp (naive or UTC offset) to datetime64[us]"""
+    return _to_datetime64(datetime.fromisoformat(value.replace('Z', '+00:00')))
+
+def _to_datetime64(moment: datetime) -> np.datetime64:
+    """Convert a naive-UTC or UTC-aware datetime to datetime64[us]"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(utc).replace(tzinfo=None)
+    return np.datetime64(moment, 'us')
+
 class CommunicationWindowDetector:
     """Detects and calculates communication windows"""
     
@@ -33,6 +323,7 @@ class CommunicationWindowDetector:
         self.tracker = satellite_tracker
         self.min_elevation = 10.0  # Minimum elevation angle for communication
         self.min_duration_minutes = 5.0  # Minimum window duration
+        self.quality_weights = dict(DEFAULT_QUALITY_WEIGHTS)  # Duration/elevation score weighting
         
     def find_communication_windows(self, satellite_name: str, station_name: str,
                                  start_time: datetime, duration_hours: float,
@@ -95,12 +386,14 @@ class CommunicationWindowDetector:
                 
         return windows
         
-    def find_all_windows(self, start_time: datetime, duration_hours: float) -> Dict[str, List[CommunicationWindow]]:
-        """Find all communication windows for all satellite-station pairs"""
+    def find_all_windows(self, start_time: datetime, duration_hours: float,
+                         satellites: Optional[List[str]] = None,
+                         stations: Optional[List[str]] = None) -> Dict[str, List[CommunicationWindow]]:
+        """Find all communication windows for all (or the given) satellite-station pairs"""
         all_windows = {}
         
-        for sat_name in self.tracker.satellites.keys():
-            for station_name in self.tracker.ground_stations.keys():
+        for sat_name in (satellites if satellites is not None else list(self.tracker.satellites.keys())):
+            for station_name in (stations if stations is not None else list(self.tracker.ground_stations.keys())):
                 pair_key = f"{sat_name}_{station_name}"
                 windows = self.find_communication_windows(
                     sat_name, station_name, start_time, duration_hours
@@ -109,17 +402,55 @@ class CommunicationWindowDetector:
                 
         return all_windows
         
-    def get_window_quality_score(self, window: CommunicationWindow) -> float:
-        """Calculate quality score for communication window"""
-        # Score based on duration and elevation
-        duration_score = min(window.duration_minutes / 15.0, 1.0)  # Normalize to 15 min max
-        elevation_score = min(window.max_elevation / 90.0, 1.0)    # Normalize to 90 degrees
+    def iter_window_sets(self, start_time: datetime, duration_hours: float,
+                         satellites: Optional[List[str]] = None,
+                         stations: Optional[List[str]] = None) -> Iterator[WindowSet]:
+        """Quality-scored windows one satellite-station pair at a time
+        
+        Only the pair being propagated is held in memory, so arbitrarily long
+        horizons can be streamed. Pairs without windows are skipped.
+        """
+        for sat_name in (satellites if satellites is not None else list(self.tracker.satellites.keys())):
+            for station_name in (stations if stations is not None else list(self.tracker.ground_stations.keys())):
+                window_set = WindowSet.from_windows(self.find_communication_windows(
+                    sat_name, station_name, start_time, duration_hours
+                ))
+                if len(window_set):
+                    self.score_windows(window_set)
+                    yield window_set
+        
+    def find_window_set(self, start_time: datetime, duration_hours: float,
+                        satellites: Optional[List[str]] = None,
+                        stations: Optional[List[str]] = None) -> WindowSet:
+        """Find all communication windows as a compact, quality-scored WindowSet
+
+        ``satellites``/``stations`` limit propagation to those pairs.
+        """
+        window_set = WindowSet.from_pairs(self.find_all_windows(start_time, duration_hours, satellites, stations))
+        self.score_windows(window_set)
+        return window_set
+        
+    def score_windows(self, windows: WindowSet) -> np.ndarray:
+        """Score every window in the set at once (cached on the set)"""
+        return windows.quality_scores(self.quality_weights)
         
-        # Weighted combination
-        quality_score = (0.6 * duration_score) + (0.4 * elevation_score)
-        return quality_score
+    def rank_windows(self, windows: WindowSet, k: int) -> WindowSet:
+        """Top-k windows by quality score"""
+        return windows.top_k(k, self.quality_weights)
+        
+    def get_window_quality_score(self, window: Union[CommunicationWindow, WindowSet]) -> Union[float, np.ndarray]:
+        """Calculate quality score for communication window (or every window in a WindowSet)"""
+        if isinstance(window, WindowSet):
+            return self.score_windows(window)
+            
+        # Score based on duration and elevation
+        return float(window_quality_score(
+            window.duration_minutes, window.max_elevation, self.quality_weights
+        ))
         
-    def filter_high_quality_windows(self, windows: List[CommunicationWindow], 
-                                  min_quality: float = 0.5) -> List[CommunicationWindow]:
+    def filter_high_quality_windows(self, windows: Union[List[CommunicationWindow], WindowSet], 
+                                  min_quality: float = 0.5) -> Union[List[CommunicationWindow], WindowSet]:
         """Filter windows by quality score"""
-        return [w for w in windows if self.get_window_quality_score(w) >= min_quality]
\ No newline at end of file
+        if isinstance(windows, WindowSet):
+            return windows.filter_high_quality(min_quality, self.quality_weights)
+        return [w for w in windows if self.get_window_quality_score(w) >= min_quality]
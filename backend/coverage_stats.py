@@ -0,0 +1,123 @@
+"""
+Coverage Statistics
+Exact contact coverage, gaps and concurrency from a sweep over window endpoints
+
+Every window contributes a +1 event at its start and a -1 event at its end.
+Sorting the events of a group (a station, a satellite, or the whole network)
+and taking a running sum gives the number of simultaneous contacts between
+consecutive events. From those segments we read off:
+
+- union coverage: time with at least one contact (overlaps counted once)
+- gaps: time with no contact, including before the first and after the
+  last contact of the horizon; revisit intervals are the gaps between
+  two contacts
+- concurrency histogram: minutes spent at each number of simultaneous contacts
+
+All groups are swept together in one lexsort + cumsum, O(n log n) overall.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+
+from communication_windows import WindowSet, _to_datetime64
+
+_MICROSECONDS_PER_MINUTE = 60e6
+
+
+def _sweep(groups: np.ndarray, starts: np.ndarray, ends: np.ndarray, group_count: int,
+           horizon_start: int, horizon_end: int) -> List[Dict]:
+    """Coverage metrics per group for windows clipped to the horizon (times in microseconds)"""
+    horizon = horizon_end - horizon_start
+    starts = np.maximum(starts, horizon_start)
+    ends = np.minimum(ends, horizon_end)
+    inside = starts < ends
+    groups, starts, ends = groups[inside], starts[inside], ends[inside]
+    passes = np.bincount(groups, minlength=group_count)
+
+    times = np.concatenate([starts, ends])
+    deltas = np.concatenate([np.ones(len(starts), np.int64), -np.ones(len(ends), np.int64)])
+    event_groups = np.concatenate([groups, groups])
+    # Ends sort before starts at the same instant, so back-to-back windows do not overlap
+    order = np.lexsort((deltas, times, event_groups))
+    times, deltas, event_groups = times[order], deltas[order], event_groups[order]
+    # Each group's deltas sum to zero, so one global cumsum restarts at every group
+    levels = np.cumsum(deltas)
+
+    same_group = event_groups[1:] == event_groups[:-1]
+    segment_groups = event_groups[:-1][same_group]
+    segment_levels = levels[:-1][same_group]
+    segment_minutes = (times[1:] - times[:-1])[same_group] / _MICROSECONDS_PER_MINUTE
+
+    covered = np.bincount(segment_groups, weights=segment_minutes * (segment_levels > 0),
+                          minlength=group_count)
+    max_level = int(levels.max()) if len(levels) else 0
+    histogram = np.bincount(segment_groups * (max_level + 1) + segment_levels, weights=segment_minutes,
+                            minlength=group_count * (max_level + 1)).reshape(group_count, max_level + 1)
+    histogram[:, 0] = horizon / _MICROSECONDS_PER_MINUTE - covered
+    max_concurrency = np.zeros(group_count, dtype=np.int64)
+    np.maximum.at(max_concurrency, event_groups, levels)
+
+    # Revisit intervals: zero-level segments between two contacts of a group
+    revisit = (segment_levels == 0) & (segment_minutes > 0)
+    revisit_groups, revisit_minutes = segment_groups[revisit], segment_minutes[revisit]
+    revisit_count = np.bincount(revisit_groups, minlength=group_count)
+    revisit_total = np.bincount(revisit_groups, weights=revisit_minutes, minlength=group_count)
+    max_revisit = np.zeros(group_count)
+    np.maximum.at(max_revisit, revisit_groups, revisit_minutes)
+
+    # Gaps also include the stretches before the first and after the last contact
+    first_event = np.full(group_count, horizon_end, dtype=np.int64)
+    last_event = np.full(group_count, horizon_start, dtype=np.int64)
+    np.minimum.at(first_event, event_groups, times)
+    np.maximum.at(last_event, event_groups, times)
+    max_gap = np.maximum.reduce([
+        max_revisit,
+        (first_event - horizon_start) / _MICROSECONDS_PER_MINUTE,
+        np.maximum(horizon_end - last_event, 0) / _MICROSECONDS_PER_MINUTE
+    ])
+    max_gap[passes == 0] = horizon / _MICROSECONDS_PER_MINUTE
+
+    horizon_minutes = horizon / _MICROSECONDS_PER_MINUTE
+    return [{
+        'passes': int(passes[g]),
+        'coverage_minutes': round(float(covered[g]), 3),
+        'coverage_percent': round(100.0 * float(covered[g]) / horizon_minutes, 3) if horizon_minutes else 0.0,
+        'max_gap_minutes': round(float(max_gap[g]), 3),
+        'revisits': int(revisit_count[g]),
+        'mean_revisit_minutes': round(float(revisit_total[g] / revisit_count[g]), 3) if revisit_count[g] else None,
+        'max_revisit_minutes': round(float(max_revisit[g]), 3) if revisit_count[g] else None,
+        'max_concurrency': int(max_concurrency[g]),
+        'concurrency_minutes': [round(float(m), 3) for m in histogram[g, :max_concurrency[g] + 1]]
+    } for g in range(group_count)]
+
+
+def coverage_statistics(window_set: WindowSet, start_time: datetime, end_time: datetime,
+                        satellite_names: Optional[List[str]] = None,
+                        station_names: Optional[List[str]] = None) -> Dict:
+    """Coverage per station, per satellite and network-wide over [start_time, end_time)
+
+    Satellites and stations listed in ``satellite_names``/``station_names``
+    that have no windows are reported with zero coverage.
+    """
+    horizon_start = int(_to_datetime64(start_time).view(np.int64))
+    horizon_end = max(int(_to_datetime64(end_time).view(np.int64)), horizon_start)
+    starts, ends = window_set.interval_bounds()
+
+    def per_resource(field: str, names: List[str], extra: Optional[List[str]]) -> Dict[str, Dict]:
+        metrics = _sweep(window_set.records[field].astype(np.int64), starts, ends, len(names),
+                         horizon_start, horizon_end)
+        result = dict(zip(names, metrics))
+        for name in extra or []:
+            if name not in result:
+                result[name] = _sweep(np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64),
+                                      1, horizon_start, horizon_end)[0]
+        return result
+
+    network = _sweep(np.zeros(len(window_set), dtype=np.int64), starts, ends, 1, horizon_start, horizon_end)[0]
+    return {
+        'horizon_minutes': round((horizon_end - horizon_start) / _MICROSECONDS_PER_MINUTE, 3),
+        'network': network,
+        'stations': per_resource('station', window_set.station_names, station_names),
+        'satellites': per_resource('satellite', window_set.satellite_names, satellite_names)
+    }
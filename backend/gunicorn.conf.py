@@ -0,0 +1,79 @@
+"""
+Gunicorn Configuration
+Multi-worker REST API hosting with a single shared copy of the AI model
+
+The app is imported once in the gunicorn master (``preload_app``). With
+AI_MODEL_PRELOAD=1 (the default here) the PPO model weights are loaded in the
+master before any worker is forked, and every object created so far is
+moved to the GC's permanent generation with ``gc.freeze()``. Workers then share
+the weight pages copy-on-write instead of each loading their own copy, so
+per-worker RSS stays roughly flat as workers are added. torch is imported in
+the master only if the model is served by torch; with the NumPy policy export
+it stays out of the master and every worker.
+
+No threads may be started before the fork: the master never runs inference
+(a torch forward pass would start its intra-op/OpenMP pools), so each worker
+runs its own warm-up pass after the fork, and the micro-batching inference
+thread is created lazily inside each worker on its first request.
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py api_server:app
+
+Note: the Socket.IO broadcaster needs a single eventlet worker and is still
+started with ``python api_server.py``.
+"""
+
+import gc
+import os
+import sys
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+# Threaded workers let concurrent requests share the per-worker inference batches
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+preload_app = True
+
+# The model directory is relative to the repository root
+os.environ.setdefault('AI_MODEL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    '..', 'model&datareq') + os.sep)
+# Background warm-up would start a thread in the master; load synchronously instead
+os.environ.pop('AI_MODEL_WARMUP', None)
+# Likewise the pass store refresh thread is started in each worker after the fork
+# (a lock file lets only one worker propagate at a time)
+pass_precompute = os.environ.pop('PASS_PRECOMPUTE', '1') == '1'
+
+
+def when_ready(server):
+    """Load the model weights in the master, then freeze the heap for copy-on-write sharing"""
+    if os.environ.get('AI_MODEL_PRELOAD', '1') == '1':
+        api_server = sys.modules.get('api_server')
+        if api_server is not None:
+            # Weights only: no forward pass before the fork
+            manager = api_server.ai_model_manager
+            manager.ensure_loaded()
+            # The NumPy policy never needs torch; importing it would add ~450 MB to every worker
+            if manager.inference_backend == 'torch':
+                import torch
+                torch.set_num_threads(1)  # No forward pass runs in the master
+            server.log.info("AI model readiness in master: %s",
+                            api_server.ai_model_manager.get_readiness()['state'])
+    # Keep the GC from touching (and so copying) the shared pages in workers
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Size each worker's torch thread pool, then warm the shared model up in the worker
+
+    One small pool per worker avoids oversubscribing CPU cores.
+    """
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(int(os.environ.get('TORCH_THREADS_PER_WORKER', '1')))
+    api_server = sys.modules.get('api_server')
+    if api_server is not None and api_server.ai_model_manager.model_loaded:
+        api_server.ai_model_manager.warm_up()
+    if pass_precompute and api_server is not None:
+        api_server.pass_store.start(api_server.simulator.window_detector)
@@ -0,0 +1,200 @@
+"""
+Batched Inference Service
+Micro-batched policy inference for concurrent AI scheduling requests
+
+Requests from concurrent API callers are queued and coalesced into a single
+forward pass: the worker takes the first pending request, keeps collecting
+for up to ``max_wait_ms`` (or until ``max_batch_size`` rows are queued), runs
+the policy once on the stacked observations and hands each caller back its
+own slice of the actions.
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+
+class _PendingRequest:
+    __slots__ = ('observations', 'future', 'enqueued_at')
+
+    def __init__(self, observations: np.ndarray):
+        self.observations = observations
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchedInferenceService:
+    """Queue + single worker thread that micro-batches calls to ``predict_fn``
+
+    ``predict_fn`` takes a (batch, n_features) array and returns a
+    (batch, ...) array of actions. When ``n_features`` is given, requests of
+    any other width are rejected in submit() before they reach the queue.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 256, max_wait_ms: float = 3.0,
+                 n_features: Optional[int] = None):
+        self.predict_fn = predict_fn
+        self.n_features = n_features
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: 'queue.Queue[Optional[_PendingRequest]]' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._running = False
+        self._pid = os.getpid()
+
+        # Running statistics
+        self.requests_served = 0
+        self.batches_run = 0
+        self.rows_processed = 0
+        self.max_batch_seen = 0
+        self.total_forward_ms = 0.0
+        self.total_latency_ms = 0.0
+        self.last_batch_size = 0
+
+    def start(self) -> None:
+        """Start the worker thread (called automatically on first request)
+
+        Threads do not survive fork(), so a service inherited by a forked
+        server worker gets a fresh queue and worker thread on first use.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._lock = threading.Lock()
+            self._worker = None
+            self._running = False
+        with self._lock:
+            if self._running and self._worker is not None and self._worker.is_alive():
+                return
+            self._running = True
+            self._worker = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the worker after it drains the current batch"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def submit(self, observations: np.ndarray) -> Future:
+        """Queue observations (one row or a (k, n) block) and return a Future
+
+        The future resolves to ``(actions, info)`` where ``info`` holds the
+        size of the batch the request rode in and its queue/forward latency.
+        """
+        observations = np.atleast_2d(np.asarray(observations, dtype=np.float32))
+        if observations.ndim != 2:
+            raise ValueError(f"Observations must be one row or a 2-D block, got shape {observations.shape}")
+        if self.n_features is not None and observations.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features per observation, "
+                             f"got {observations.shape[1]}")
+        if not self._running or self._pid != os.getpid() or not self._worker.is_alive():
+            self.start()
+        request = _PendingRequest(observations)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, observations: np.ndarray, timeout: Optional[float] = 30.0) -> Tuple[np.ndarray, Dict]:
+        """Blocking convenience wrapper around submit()
+
+        A single observation row returns a single action row, mirroring
+        ``model.predict``.
+        """
+        single = np.asarray(observations).ndim == 1
+        actions, info = self.submit(observations).result(timeout)
+        return (actions[0] if single else actions), info
+
+    def _collect_batch(self, first: _PendingRequest) -> List[_PendingRequest]:
+        batch = [first]
+        rows = len(first.observations)
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._running = False
+                break
+            batch.append(request)
+            rows += len(request.observations)
+        return batch
+
+    def _run(self) -> None:
+        while self._running:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect_batch(first)
+            try:
+                self._execute(batch)
+            except Exception as e:
+                # Never let one bad batch kill the worker and strand later callers
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _execute(self, batch: List[_PendingRequest]) -> None:
+        started = time.perf_counter()
+        try:
+            stacked = np.concatenate([r.observations for r in batch], axis=0)
+            actions = np.asarray(self.predict_fn(stacked))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finished = time.perf_counter()
+        forward_ms = (finished - started) * 1000.0
+
+        offset = 0
+        for request in batch:
+            count = len(request.observations)
+            latency_ms = (finished - request.enqueued_at) * 1000.0
+            info = {
+                'batch_size': len(stacked),
+                'batch_requests': len(batch),
+                'forward_ms': round(forward_ms, 3),
+                'latency_ms': round(latency_ms, 3)
+            }
+            request.future.set_result((actions[offset:offset + count], info))
+            offset += count
+            self.total_latency_ms += latency_ms
+
+        self.requests_served += len(batch)
+        self.batches_run += 1
+        self.rows_processed += len(stacked)
+        self.max_batch_seen = max(self.max_batch_seen, len(stacked))
+        self.total_forward_ms += forward_ms
+        self.last_batch_size = len(stacked)
+
+    def get_stats(self) -> Dict:
+        """Batching and latency statistics since startup"""
+        batches = max(self.batches_run, 1)
+        requests = max(self.requests_served, 1)
+        return {
+            'running': self._running,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'requests_served': self.requests_served,
+            'batches_run': self.batches_run,
+            'avg_batch_size': round(self.rows_processed / batches, 2),
+            'max_batch_seen': self.max_batch_seen,
+            'last_batch_size': self.last_batch_size,
+            'avg_forward_ms': round(self.total_forward_ms / batches, 3),
+            'avg_latency_ms': round(self.total_latency_ms / requests, 3)
+        }
@@ -0,0 +1,136 @@
+"""
+NumPy Policy
+Torch-free deterministic inference for the trained PPO scheduling policy
+
+``export_policy`` pulls the actor weights of a stable-baselines3 MlpPolicy
+out of ``satellite_scheduler_model.zip`` into a compact ``.npz`` (this step
+needs torch). ``NumpyPolicy`` then runs the deterministic forward pass
+
+    action = clip(action_net(tanh(W2 · tanh(W1 · obs + b1) + b2)), low, high)
+
+with plain NumPy, matching ``model.predict(obs, deterministic=True)``. API
+workers can serve AI scheduling without importing torch at all.
+
+Usage (from the repository root):
+    python backend/numpy_policy.py "model&datareq/satellite_scheduler_model.zip"
+"""
+
+from typing import List, Optional, Tuple
+import hashlib
+import json
+import os
+import sys
+import zipfile
+import numpy as np
+
+POLICY_SUFFIX = '_policy.npz'
+_ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0.0)
+}
+
+
+def policy_path_for(model_zip: str) -> str:
+    """Default .npz path next to a saved model (model.zip -> model_policy.npz)"""
+    return os.path.splitext(model_zip)[0] + POLICY_SUFFIX
+
+
+def model_fingerprint(model_zip: str) -> str:
+    """SHA-1 of the saved policy weights, used to detect a stale export"""
+    with zipfile.ZipFile(model_zip) as archive:
+        return hashlib.sha1(archive.read('policy.pth')).hexdigest()
+
+
+class NumpyPolicy:
+    """Deterministic MLP actor evaluated with NumPy"""
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray]], action_weight: np.ndarray,
+                 action_bias: np.ndarray, action_low: np.ndarray, action_high: np.ndarray,
+                 activation: str = 'tanh', fingerprint: Optional[str] = None):
+        # Weights are stored transposed so a batch is a chain of (B, n) @ (n, m) products
+        self.layers = [(np.ascontiguousarray(w.T, dtype=np.float32), b.astype(np.float32)) for w, b in layers]
+        self.action_weight = np.ascontiguousarray(action_weight.T, dtype=np.float32)
+        self.action_bias = action_bias.astype(np.float32)
+        self.action_low = action_low.astype(np.float32)
+        self.action_high = action_high.astype(np.float32)
+        self.activation = activation
+        self._activation_fn = _ACTIVATIONS[activation]
+        self.fingerprint = fingerprint
+
+    @property
+    def observation_size(self) -> int:
+        return self.layers[0][0].shape[0] if self.layers else self.action_weight.shape[0]
+
+    @classmethod
+    def load(cls, npz_path: str) -> 'NumpyPolicy':
+        with np.load(npz_path) as data:
+            layer_count = int(data['layer_count'])
+            layers = [(data[f'pi_{i}_weight'], data[f'pi_{i}_bias']) for i in range(layer_count)]
+            return cls(layers, data['action_weight'], data['action_bias'],
+                       data['action_low'], data['action_high'],
+                       activation=str(data['activation']),
+                       fingerprint=str(data['fingerprint']) or None)
+
+    def save(self, npz_path: str) -> None:
+        arrays = {
+            'layer_count': np.array(len(self.layers)),
+            'action_weight': self.action_weight.T,
+            'action_bias': self.action_bias,
+            'action_low': self.action_low,
+            'action_high': self.action_high,
+            'activation': np.array(self.activation),
+            'fingerprint': np.array(self.fingerprint or '')
+        }
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f'pi_{i}_weight'] = w.T
+            arrays[f'pi_{i}_bias'] = b
+        np.savez(npz_path, **arrays)
+
+    def predict(self, observations: np.ndarray) -> np.ndarray:
+        """(batch, n_features) observations -> (batch, n_actions) clipped actions"""
+        hidden = np.atleast_2d(np.asarray(observations, dtype=np.float32))
+        for weight, bias in self.layers:
+            hidden = self._activation_fn(hidden @ weight + bias)
+        actions = hidden @ self.action_weight + self.action_bias
+        return np.clip(actions, self.action_low, self.action_high)
+
+
+def _parse_array_repr(text: str) -> np.ndarray:
+    """Parse a NumPy array repr as stored in the model's JSON data (e.g. '[0. 0. 5.]')"""
+    return np.array(text.strip().strip('[]').split(), dtype=np.float32)
+
+
+def export_policy(model_zip: str, npz_path: Optional[str] = None) -> str:
+    """Extract the actor network of a saved PPO MlpPolicy into an .npz (requires torch)"""
+    import io
+    import torch
+
+    npz_path = npz_path or policy_path_for(model_zip)
+    with zipfile.ZipFile(model_zip) as archive:
+        state = torch.load(io.BytesIO(archive.read('policy.pth')), map_location='cpu')
+        data = json.loads(archive.read('data'))
+
+    policy_kwargs = data.get('policy_kwargs') or {}
+    activation = 'tanh'
+    if 'activation_fn' in policy_kwargs:
+        activation = 'relu' if 'ReLU' in str(policy_kwargs['activation_fn']) else 'tanh'
+
+    # mlp_extractor.policy_net is Linear/activation pairs: keys .0, .2, .4 ...
+    prefix = 'mlp_extractor.policy_net.'
+    indices = sorted({int(k[len(prefix):].split('.')[0]) for k in state if k.startswith(prefix)})
+    layers = [(state[f'{prefix}{i}.weight'].numpy(), state[f'{prefix}{i}.bias'].numpy()) for i in indices]
+
+    action_space = data['action_space']
+    low = _parse_array_repr(action_space['low'])
+    high = _parse_array_repr(action_space['high'])
+
+    policy = NumpyPolicy(layers, state['action_net.weight'].numpy(), state['action_net.bias'].numpy(),
+                         low, high, activation=activation, fingerprint=model_fingerprint(model_zip))
+    policy.save(npz_path)
+    return npz_path
+
+
+if __name__ == "__main__":
+    model_zip = sys.argv[1] if len(sys.argv) > 1 else os.path.join("model&datareq", "satellite_scheduler_model.zip")
+    output = export_policy(model_zip, sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"✅ Exported policy weights to {output} ({os.path.getsize(output)} bytes)")
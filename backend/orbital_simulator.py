@@ -8,7 +8,9 @@ from typing import List, Dict, Optional, Tuple
 import numpy as np
 from skyfield.api import utc
 from satellite_tracker import SatelliteTracker, SAMPLE_TLE_DATA, SAMPLE_GROUND_STATIONS
-from communication_windows import CommunicationWindowDetector, CommunicationWindow
+from communication_windows import CommunicationWindowDetector, CommunicationWindow, WindowSet
+from coverage_stats import coverage_statistics
+from trajectory import Trajectory
 
 class SatelliteConstellationSimulator:
     """Main simulation engine for satellite constellation management"""
@@ -46,9 +48,9 @@ class SatelliteConstellationSimulator:
         all_windows = self.window_detector.find_all_windows(start_time, duration_hours)
         
         # Generate orbital predictions
-        orbital_predictions = {}
+        orbital_predictions: Dict[str, Trajectory] = {}
         for sat_name in self.tracker.satellites.keys():
-            orbital_predictions[sat_name] = self.tracker.predict_orbit_path(
+            orbital_predictions[sat_name] = self.tracker.predict_trajectory(
                 sat_name, start_time, duration_hours, step_minutes=10
             )
             
@@ -86,29 +88,27 @@ class SatelliteConstellationSimulator:
             avg_window_duration = 0
             avg_elevation = 0
             
+        coverage = self._calculate_coverage(all_windows)
         return {
             'total_communication_windows': total_windows,
             'total_communication_time_minutes': total_duration,
             'average_window_duration_minutes': avg_window_duration,
             'average_max_elevation_degrees': avg_elevation,
-            'coverage_efficiency': self._calculate_coverage_efficiency(all_windows)
+            # Percentage of the horizon with at least one contact (overlaps counted once)
+            'coverage_efficiency': coverage['network']['coverage_percent'],
+            'coverage': coverage
         }
         
-    def _calculate_coverage_efficiency(self, all_windows: Dict[str, List[CommunicationWindow]]) -> float:
-        """Calculate network coverage efficiency percentage"""
-        if not all_windows:
-            return 0.0
-            
-        total_possible_time = self.simulation_duration_hours * 60  # minutes
-        total_communication_time = sum(
-            sum(w.duration_minutes for w in windows) 
-            for windows in all_windows.values()
+    def _calculate_coverage(self, all_windows: Dict[str, List[CommunicationWindow]]) -> Dict:
+        """Exact coverage, gap and concurrency statistics per station, satellite and network"""
+        start_time = self.simulation_start_time
+        return coverage_statistics(
+            WindowSet.from_pairs(all_windows),
+            start_time, start_time + timedelta(hours=self.simulation_duration_hours),
+            satellite_names=list(self.tracker.satellites.keys()),
+            station_names=list(self.tracker.ground_stations.keys())
         )
         
-        # Efficiency as percentage of time with communication opportunities
-        efficiency = (total_communication_time / (total_possible_time * len(all_windows))) * 100
-        return min(efficiency, 100.0)  # Cap at 100%
-        
     def get_satellite_status(self, satellite_name: str, time: Optional[datetime] = None) -> Dict:
         """Get current status of specific satellite"""
         if time is None:
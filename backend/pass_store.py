@@ -0,0 +1,618 @@
+"""
+Pass Store
+Precomputed communication passes in SQLite over a rolling horizon
+
+A background job propagates every satellite x ground station pair over the
+next ``horizon_hours`` (7 days by default) and writes the passes to a SQLite
+table indexed by station, satellite and start time. Endpoints then answer
+window queries with an indexed range lookup instead of re-propagating.
+
+The job is incremental:
+
+- passes and coverage are keyed on each pair's content fingerprints (a hash
+  of the satellite's TLE and of the station's coordinates); a new TLE or
+  moved station rebuilds only the pairs that involve it. Fingerprints agree
+  between the workers sharing the file and across restarts, and workers
+  whose catalogs differ each keep their own version of a pair instead of
+  overwriting each other's; a version no refresh has extended for
+  ``STALE_COVERAGE_HOURS`` is dropped
+- as the clock advances, expired passes are deleted and each pair is
+  extended by the newly uncovered hours (passes cut off at the old horizon
+  end are recomputed whole)
+
+Queries fall back to live propagation (``None``) whenever the store does not
+cover the requested range for the current catalog.
+
+Schedules uploaded by partners are bulk-loaded into a separate
+``imported_passes`` table (see ``import_windows``), so the refresh job never
+touches them and every worker process can query them.
+
+Under gunicorn every worker may run the job; a lock file next to the
+database makes sure only one of them propagates at a time.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each process refreshes on its own
+    fcntl = None
+
+from communication_windows import CommunicationWindowDetector, WindowSet, WINDOW_DTYPE, _to_datetime64
+from scheduling_features import DEFAULT_QUALITY_WEIGHTS, window_quality_sql
+from window_query import DEFAULT_PAGE_SIZE, SORT_COLUMNS, keyset_sql, row_cursor
+
+DEFAULT_HORIZON_HOURS = 168
+# Stored in PRAGMA user_version; older databases drop their (derived) passes on open
+SCHEMA_VERSION = 2
+STALE_COVERAGE_HOURS = 2
+# Columns of a find_window_page row
+PAGE_COLUMNS = ('satellite', 'station', 'start_us', 'end_us', 'duration_minutes', 'max_elevation', 'quality_score')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS passes (
+    satellite TEXT NOT NULL,
+    station TEXT NOT NULL,
+    satellite_fingerprint TEXT NOT NULL,
+    station_fingerprint TEXT NOT NULL,
+    start_us INTEGER NOT NULL,
+    end_us INTEGER NOT NULL,
+    duration_minutes REAL NOT NULL,
+    max_elevation REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS passes_by_start ON passes (start_us);
+CREATE INDEX IF NOT EXISTS passes_by_station ON passes (station, start_us);
+CREATE INDEX IF NOT EXISTS passes_by_satellite ON passes (satellite, start_us);
+CREATE TABLE IF NOT EXISTS coverage (
+    satellite TEXT NOT NULL,
+    station TEXT NOT NULL,
+    satellite_fingerprint TEXT NOT NULL,
+    station_fingerprint TEXT NOT NULL,
+    start_us INTEGER NOT NULL,
+    end_us INTEGER NOT NULL,
+    max_length_us INTEGER NOT NULL,
+    PRIMARY KEY (satellite, station, satellite_fingerprint, station_fingerprint)
+);
+CREATE INDEX IF NOT EXISTS coverage_by_fingerprint ON coverage (satellite_fingerprint, station_fingerprint);
+CREATE TABLE IF NOT EXISTS imports (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    imported_at TEXT NOT NULL,
+    windows INTEGER NOT NULL DEFAULT 0,
+    max_length_us INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS imported_passes (
+    import_id INTEGER NOT NULL,
+    satellite TEXT NOT NULL,
+    station TEXT NOT NULL,
+    start_us INTEGER NOT NULL,
+    end_us INTEGER NOT NULL,
+    duration_minutes REAL NOT NULL,
+    max_elevation REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS imported_by_start ON imported_passes (start_us);
+CREATE INDEX IF NOT EXISTS imported_by_import ON imported_passes (import_id);
+"""
+
+
+def _microseconds(moment: datetime) -> int:
+    return int(_to_datetime64(moment).view(np.int64))
+
+
+def _datetime(microseconds: int) -> datetime:
+    return datetime(1970, 1, 1) + timedelta(microseconds=microseconds)
+
+
+class PassStore:
+    """SQLite-backed pass table kept current by an incremental refresh job"""
+
+    def __init__(self, path: str, horizon_hours: float = DEFAULT_HORIZON_HOURS):
+        self.path = path
+        self.horizon_hours = horizon_hours
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._thread = None
+        self._stop = threading.Event()
+        # Coverage aggregates per (tracker, catalog version, filters), valid while the database is unchanged
+        self._coverage_cache: Dict[Tuple, Tuple[int, int, int, int]] = {}
+        self._cache_generation = None
+        self._writes = 0  # Own commits; PRAGMA data_version only counts other connections'
+        self.stats = {
+            'refreshes': 0,
+            'pairs_rebuilt': 0,
+            'pairs_extended': 0,
+            'passes_written': 0,
+            'last_refresh': None,
+            'last_refresh_ms': None,
+            'queries': 0,
+            'query_misses': 0
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection for this process (a connection inherited across fork is not reused)"""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._migrate(self._connection)
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Create the schema, discarding precomputed passes written by an older layout"""
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if version < SCHEMA_VERSION:
+                # Passes and coverage are recomputed by the next refresh; imports are kept
+                connection.execute('DROP TABLE IF EXISTS coverage')
+                connection.execute('DROP TABLE IF EXISTS passes')
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    connection.execute(statement)
+            connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _coverage(self) -> Dict[Tuple[str, str, str, str], Tuple[int, int, int]]:
+        with self._lock:
+            rows = self._db().execute(
+                'SELECT satellite, station, satellite_fingerprint, station_fingerprint, '
+                'start_us, end_us, max_length_us '
+                'FROM coverage'
+            ).fetchall()
+        return {row[:4]: row[4:] for row in rows}
+
+    # ---- precompute job ----
+
+    def refresh(self, detector: CommunicationWindowDetector, now: Optional[datetime] = None) -> Dict:
+        """Bring the store up to date for the current catalog and horizon"""
+        lock_file = None
+        if fcntl is not None:
+            lock_file = open(self.path + '.lock', 'w')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return {'skipped': True}
+        try:
+            return self._refresh(detector, now)
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _refresh(self, detector: CommunicationWindowDetector, now: Optional[datetime]) -> Dict:
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        if now.tzinfo is not None:
+            now = _datetime(_microseconds(now))
+        horizon_start = now.replace(minute=0, second=0, microsecond=0)
+        # One extra hour so "now + horizon_hours" stays covered until the next extension
+        horizon_end = horizon_start + timedelta(hours=self.horizon_hours + 1)
+        start_us, end_us = _microseconds(horizon_start), _microseconds(horizon_end)
+
+        # Expire passes that ended before the horizon
+        with self._lock:
+            db = self._db()
+            db.execute('BEGIN IMMEDIATE')
+            db.execute('DELETE FROM passes WHERE end_us <= ?', (start_us,))
+            db.execute('UPDATE coverage SET start_us = MAX(start_us, ?)', (start_us,))
+            db.execute('COMMIT')
+            self._writes += 1
+
+        tracker = detector.tracker
+        coverage = self._coverage()
+        rebuilt = extended = written = 0
+        for satellite in list(tracker.satellites):
+            for station in list(tracker.ground_stations):
+                key = (satellite, station, tracker.satellite_fingerprints.get(satellite, ''),
+                       tracker.station_fingerprints.get(station, ''))
+                current = coverage.get(key)
+                if current is None or current[1] < start_us:
+                    written += self._compute_pair(detector, key, start_us, end_us, rebuild=True)
+                    rebuilt += 1
+                elif current[1] < end_us:
+                    written += self._compute_pair(detector, key, current[1], end_us, rebuild=False,
+                                                  covered_from=current[0], max_length=current[2])
+                    extended += 1
+
+        # Drop pair versions no process has been extending (e.g. a replaced TLE)
+        stale_us = end_us - int(STALE_COVERAGE_HOURS * 3.6e9)
+        with self._lock:
+            db = self._db()
+            db.execute('BEGIN IMMEDIATE')
+            db.execute('DELETE FROM passes WHERE (satellite, station, satellite_fingerprint, station_fingerprint) '
+                       'IN (SELECT satellite, station, satellite_fingerprint, station_fingerprint '
+                       'FROM coverage WHERE end_us < ?)', (stale_us,))
+            db.execute('DELETE FROM coverage WHERE end_us < ?', (stale_us,))
+            db.execute('COMMIT')
+            self._writes += 1
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.stats['refreshes'] += 1
+        self.stats['pairs_rebuilt'] += rebuilt
+        self.stats['pairs_extended'] += extended
+        self.stats['passes_written'] += written
+        self.stats['last_refresh'] = datetime.utcnow().isoformat()
+        self.stats['last_refresh_ms'] = elapsed_ms
+        return {'pairs_rebuilt': rebuilt, 'pairs_extended': extended, 'passes_written': written,
+                'horizon_start': horizon_start.isoformat(), 'horizon_end': horizon_end.isoformat(),
+                'elapsed_ms': elapsed_ms}
+
+    def _compute_pair(self, detector: CommunicationWindowDetector, key: Tuple[str, str, str, str],
+                      from_us: int, end_us: int, rebuild: bool,
+                      covered_from: Optional[int] = None, max_length: int = 0) -> int:
+        """Propagate one pair version over [from_us, end_us) and replace its passes from there on
+
+        ``key`` is (satellite, station, satellite fingerprint, station fingerprint).
+        """
+        satellite, station = key[:2]
+        pair = 'satellite = ? AND station = ? AND satellite_fingerprint = ? AND station_fingerprint = ?'
+        if not rebuild:
+            # Passes reaching the old horizon end were cut off there; recompute them whole
+            with self._lock:
+                row = self._db().execute(
+                    f'SELECT MIN(start_us) FROM passes WHERE {pair} AND end_us >= ?', (*key, from_us)
+                ).fetchone()
+            if row[0] is not None:
+                from_us = min(from_us, row[0])
+
+        windows = detector.find_communication_windows(
+            satellite, station, _datetime(from_us), (end_us - from_us) / 3.6e9
+        )
+        rows = [(*key, _microseconds(w.start_time), _microseconds(w.end_time),
+                 float(w.duration_minutes), float(w.max_elevation)) for w in windows]
+        if rows:
+            max_length = max(max_length, max(row[5] - row[4] for row in rows))
+
+        with self._lock:
+            db = self._db()
+            db.execute('BEGIN IMMEDIATE')
+            if rebuild:
+                db.execute(f'DELETE FROM passes WHERE {pair}', key)
+            else:
+                db.execute(f'DELETE FROM passes WHERE {pair} AND start_us >= ?', (*key, from_us))
+            db.executemany('INSERT INTO passes VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            db.execute('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (*key, from_us if rebuild else covered_from, end_us, max_length))
+            db.execute('COMMIT')
+            self._writes += 1
+        return len(rows)
+
+    def start(self, detector: CommunicationWindowDetector, interval_seconds: float = 600,
+              poll_seconds: float = 5) -> None:
+        """Run refresh in a daemon thread every interval, or as soon as the catalog changes"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def refresh_loop():
+            seen_version = None
+            last_refresh = 0.0
+            while not self._stop.is_set():
+                version = detector.tracker.catalog_version
+                if version != seen_version or time.monotonic() - last_refresh >= interval_seconds:
+                    try:
+                        summary = self.refresh(detector)
+                        if not summary.get('skipped'):
+                            print(f"✅ Pass store refreshed: {summary['pairs_rebuilt']} pairs rebuilt, "
+                                  f"{summary['pairs_extended']} extended in {summary['elapsed_ms']} ms")
+                    except Exception as e:
+                        print(f"⚠️ Pass store refresh failed: {e}")
+                    seen_version = version
+                    last_refresh = time.monotonic()
+                self._stop.wait(poll_seconds)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=refresh_loop, name='pass-store-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---- queries ----
+
+    def _range_query(self, tracker, start_time: datetime, duration_hours: float,
+                     satellites: Optional[List[str]], stations: Optional[List[str]],
+                     min_elevation: Optional[float]) -> Optional[Tuple[str, List]]:
+        """WHERE clause and parameters for passes overlapping the range, or None if the store does not cover it
+
+        Coverage is checked with one aggregate query over the requested
+        pairs; name and fingerprint sets are bound as single JSON parameters,
+        so neither the Python work nor the parameter count grows with
+        satellites x stations.
+        """
+        self.stats['queries'] += 1
+        satellite_filter, station_filter = satellites, stations
+        satellites = list(dict.fromkeys(satellites if satellites is not None else tracker.satellites))
+        stations = list(dict.fromkeys(stations if stations is not None else tracker.ground_stations))
+        # Only this catalog's version of each pair (fingerprints include the name)
+        fingerprints = {'satellite_fingerprint': [tracker.satellite_fingerprints.get(sat) for sat in satellites],
+                        'station_fingerprint': [tracker.station_fingerprints.get(st) for st in stations]}
+        low = _microseconds(start_time)
+        high = low + int(duration_hours * 3.6e9)
+
+        if None in fingerprints['satellite_fingerprint'] or None in fingerprints['station_fingerprint']:
+            self.stats['query_misses'] += 1  # Unknown name
+            return None
+        key = (id(tracker), tracker.catalog_version,
+               None if satellite_filter is None else tuple(satellites),
+               None if station_filter is None else tuple(stations))
+        pairs, covered_from, covered_until, max_length = self._pair_coverage(key, fingerprints)
+        if pairs != len(satellites) * len(stations) or (pairs and (covered_from > low or covered_until < high)):
+            self.stats['query_misses'] += 1
+            return None
+
+        return self._where(low, high, max_length, satellite_filter, station_filter, min_elevation,
+                           fingerprints=fingerprints)
+
+    def _pair_coverage(self, key: Tuple, fingerprints: Dict[str, List[str]]) -> Tuple[int, int, int, int]:
+        """(covered pairs, latest start, earliest end, longest pass) over the requested pairs, cached"""
+        with self._lock:
+            db = self._db()
+            generation = (self._pid, db.execute('PRAGMA data_version').fetchone()[0], self._writes)
+            if generation != self._cache_generation or len(self._coverage_cache) >= 256:
+                self._coverage_cache = {}
+                self._cache_generation = generation
+            summary = self._coverage_cache.get(key)
+            if summary is None:
+                summary = tuple(db.execute(
+                    'SELECT COUNT(*), MAX(start_us), MIN(end_us), COALESCE(MAX(max_length_us), 0) FROM coverage '
+                    'WHERE satellite_fingerprint IN (SELECT value FROM json_each(?)) '
+                    'AND station_fingerprint IN (SELECT value FROM json_each(?))',
+                    (json.dumps(fingerprints['satellite_fingerprint']),
+                     json.dumps(fingerprints['station_fingerprint']))
+                ).fetchone())
+                self._coverage_cache[key] = summary
+        return summary
+
+    @staticmethod
+    def _where(low: int, high: int, max_length: int,
+               satellites: Optional[List[str]], stations: Optional[List[str]],
+               min_elevation: Optional[float], extra_conditions: Tuple[str, ...] = (),
+               fingerprints: Optional[Dict[str, List[str]]] = None) -> Tuple[str, List]:
+        """WHERE clause for passes overlapping [low, high) that match the filters"""
+        conditions = ['start_us >= ?', 'start_us < ?', 'end_us > ?', *extra_conditions]
+        params: List = [low - max_length, high, low]
+        for column, names in (('satellite', satellites), ('station', stations), *(fingerprints or {}).items()):
+            if names is not None:
+                conditions.append(f'{column} IN (SELECT value FROM json_each(?))')
+                params.append(json.dumps(list(names)))
+        if min_elevation is not None:
+            conditions.append('max_elevation >= ?')
+            params.append(float(min_elevation))
+        return ' AND '.join(conditions), params
+
+    @staticmethod
+    def _select(table: str, where: Tuple[str, List]) -> Tuple[str, List]:
+        """SQL for a table's passes matching a _where clause, in start order"""
+        return ('SELECT satellite, station, start_us, end_us, duration_minutes, max_elevation '
+                f'FROM {table} WHERE {where[0]} ORDER BY start_us'), where[1]
+
+    def _imported_where(self, db: sqlite3.Connection, low: int, high: int,
+                        satellites: Optional[List[str]], stations: Optional[List[str]],
+                        min_elevation: Optional[float]) -> Tuple[str, List]:
+        """_where clause over imported_passes, restricted to completed imports"""
+        max_length = db.execute(
+            'SELECT COALESCE(MAX(max_length_us), 0) FROM imports WHERE complete = 1'
+        ).fetchone()[0]
+        return self._where(low, high, max_length, satellites, stations, min_elevation,
+                           ('import_id IN (SELECT id FROM imports WHERE complete = 1)',))
+
+    def find_window_set(self, tracker, start_time: datetime, duration_hours: float,
+                        satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                        min_elevation: Optional[float] = None) -> Optional[WindowSet]:
+        """Stored passes overlapping the range, or None if the store does not cover it
+
+        ``satellites``/``stations`` restrict the query to those names and
+        ``min_elevation`` to passes peaking at least that high; all filters
+        run in SQL. Unknown names also return None so the caller's live path
+        can report them.
+        """
+        where = self._range_query(tracker, start_time, duration_hours, satellites, stations, min_elevation)
+        if where is None:
+            return None
+        with self._lock:
+            rows = self._db().execute(*self._select('passes', where)).fetchall()
+        return self._to_window_set(rows, start_time.tzinfo is not None)
+
+    def iter_window_sets(self, tracker, start_time: datetime, duration_hours: float,
+                         satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                         min_elevation: Optional[float] = None,
+                         chunk_rows: int = 10000) -> Optional[Iterator[WindowSet]]:
+        """Like find_window_set, but yields the passes in start order ``chunk_rows`` at a time
+
+        Coverage is checked up front (None on a miss). The rows are read
+        through a private connection, so a slow consumer holds neither the
+        shared connection nor more than one chunk in memory.
+        """
+        where = self._range_query(tracker, start_time, duration_hours, satellites, stations, min_elevation)
+        if where is None:
+            return None
+        query = self._select('passes', where)
+        tz_aware = start_time.tzinfo is not None
+
+        def chunks() -> Iterator[WindowSet]:
+            connection = sqlite3.connect(self.path)
+            try:
+                cursor = connection.execute(*query)
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    yield self._to_window_set(rows, tz_aware)
+            finally:
+                connection.close()
+
+        return chunks()
+
+    # ---- imported schedules ----
+
+    def import_windows(self, batches: Iterable[WindowSet], filename: str, replace: bool = False) -> Dict:
+        """Bulk-load externally supplied windows, committing one batch at a time
+
+        Rows only become visible to queries once the whole import succeeded;
+        a failed import deletes what it wrote. ``replace`` drops every
+        earlier import when this one completes.
+        """
+        self._db()  # Ensure the schema exists
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            import_id = connection.execute('INSERT INTO imports (filename, imported_at) VALUES (?, ?)',
+                                           (filename, datetime.utcnow().isoformat())).lastrowid
+            windows = written_batches = max_length = 0
+            try:
+                for window_set in batches:
+                    if not len(window_set):
+                        continue
+                    starts, ends = window_set.interval_bounds()
+                    rows = zip(itertools.repeat(import_id),
+                               window_set.satellite_array().tolist(), window_set.station_array().tolist(),
+                               starts.tolist(), ends.tolist(),
+                               window_set.records['duration_minutes'].tolist(),
+                               window_set.records['max_elevation'].tolist())
+                    connection.execute('BEGIN IMMEDIATE')
+                    connection.executemany('INSERT INTO imported_passes VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                    connection.execute('COMMIT')
+                    windows += len(window_set)
+                    written_batches += 1
+                    max_length = max(max_length, int((ends - starts).max()))
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                connection.execute('DELETE FROM imported_passes WHERE import_id = ?', (import_id,))
+                connection.execute('DELETE FROM imports WHERE id = ?', (import_id,))
+                raise
+
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute('UPDATE imports SET windows = ?, max_length_us = ?, complete = 1 WHERE id = ?',
+                               (windows, max_length, import_id))
+            if replace:
+                connection.execute('DELETE FROM imported_passes WHERE import_id != ?', (import_id,))
+                connection.execute('DELETE FROM imports WHERE id != ?', (import_id,))
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+        return {'import_id': import_id, 'windows': windows, 'batches': written_batches}
+
+    def find_imported_window_set(self, start_time: datetime, duration_hours: float,
+                                 satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                                 min_elevation: Optional[float] = None) -> WindowSet:
+        """Windows from completed imports overlapping the range, with the same filters as find_window_set"""
+        low = _microseconds(start_time)
+        high = low + int(duration_hours * 3.6e9)
+        with self._lock:
+            db = self._db()
+            where = self._imported_where(db, low, high, satellites, stations, min_elevation)
+            rows = db.execute(*self._select('imported_passes', where)).fetchall()
+        return self._to_window_set(rows, start_time.tzinfo is not None)
+
+    # ---- pages ----
+
+    def find_window_page(self, tracker, start_time: datetime, duration_hours: float,
+                         satellites: Optional[List[str]] = None, stations: Optional[List[str]] = None,
+                         min_elevation: Optional[float] = None, min_quality: Optional[float] = None,
+                         quality_weights: Optional[Dict[str, float]] = None,
+                         sort: str = 'start', descending: bool = False, limit: Optional[int] = DEFAULT_PAGE_SIZE,
+                         cursor: Optional[str] = None,
+                         imported: bool = False) -> Optional[Tuple[WindowSet, Optional[str], int, float]]:
+        """One sorted page of quality-scored windows, cut in SQL
+
+        The same page and cursor window_query.paginate would return for
+        find_window_set (or find_imported_window_set with ``imported``)
+        after scoring with ``quality_weights`` and applying ``min_quality``,
+        but the keyset condition, ORDER BY and LIMIT run in SQLite, so only
+        the page is loaded. Returns (page, next cursor, total windows,
+        total duration in minutes) with the totals from one aggregate
+        query, or None if the store does not cover the range
+        (``imported`` queries never miss).
+        """
+        keyset, keyset_params, order_by = keyset_sql(sort, descending, cursor)
+        quality, quality_params = window_quality_sql(quality_weights)
+        low = _microseconds(start_time)
+        high = low + int(duration_hours * 3.6e9)
+        if imported:
+            table, where = 'imported_passes', None
+        else:
+            table = 'passes'
+            where = self._range_query(tracker, start_time, duration_hours, satellites, stations, min_elevation)
+            if where is None:
+                return None
+
+        with self._lock:
+            db = self._db()
+            if imported:
+                where = self._imported_where(db, low, high, satellites, stations, min_elevation)
+            scored = (f'SELECT satellite, station, start_us, end_us, duration_minutes, max_elevation, '
+                      f'{quality} AS quality_score FROM {table} WHERE {where[0]}')
+            params = [*quality_params, *where[1]]
+            if min_quality is not None:
+                scored = f'SELECT * FROM ({scored}) WHERE quality_score >= ?'
+                params.append(float(min_quality))
+            total, total_duration = db.execute(
+                f'SELECT COUNT(*), COALESCE(SUM(duration_minutes), 0.0) FROM ({scored})', params
+            ).fetchone()
+            rows = db.execute(
+                f'SELECT * FROM ({scored}) {"WHERE " + keyset if keyset else ""} ORDER BY {order_by} LIMIT ?',
+                [*params, *keyset_params, -1 if limit is None else limit + 1]
+            ).fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = row_cursor(sort, descending, last[PAGE_COLUMNS.index(SORT_COLUMNS[sort])],
+                                     last[0], last[1], last[2])
+        page = self._to_window_set([row[:6] for row in rows], start_time.tzinfo is not None)
+        page.records['quality_score'] = [row[6] for row in rows]
+        page.score_weights = tuple(sorted((quality_weights or DEFAULT_QUALITY_WEIGHTS).items()))
+        return page, next_cursor, total, float(total_duration)
+
+    @staticmethod
+    def _to_window_set(rows: List[Tuple], tz_aware: bool) -> WindowSet:
+        records = np.empty(len(rows), dtype=WINDOW_DTYPE)
+        if not rows:
+            return WindowSet(records, [], [], tz_aware)
+        satellites, stations, starts, ends, durations, elevations = zip(*rows)
+        satellite_names, records['satellite'] = np.unique(satellites, return_inverse=True)
+        station_names, records['station'] = np.unique(stations, return_inverse=True)
+        records['start'] = np.array(starts, dtype=np.int64).view('datetime64[us]')
+        records['end'] = np.array(ends, dtype=np.int64).view('datetime64[us]')
+        records['duration_minutes'] = durations
+        records['max_elevation'] = elevations
+        records['quality_score'] = 0.0
+        return WindowSet(records, satellite_names.tolist(), station_names.tolist(), tz_aware)
+
+    def get_stats(self) -> Dict:
+        """Refresh and query counters plus table size"""
+        with self._lock:
+            passes = self._db().execute('SELECT COUNT(*) FROM passes').fetchone()[0]
+            pairs, covered_until = self._db().execute(
+                'SELECT COUNT(DISTINCT satellite || char(0) || station), MIN(end_us) FROM coverage'
+            ).fetchone()
+            imports, imported_windows = self._db().execute(
+                'SELECT COUNT(*), COALESCE(SUM(windows), 0) FROM imports WHERE complete = 1'
+            ).fetchone()
+        return {
+            **self.stats,
+            'path': self.path,
+            'horizon_hours': self.horizon_hours,
+            'passes': passes,
+            'pairs': pairs,
+            'covered_until': _datetime(covered_until).isoformat() if covered_until is not None else None,
+            'imports': imports,
+            'imported_windows': imported_windows,
+            'refresh_running': self._thread is not None and self._thread.is_alive()
+        }
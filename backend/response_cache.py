@@ -0,0 +1,141 @@
+"""
+HTTP Response Cache
+Sub-Phase 1.2: ETag / Cache-Control support for deterministic API endpoints
+
+Endpoints whose output is a pure function of the satellite/ground-station
+catalog and their query parameters are rendered once, kept in a bounded
+in-memory LRU keyed by (catalog version, path, normalized query, encoding),
+and served with a strong ETag. Conditional requests that still match are
+answered with 304 Not Modified without re-running the view.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import threading
+from flask import request, make_response
+
+from serialization import msgpack_mimetype
+
+
+class CachedBody:
+    """A rendered response body with its validator"""
+
+    __slots__ = ('body', 'mimetype', 'etag')
+
+    def __init__(self, body: bytes, mimetype: str, etag: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = etag
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered response bodies bounded by entry count and size"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, CachedBody]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, body: bytes, mimetype: str) -> CachedBody:
+        entry = CachedBody(body, mimetype, hashlib.sha1(body).hexdigest())
+        if len(body) > self.max_bytes:
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += len(body)
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def _normalize_query(params: Dict[str, Tuple[Callable, Any]]) -> Tuple:
+    """Parse the declared query parameters so equivalent URLs share one key"""
+    normalized = []
+    for name, (converter, default) in sorted(params.items()):
+        raw = request.args.get(name)
+        normalized.append((name, converter(raw) if raw is not None else default))
+    return tuple(normalized)
+
+
+def cached_response(cache: ResponseCache, version: Callable[[], Any],
+                    params: Optional[Dict[str, Tuple[Callable, Any]]] = None,
+                    require: Tuple[str, ...] = (), max_age: int = 0):
+    """Cache a GET view's successful responses and serve them with ETags
+
+    ``params`` maps each query parameter that affects the output to a
+    (converter, default) pair used for key normalization. Requests missing any
+    parameter in ``require`` (e.g. an explicit start_time) are not cacheable
+    and go straight to the view. ``max_age`` of 0 makes clients revalidate
+    every time (``no-cache``), which suits data that changes on catalog edits.
+    """
+    params = params or {}
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if any(name not in request.args for name in require):
+                return view(*args, **kwargs)
+
+            try:
+                query = _normalize_query(params)
+            except ValueError:
+                return view(*args, **kwargs)
+
+            key = (version(), request.path, query, msgpack_mimetype())
+            entry = cache.get(key)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                entry = cache.put(key, response.get_data(), response.mimetype)
+            else:
+                response = make_response(entry.body)
+                response.mimetype = entry.mimetype
+
+            response.set_etag(entry.etag)
+            response.vary.add('Accept')
+            if max_age > 0:
+                response.cache_control.public = True
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
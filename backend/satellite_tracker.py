@@ -4,10 +4,17 @@ Sub-Phase 1.1: Core simulation engine for satellite position prediction
 """
 
 from skyfield.api import load, Topos, EarthSatellite, utc
+from skyfield.framelib import itrs
 from skyfield.timelib import Time
+import hashlib
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Sequence
+from trajectory import Trajectory
+
+def _fingerprint(*parts) -> str:
+    """Short stable hash of a satellite or station definition"""
+    return hashlib.sha1('\n'.join(map(repr, parts)).encode()).hexdigest()[:16]
 
 class SatelliteTracker:
     """Core satellite position and trajectory calculator using Skyfield"""
@@ -16,16 +23,25 @@ class SatelliteTracker:
         self.ts = load.timescale()
         self.satellites = {}
         self.ground_stations = {}
+        self.catalog_version = 0  # Bumped whenever a satellite or station is added/replaced
+        # Hash of each satellite's name and TLE / station's name and coordinates; unlike
+        # catalog_version these agree across processes and restarts for the same definition
+        self.satellite_fingerprints: Dict[str, str] = {}
+        self.station_fingerprints: Dict[str, str] = {}
         
     def add_satellite_from_tle(self, name: str, line1: str, line2: str) -> None:
         """Add satellite from TLE (Two-Line Element) data"""
         satellite = EarthSatellite(line1, line2, name, self.ts)
         self.satellites[name] = satellite
+        self.catalog_version += 1
+        self.satellite_fingerprints[name] = _fingerprint(name, line1.strip(), line2.strip())
         
     def add_ground_station(self, name: str, latitude: float, longitude: float, elevation: float = 0) -> None:
         """Add ground station with coordinates"""
         station = Topos(latitude, longitude, elevation_m=elevation)
         self.ground_stations[name] = station
+        self.catalog_version += 1
+        self.station_fingerprints[name] = _fingerprint(name, float(latitude), float(longitude), float(elevation))
         
     def get_satellite_position(self, satellite_name: str, time: datetime) -> Dict:
         """Get satellite position at specific time"""
@@ -50,28 +66,117 @@ class SatelliteTracker:
             'position_km': geocentric.position.km
         }
         
-    def predict_orbit_path(self, satellite_name: str, start_time: datetime, 
-                          duration_hours: float, step_minutes: int = 5) -> List[Dict]:
-        """Predict satellite orbital path over time period"""
+    def predict_trajectory(self, satellite_name: str, start_time: datetime,
+                           duration_hours: float, step_minutes: int = 5) -> Trajectory:
+        """Predict satellite orbital path as a columnar Trajectory
+
+        All sample times are propagated in a single vectorized Skyfield call.
+        """
         if satellite_name not in self.satellites:
             raise ValueError(f"Satellite {satellite_name} not found")
             
         satellite = self.satellites[satellite_name]
-        positions = []
         
-        # Ensure start_time has UTC timezone
+        # Ensure start_time is in UTC (naive values are taken as UTC)
         if start_time.tzinfo is None:
             start_time = start_time.replace(tzinfo=utc)
+        else:
+            start_time = start_time.astimezone(utc)
             
-        current_time = start_time
-        end_time = start_time + timedelta(hours=duration_hours)
+        step_seconds = int(step_minutes * 60)
+        total_seconds = int(duration_hours * 3600)
+        offsets = np.arange(0, total_seconds + 1, step_seconds, dtype=np.int64)
         
-        while current_time <= end_time:
-            position = self.get_satellite_position(satellite_name, current_time)
-            positions.append(position)
-            current_time += timedelta(minutes=step_minutes)
-            
-        return positions
+        t = self.ts.utc(start_time.year, start_time.month, start_time.day,
+                        start_time.hour, start_time.minute,
+                        start_time.second + start_time.microsecond / 1e6 + offsets)
+        geocentric = satellite.at(t)
+        subpoint = geocentric.subpoint()
+        
+        return Trajectory(
+            satellite_name, start_time, offsets,
+            subpoint.latitude.degrees, subpoint.longitude.degrees,
+            subpoint.elevation.km, geocentric.position.km.T
+        )
+        
+    def predict_orbit_path(self, satellite_name: str, start_time: datetime, 
+                          duration_hours: float, step_minutes: int = 5) -> List[Dict]:
+        """Predict satellite orbital path over time period"""
+        return self.predict_trajectory(
+            satellite_name, start_time, duration_hours, step_minutes
+        ).to_records()
+        
+    def _time_array(self, times: Sequence[datetime]) -> Time:
+        """One Skyfield Time array for many datetimes (naive values are UTC)"""
+        return self.ts.from_datetimes([t if t.tzinfo else t.replace(tzinfo=utc) for t in times])
+        
+    @staticmethod
+    def _group_by(names: Sequence[str], catalog: Dict, kind: str) -> List[Tuple[str, np.ndarray]]:
+        """(name, positions) for each distinct name, raising ValueError for unknown names"""
+        unique, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+        missing = [name for name in unique if name not in catalog]
+        if missing:
+            raise ValueError(f"{kind} {', '.join(missing)} not found")
+        order = np.argsort(inverse, kind='stable')
+        boundaries = np.flatnonzero(np.diff(inverse[order])) + 1
+        return [(str(unique[inverse[group[0]]]), group) for group in np.split(order, boundaries) if len(group)]
+        
+    def get_positions(self, satellite_names: Sequence[str], times: Sequence[datetime]) -> Dict[str, np.ndarray]:
+        """Positions for many (satellite, time) pairs
+        
+        Pairs are grouped by satellite and each group is propagated in a
+        single vectorized call. Returns latitude, longitude and altitude_km
+        arrays in input order.
+        """
+        count = len(satellite_names)
+        result = {key: np.empty(count) for key in ('latitude', 'longitude', 'altitude_km')}
+        if count == 0:
+            return result
+        t = self._time_array(times)
+        for name, group in self._group_by(satellite_names, self.satellites, 'Satellite'):
+            subpoint = self.satellites[name].at(t[group]).subpoint()
+            result['latitude'][group] = subpoint.latitude.degrees
+            result['longitude'][group] = subpoint.longitude.degrees
+            result['altitude_km'][group] = subpoint.elevation.km
+        return result
+        
+    def get_look_angles(self, satellite_names: Sequence[str], station_names: Sequence[str],
+                        times: Sequence[datetime]) -> Dict[str, np.ndarray]:
+        """Elevation, azimuth and range for many (satellite, station, time) tuples
+        
+        Each satellite is propagated once (into the Earth-fixed frame) for all
+        of its tuples; look angles then come from rotating the station-to-
+        satellite vectors into each station's east/north/up frame. Returns
+        elevation_degrees, azimuth_degrees and range_km arrays in input order.
+        """
+        count = len(satellite_names)
+        result = {key: np.empty(count) for key in ('elevation_degrees', 'azimuth_degrees', 'range_km')}
+        if count == 0:
+            return result
+        t = self._time_array(times)
+        stations = self._group_by(station_names, self.ground_stations, 'Ground station')
+        station_of = np.empty(count, dtype=np.int64)
+        for index, (_, group) in enumerate(stations):
+            station_of[group] = index
+        # Station positions and east/north/up axes in the Earth-fixed frame
+        station_xyz = np.array([self.ground_stations[name].itrs_xyz.km for name, _ in stations])
+        lat = np.array([self.ground_stations[name].latitude.radians for name, _ in stations])
+        lon = np.array([self.ground_stations[name].longitude.radians for name, _ in stations])
+        east = np.stack([-np.sin(lon), np.cos(lon), np.zeros_like(lon)], axis=1)
+        north = np.stack([-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)], axis=1)
+        up = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+        
+        for name, group in self._group_by(satellite_names, self.satellites, 'Satellite'):
+            satellite_xyz = self.satellites[name].at(t[group]).frame_xyz(itrs).km.T
+            which = station_of[group]
+            offset = satellite_xyz - station_xyz[which]
+            e = np.einsum('ij,ij->i', offset, east[which])
+            n = np.einsum('ij,ij->i', offset, north[which])
+            u = np.einsum('ij,ij->i', offset, up[which])
+            result['elevation_degrees'][group] = np.degrees(np.arctan2(u, np.hypot(e, n)))
+            result['azimuth_degrees'][group] = np.degrees(np.arctan2(e, n)) % 360.0
+            result['range_km'][group] = np.linalg.norm(offset, axis=1)
+        return result
         
     def calculate_elevation_angle(self, satellite_name: str, station_name: str, time: datetime) -> float:
         """Calculate elevation angle of satellite from ground station"""
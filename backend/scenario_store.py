@@ -0,0 +1,158 @@
+"""
+Scenario Store
+Memory-mapped on-disk format for DRL training scenarios
+
+A store is a directory of fixed-shape ``.npy`` arrays with one leading
+scenario axis plus a small ``index.json``:
+
+    index.json          count, satellites, ground stations, time steps, seed
+    visible.npy         (N, T, S, G) bool
+    elevation.npy       (N, T, S, G) float32, degrees
+    total_data_mb.npy   (N, S) float64
+    priority.npy        (N, S) int8, index into PRIORITY_LEVELS
+    deadline_hours.npy  (N, S) float32
+    scenario_index.npy  (N,) int64, generator index of each scenario
+
+Arrays are opened with ``np.load(mmap_mode='r')``, so reading scenario ``i``
+is a zero-copy view and dataset size is bounded by disk, not RAM. The API
+only ever reads ``index.json`` (see read_store_metadata). Only depends on
+NumPy so the training notebook can use it as-is.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import json
+import os
+import numpy as np
+
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 1
+PRIORITY_LEVELS = ('low', 'medium', 'high')
+
+# name -> (dtype, per-scenario shape key)
+_ARRAYS = {
+    'visible': (np.bool_, 'tsg'),
+    'elevation': (np.float32, 'tsg'),
+    'total_data_mb': (np.float64, 's'),
+    'priority': (np.int8, 's'),
+    'deadline_hours': (np.float32, 's'),
+    'scenario_index': (np.int64, '')
+}
+
+
+def is_scenario_store(path: str) -> bool:
+    """True if ``path`` is a scenario store directory"""
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+
+def read_store_metadata(path: str) -> Dict:
+    """Read only the store's index (no array data is touched)"""
+    with open(os.path.join(path, INDEX_FILE)) as f:
+        return json.load(f)
+
+
+class ScenarioStore:
+    """Indexable, memory-mapped collection of training scenarios
+
+    ``store[i]`` returns a scenario dict in the same layout the training data
+    generator produces, with array fields as views into the mapped files.
+    Supports ``len()`` and ``random.choice`` like a list.
+    """
+
+    def __init__(self, path: str, mode: str = 'r'):
+        self.path = path
+        self.mode = mode
+        self.metadata = read_store_metadata(path)
+        if self.metadata.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported scenario store version: {self.metadata.get('format_version')}")
+        self.satellites: List[str] = self.metadata['satellites']
+        self.ground_stations: List[str] = self.metadata['ground_stations']
+        self.time_steps = np.asarray(self.metadata['time_steps'], dtype=np.int32)
+        self.arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+            for name in _ARRAYS
+        }
+
+    @classmethod
+    def create(cls, path: str, count: int, satellites: Sequence[str], ground_stations: Sequence[str],
+               time_steps: Sequence[int], duration_minutes: int, seed: Optional[int] = None) -> 'ScenarioStore':
+        """Preallocate an empty store of ``count`` scenarios and open it for writing
+
+        Other processes may open the same path with ``mode='r+'`` and fill
+        disjoint index ranges in parallel.
+        """
+        os.makedirs(path, exist_ok=True)
+        shapes = {'t': len(time_steps), 's': len(satellites), 'g': len(ground_stations)}
+        for name, (dtype, dims) in _ARRAYS.items():
+            shape = (count,) + tuple(shapes[d] for d in dims)
+            np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode='w+',
+                                      dtype=dtype, shape=shape).flush()
+
+        metadata = {
+            'format_version': FORMAT_VERSION,
+            'count': count,
+            'seed': seed,
+            'satellites': list(satellites),
+            'ground_stations': list(ground_stations),
+            'time_steps': [int(t) for t in time_steps],
+            'duration_minutes': duration_minutes,
+            'priority_levels': list(PRIORITY_LEVELS)
+        }
+        # Written last so a half-created directory is never mistaken for a store
+        with open(os.path.join(path, INDEX_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return cls(path, mode='r+')
+
+    @classmethod
+    def from_scenarios(cls, path: str, scenarios: Sequence[Dict], seed: Optional[int] = None) -> 'ScenarioStore':
+        """Write an in-memory scenario list (e.g. an old pickle) to a new store"""
+        first = scenarios[0]
+        store = cls.create(path, len(scenarios), first['satellites'], first['ground_stations'],
+                           first['time_steps'], first['duration_minutes'], seed)
+        for i, scenario in enumerate(scenarios):
+            store.write(i, scenario)
+        store.flush()
+        return store
+
+    def __len__(self) -> int:
+        return self.metadata['count']
+
+    def __getitem__(self, i: int) -> Dict:
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"scenario {i} out of range for store of {len(self)}")
+        arrays = self.arrays
+        return {
+            'index': int(arrays['scenario_index'][i]),
+            'seed': self.metadata.get('seed'),
+            'satellites': self.satellites,
+            'ground_stations': self.ground_stations,
+            'duration_minutes': self.metadata['duration_minutes'],
+            'time_steps': self.time_steps,
+            'visible': arrays['visible'][i],
+            'elevation': arrays['elevation'][i],
+            'total_data_mb': arrays['total_data_mb'][i],
+            'priority': arrays['priority'][i],
+            'deadline_hours': arrays['deadline_hours'][i]
+        }
+
+    def write(self, i: int, scenario: Dict) -> None:
+        """Store one generator-format scenario at position ``i``"""
+        arrays = self.arrays
+        arrays['visible'][i] = scenario['visible']
+        arrays['elevation'][i] = scenario['elevation']
+        arrays['total_data_mb'][i] = scenario['total_data_mb']
+        arrays['priority'][i] = scenario['priority']
+        requirements = scenario.get('data_requirements')
+        if requirements:
+            arrays['deadline_hours'][i] = [requirements[s]['deadline_hours'] for s in self.satellites]
+        else:
+            arrays['deadline_hours'][i] = scenario['deadline_hours']
+        index = scenario.get('index')
+        arrays['scenario_index'][i] = i if index is None else index
+
+    def flush(self) -> None:
+        for array in self.arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def __repr__(self):
+        return f"ScenarioStore({self.path}, {len(self)} scenarios)"
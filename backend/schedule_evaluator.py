@@ -0,0 +1,191 @@
+"""
+Schedule Evaluator
+Vectorized scoring of candidate schedules over a communication window set
+
+A candidate schedule is a boolean mask over the windows of a WindowSet; a
+batch of C candidates is a (C, n) array. Everything that does not depend on
+the candidate (per-window data volume, overlapping window pairs per station
+and per satellite, deadline flags) is precomputed once, so scoring a batch is
+a few matrix reductions and thousands of candidates score per second.
+
+Scoring mirrors the training environment: data moves at 10-30 MB/min
+depending on elevation, volume is capped by each satellite's data
+requirement, reward is priority-weighted volume / 100, minus 0.1 per
+conflict, plus up to 10 for completing all data transfers on time.
+Overlapping windows on one station or satellite cannot both transfer, so
+the slower window of each conflicting pair loses the overlapping minutes.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Union
+import numpy as np
+
+from communication_windows import WindowSet, _to_datetime64
+
+CONFLICT_PENALTY = 0.1
+COMPLETION_BONUS = 10.0
+
+
+def overlapping_pairs(window_set: WindowSet, field: str) -> np.ndarray:
+    """(P, 2) index pairs of windows that overlap in time on the same station/satellite
+
+    Sorts once by (resource, start) and, for every window, takes the run of
+    later windows that start before it ends: O(n log n + P).
+    """
+    if len(window_set) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    starts, ends = window_set.interval_bounds()
+    resources = window_set.records[field].astype(np.int64)
+    origin = int(starts.min())
+    span = int(ends.max()) - origin + 1
+
+    order = np.lexsort((starts, resources))
+    keyed_starts = resources[order] * span + (starts[order] - origin)
+    keyed_ends = resources[order] * span + (ends[order] - origin)
+
+    positions = np.arange(len(order))
+    stops = np.searchsorted(keyed_starts, keyed_ends, side='left')
+    counts = np.maximum(stops - positions - 1, 0)
+    if counts.sum() == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    first = np.repeat(positions, counts)
+    # Offsets 1..count for every window, built without a Python loop
+    run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + (np.arange(counts.sum()) - run_starts)
+    return np.stack([order[first], order[second]], axis=1)
+
+
+class ScheduleEvaluator:
+    """Score batches of candidate schedules over one WindowSet
+
+    ``data_requirements_mb`` and ``deadlines`` map satellite names to the data
+    each must downlink and the time it must be done by; ``priorities`` maps
+    satellite names to reward multipliers (default 1.0). Satellites without
+    a requirement are uncapped and never miss a deadline.
+    """
+
+    def __init__(self, window_set: WindowSet,
+                 data_requirements_mb: Optional[Dict[str, float]] = None,
+                 deadlines: Optional[Dict[str, datetime]] = None,
+                 priorities: Optional[Dict[str, float]] = None):
+        self.window_set = window_set
+        names = window_set.satellite_names
+        satellites = window_set.records['satellite']
+        self.volumes = window_set.data_volume_mb()
+
+        requirements = data_requirements_mb or {}
+        self.requirements = np.array([requirements.get(name, np.inf) for name in names], dtype=np.float64)
+        self.priorities = np.array([(priorities or {}).get(name, 1.0) for name in names], dtype=np.float64)
+        self.total_required = float(self.requirements[np.isfinite(self.requirements)].sum())
+
+        # Windows that finish before their satellite's deadline
+        deadline_array = np.array([_to_datetime64(deadlines[name]) if deadlines and name in deadlines
+                                   else np.datetime64('NaT') for name in names], dtype='datetime64[us]')
+        window_deadlines = deadline_array[satellites] if len(names) else np.empty(0, 'datetime64[us]')
+        self.on_time = np.isnat(window_deadlines) | (window_set.records['end'] <= window_deadlines)
+
+        # Per-satellite sums via reduceat over satellite-sorted windows
+        self._satellite_order = np.argsort(satellites, kind='stable')
+        sorted_satellites = satellites[self._satellite_order]
+        self._segment_starts = np.flatnonzero(np.r_[True, sorted_satellites[1:] != sorted_satellites[:-1]]) \
+            if len(satellites) else np.empty(0, dtype=np.int64)
+        self._segment_satellites = sorted_satellites[self._segment_starts]
+
+        self.station_pairs = overlapping_pairs(window_set, 'station')
+        self.satellite_pairs = overlapping_pairs(window_set, 'satellite')
+
+        # A station (or satellite) moves one stream at a time: when two scheduled
+        # windows overlap, the slower one loses the overlapping minutes
+        pairs = np.unique(np.sort(np.concatenate([self.station_pairs, self.satellite_pairs]), axis=1), axis=0)
+        starts, ends = window_set.interval_bounds()
+        duration = window_set.records['duration_minutes']
+        rates = np.divide(self.volumes, duration, out=np.zeros_like(self.volumes), where=duration > 0)
+        first, second = pairs[:, 0], pairs[:, 1]
+        overlap_minutes = (np.minimum(ends[first], ends[second]) - np.maximum(starts[first], starts[second])) / 60e6
+        self._overlap_pairs = pairs
+        self._overlap_loser = np.where(rates[first] <= rates[second], first, second)
+        self._overlap_loss = overlap_minutes * rates[self._overlap_loser]
+
+    def _per_satellite(self, values: np.ndarray) -> np.ndarray:
+        """(C, n) per-window values -> (C, S) per-satellite sums"""
+        sums = np.zeros((len(values), len(self.window_set.satellite_names)))
+        if values.shape[1]:
+            sums[:, self._segment_satellites] = np.add.reduceat(
+                values[:, self._satellite_order], self._segment_starts, axis=1)
+        return sums
+
+    @staticmethod
+    def _conflicts(masks: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+        if len(pairs) == 0:
+            return np.zeros(len(masks), dtype=np.int64)
+        return np.count_nonzero(masks[:, pairs[:, 0]] & masks[:, pairs[:, 1]], axis=1)
+
+    def evaluate(self, candidates: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score one (n,) or a batch of (C, n) boolean candidate masks
+
+        Returns arrays of length C (scalars for a single mask): data_volume_mb,
+        scheduled_windows, scheduled_minutes, station_conflicts,
+        satellite_conflicts and reward, plus deadline_misses and
+        completion_ratio when any data requirements were given (without them
+        both would be constant zeros).
+        """
+        masks = np.asarray(candidates, dtype=bool)
+        single = masks.ndim == 1
+        masks = np.atleast_2d(masks)
+        weights = masks.astype(np.float64)
+
+        window_volume = weights * self.volumes
+        if len(self._overlap_pairs):
+            both = masks[:, self._overlap_pairs[:, 0]] & masks[:, self._overlap_pairs[:, 1]]
+            losses = np.zeros((masks.shape[1], len(masks)))
+            np.add.at(losses, self._overlap_loser, (both * self._overlap_loss).T)
+            window_volume = np.maximum(window_volume - losses.T, 0.0)
+        delivered = np.minimum(self._per_satellite(window_volume), self.requirements)
+        on_time = np.minimum(self._per_satellite(window_volume * self.on_time), self.requirements)
+
+        station_conflicts = self._conflicts(masks, self.station_pairs)
+        satellite_conflicts = self._conflicts(masks, self.satellite_pairs)
+        finite = np.isfinite(self.requirements)
+        deadline_misses = np.count_nonzero((on_time < self.requirements) & finite, axis=1)
+        completion = on_time[:, finite].sum(axis=1) / self.total_required if self.total_required else \
+            np.zeros(len(masks))
+
+        reward = ((delivered * self.priorities).sum(axis=1) / 100.0
+                  - CONFLICT_PENALTY * (station_conflicts + satellite_conflicts)
+                  + COMPLETION_BONUS * completion)
+
+        results = {
+            'data_volume_mb': delivered.sum(axis=1),
+            'scheduled_windows': masks.sum(axis=1),
+            'scheduled_minutes': weights @ self.window_set.records['duration_minutes'],
+            'station_conflicts': station_conflicts,
+            'satellite_conflicts': satellite_conflicts,
+            'reward': reward
+        }
+        if finite.any():
+            results['deadline_misses'] = deadline_misses
+            results['completion_ratio'] = completion
+        if single:
+            return {key: value[0].item() for key, value in results.items()}
+        return results
+
+    def summarize(self, candidate: np.ndarray) -> Dict[str, Union[int, float]]:
+        """JSON-ready metrics for a single schedule"""
+        metrics = self.evaluate(np.asarray(candidate, dtype=bool).ravel())
+        return {key: round(value, 3) if isinstance(value, float) else value for key, value in metrics.items()}
+
+    def compare(self, candidates: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Union[int, float]]]:
+        """JSON-ready metrics for several named schedules, scored in one batch"""
+        names = list(candidates)
+        metrics = self.evaluate(np.stack([np.asarray(candidates[name], dtype=bool) for name in names]))
+        return {
+            name: {key: round(float(values[row]), 3) if values.dtype.kind == 'f' else int(values[row])
+                   for key, values in metrics.items()}
+            for row, name in enumerate(names)
+        }
+
+
+def relative_gain(value: float, baseline: float) -> float:
+    """Percent change of a measured score over a baseline score"""
+    return round(100.0 * (value - baseline) / max(abs(baseline), 1e-9), 2)
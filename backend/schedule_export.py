@@ -0,0 +1,174 @@
+"""
+Schedule Export
+Streaming CSV, NDJSON and columnar binary encoders for window schedules
+
+Every encoder consumes an iterable of WindowSet chunks (pass store pages or
+the live detector's per-pair results) and yields bytes one chunk at a time,
+so memory stays bounded by the chunk size however long the horizon or large
+the catalog. ``gzip_stream`` compresses any of them on the fly.
+
+The columnar format is a small self-describing binary layout:
+
+    COLUMNAR_MAGIC
+    frame*:  <uint32 rows> <uint32 meta length> <meta JSON> <columns>
+
+A frame's meta lists the satellite and station names first seen in that
+frame; the satellite/station columns index the names accumulated over the
+stream so far. Columns follow COLUMNAR_COLUMNS, little-endian, ``rows``
+values each (start/end as microseconds since the Unix epoch, UTC).
+``read_columnar`` turns such a stream back into WindowSets.
+"""
+
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+import csv
+import io
+import json
+import struct
+import zlib
+import numpy as np
+
+from communication_windows import WindowSet, WINDOW_DTYPE
+from serialization import dumps_json, iter_ndjson, NDJSON_MIMETYPE
+
+COLUMNAR_MAGIC = b'AWCOL01\n'
+COLUMNAR_MIMETYPE = 'application/vnd.astraeus.windows'
+COLUMNAR_COLUMNS = (
+    ('satellite', '<i4'),
+    ('station', '<i4'),
+    ('start', '<i8'),
+    ('end', '<i8'),
+    ('duration_minutes', '<f8'),
+    ('max_elevation', '<f8'),
+    ('quality_score', '<f8')
+)
+_FRAME_HEADER = struct.Struct('<II')
+
+CSV_FIELDS = ['satellite', 'station', 'start_time', 'end_time',
+              'duration_minutes', 'max_elevation_degrees', 'quality_score']
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': (NDJSON_MIMETYPE, 'ndjson'),
+    'columnar': (COLUMNAR_MIMETYPE, 'awcol')
+}
+GZIP_MIMETYPE = 'application/gzip'
+
+
+def iter_csv(chunks: Iterable[WindowSet], header: bool = True) -> Iterator[bytes]:
+    """CSV rows (CSV_FIELDS columns), one encoded block per WindowSet chunk"""
+    if header:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_FIELDS)
+        yield buffer.getvalue().encode('utf-8')
+    for window_set in chunks:
+        if not len(window_set):
+            continue
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(
+            window_set.satellite_array().tolist(),
+            window_set.station_array().tolist(),
+            window_set.isoformat_column('start'),
+            window_set.isoformat_column('end'),
+            window_set.records['duration_minutes'].tolist(),
+            window_set.records['max_elevation'].tolist(),
+            window_set.records['quality_score'].tolist()
+        ))
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_ndjson_chunks(chunks: Iterable[WindowSet]) -> Iterator[bytes]:
+    """Newline-delimited JSON windows across a stream of WindowSet chunks"""
+    for window_set in chunks:
+        yield from iter_ndjson(window_set)
+
+
+def iter_columnar(chunks: Iterable[WindowSet]) -> Iterator[bytes]:
+    """Columnar binary frames, one per non-empty WindowSet chunk"""
+    yield COLUMNAR_MAGIC
+    satellite_ids: Dict[str, int] = {}
+    station_ids: Dict[str, int] = {}
+    for window_set in chunks:
+        if not len(window_set):
+            continue
+        meta = {}
+        mappings = {}
+        for field, names, ids in (('satellite', window_set.satellite_names, satellite_ids),
+                                  ('station', window_set.station_names, station_ids)):
+            new_names = [name for name in dict.fromkeys(names) if name not in ids]
+            for name in new_names:
+                ids[name] = len(ids)
+            meta[f'{field}s'] = new_names
+            mappings[field] = np.array([ids[name] for name in names], dtype='<i4')
+
+        records = window_set.records
+        columns = {
+            'satellite': mappings['satellite'][records['satellite']],
+            'station': mappings['station'][records['station']],
+            'start': records['start'].view(np.int64),
+            'end': records['end'].view(np.int64)
+        }
+        encoded_meta = dumps_json(meta)
+        yield b''.join([_FRAME_HEADER.pack(len(window_set), len(encoded_meta)), encoded_meta] + [
+            np.ascontiguousarray(columns.get(name, records[name]), dtype=dtype).tobytes()
+            for name, dtype in COLUMNAR_COLUMNS
+        ])
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    """Read ``size`` bytes, looping over short reads; ValueError if the stream ends early"""
+    parts: List[bytes] = []
+    remaining = size
+    while remaining:
+        part = stream.read(remaining)
+        if not part:
+            raise ValueError('Truncated columnar schedule')
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
+
+
+def read_columnar(stream: BinaryIO) -> Iterator[WindowSet]:
+    """WindowSets from a columnar export, one per frame, read incrementally"""
+    if _read_exactly(stream, len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError('Not a columnar schedule export')
+    satellites: List[str] = []
+    stations: List[str] = []
+    while True:
+        header = stream.read(_FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < _FRAME_HEADER.size:
+            header += _read_exactly(stream, _FRAME_HEADER.size - len(header))
+        rows, meta_length = _FRAME_HEADER.unpack(header)
+        meta = json.loads(_read_exactly(stream, meta_length))
+        satellites.extend(meta.get('satellites', []))
+        stations.extend(meta.get('stations', []))
+
+        records = np.empty(rows, dtype=WINDOW_DTYPE)
+        for name, dtype in COLUMNAR_COLUMNS:
+            values = np.frombuffer(_read_exactly(stream, rows * np.dtype(dtype).itemsize), dtype=dtype)
+            records[name] = values.view('datetime64[us]') if name in ('start', 'end') else values
+        if rows and (records['satellite'].max() >= len(satellites) or records['station'].max() >= len(stations)
+                     or records['satellite'].min() < 0 or records['station'].min() < 0):
+            raise ValueError('Columnar frame references an undefined satellite or station')
+        yield WindowSet(records, list(satellites), list(stations))
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a byte stream on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(chunks: Iterable[WindowSet], format_type: str, gzip: bool = False) -> Iterator[bytes]:
+    """Encoded export bytes for ``format_type`` (csv, ndjson or columnar)"""
+    encoders = {'csv': iter_csv, 'ndjson': iter_ndjson_chunks, 'columnar': iter_columnar}
+    if format_type not in encoders:
+        raise ValueError(f"Unsupported export format '{format_type}' (expected one of {', '.join(encoders)})")
+    stream = encoders[format_type](chunks)
+    return gzip_stream(stream) if gzip else stream
@@ -0,0 +1,351 @@
+"""
+Schedule Import
+Streaming parsers and validation for uploaded window schedules
+
+Uploads are read incrementally and come out as WindowSet batches of at most
+``batch_rows`` windows, so a file of any size is ingested with memory
+bounded by one batch plus one record of read-ahead. Supported inputs:
+
+- CSV with a header row (the export columns, or common aliases such as
+  "Start Time" or ground_station)
+- NDJSON, one window object per line
+- JSON: a top-level array of windows, or an object whose
+  ``communication_windows``/``schedule``/``windows`` member is that array
+  (what this API exports); array elements are decoded one at a time
+- the columnar binary export format
+
+Any of them may be gzip-compressed. Invalid windows are counted and the
+first few reported by row number; they never abort the import. A file that
+cannot be read at all (corrupt gzip, malformed CSV or JSON) raises
+ValueError.
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Set, TextIO, Tuple
+import bisect
+import csv
+import gzip
+import io
+import json
+import re
+import zlib
+import numpy as np
+
+from communication_windows import WindowSet, WINDOW_DTYPE, _iso_to_datetime64
+from schedule_export import read_columnar
+
+IMPORT_BATCH_ROWS = 10000
+MAX_REPORTED_ERRORS = 20
+READ_SIZE = 1 << 16
+MAX_RECORD_CHARS = 1 << 20  # Longest single JSON window object accepted
+
+IMPORT_FORMATS = {'.csv': 'csv', '.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.awcol': 'columnar'}
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Normalized column/key name -> window field
+FIELD_ALIASES = {
+    'satellite': 'satellite', 'satellite_name': 'satellite',
+    'station': 'station', 'ground_station': 'station', 'station_name': 'station',
+    'start_time': 'start', 'start': 'start',
+    'end_time': 'end', 'end': 'end',
+    'duration_minutes': 'duration_minutes', 'duration': 'duration_minutes',
+    'max_elevation_degrees': 'max_elevation', 'max_elevation': 'max_elevation', 'elevation': 'max_elevation'
+}
+REQUIRED_FIELDS = ('satellite', 'station', 'start', 'end', 'max_elevation')
+_ARRAY_KEY = re.compile(r'"(?:communication_windows|schedule|windows)"\s*:\s*\[')
+
+WINDOW_FIELDS = ('satellite', 'station', 'start', 'end', 'duration_minutes', 'max_elevation')
+_FIELD_INDEX = {field: index for index, field in enumerate(WINDOW_FIELDS)}
+
+WindowRow = Tuple[str, str, np.datetime64, np.datetime64, float, float]
+
+
+def _field_index(key: Any) -> Optional[int]:
+    """Position in WINDOW_FIELDS of a column or key name (None if it is not a window field)"""
+    return _FIELD_INDEX.get(FIELD_ALIASES.get(str(key).strip().lower().replace(' ', '_')))
+
+
+def parse_window(values: Sequence[Any]) -> WindowRow:
+    """Validate one window's WINDOW_FIELDS values, raising ValueError with the reason it is rejected"""
+    missing = [field for field, value in zip(WINDOW_FIELDS, values)
+               if field in REQUIRED_FIELDS and value in (None, '')]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    satellite, station, start, end, duration, elevation = values
+
+    start = _iso_to_datetime64(str(start))
+    end = _iso_to_datetime64(str(end))
+    if end <= start:
+        raise ValueError('end_time must be after start_time')
+    elevation = float(elevation)
+    if not 0.0 <= elevation <= 90.0:
+        raise ValueError('max_elevation must be between 0 and 90 degrees')
+    if duration not in (None, ''):
+        duration = float(duration)
+        if not 0.0 < duration < np.inf:
+            raise ValueError('duration_minutes must be positive')
+    else:
+        duration = float((end - start) / np.timedelta64(1, 'm'))
+    return str(satellite), str(station), start, end, duration, elevation
+
+
+def _window_set(rows: List[WindowRow]) -> WindowSet:
+    return _build_window_set(*zip(*rows))
+
+
+def _build_window_set(satellites, stations, starts, ends, durations, elevations) -> WindowSet:
+    records = np.empty(len(satellites), dtype=WINDOW_DTYPE)
+    satellite_names, records['satellite'] = np.unique(np.asarray(satellites, dtype=str), return_inverse=True)
+    station_names, records['station'] = np.unique(np.asarray(stations, dtype=str), return_inverse=True)
+    records['start'] = starts
+    records['end'] = ends
+    records['duration_minutes'] = durations
+    records['max_elevation'] = elevations
+    records['quality_score'] = 0.0
+    return WindowSet(records, satellite_names.tolist(), station_names.tolist())
+
+
+def _utc_column(values: Sequence[Any]) -> np.ndarray:
+    """Vectorized parse of naive or UTC ISO-8601 strings; ValueError for anything else"""
+    strings = [value[:-6] if value.endswith('+00:00') else value[:-1] if value.endswith('Z') else value
+               for value in values]
+    # Other UTC offsets (and NaT) go through the exact per-row parser instead
+    if any('+' in value or '-' in value[10:] for value in strings):
+        raise ValueError('non-UTC timestamps')
+    column = np.array(strings, dtype='datetime64[us]')
+    if np.isnat(column).any():
+        raise ValueError('missing timestamps')
+    return column
+
+
+def _vectorized_window_set(rows: List[Sequence[Any]]) -> WindowSet:
+    """Validate and pack a batch column-wise; ValueError if any row needs the per-row path"""
+    satellites, stations, starts, ends, durations, elevations = zip(*rows)
+    for column in (satellites, stations, elevations):
+        if None in column or '' in column:
+            raise ValueError('missing values')
+    starts, ends = _utc_column(starts), _utc_column(ends)
+    elevations = np.array(elevations, dtype=np.float64)
+    durations = np.array([np.nan if value in (None, '') else value for value in durations], dtype=np.float64)
+    durations = np.where(np.isnan(durations), (ends - starts) / np.timedelta64(1, 'm'), durations)
+    if not np.all((ends > starts) & (elevations >= 0) & (elevations <= 90)
+                  & (durations > 0) & np.isfinite(durations)):
+        raise ValueError('invalid windows')
+    return _build_window_set(satellites, stations, starts, ends, durations, elevations)
+
+
+def iter_json_array(text: TextIO) -> Iterator[Any]:
+    """Elements of a JSON window array, decoded one at a time from a text stream"""
+    decoder = json.JSONDecoder()
+    buffer = text.read(READ_SIZE).lstrip()
+    eof = not buffer
+
+    # Find the array: the document itself, or the first known member holding it
+    if buffer.startswith('['):
+        position = 1
+    elif buffer.startswith('{'):
+        while True:
+            match = _ARRAY_KEY.search(buffer)
+            if match:
+                position = match.end()
+                break
+            chunk = text.read(READ_SIZE)
+            if not chunk:
+                raise ValueError('No communication_windows array found in JSON')
+            buffer = buffer[-64:] + chunk  # Keep enough to match a key split across reads
+    else:
+        raise ValueError('JSON schedule must be an array or an object with a communication_windows array')
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ValueError('Unterminated JSON window array')
+            chunk = text.read(READ_SIZE)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Most likely the element continues past the buffer: read more and retry
+            if eof or len(buffer) - position > MAX_RECORD_CHARS:
+                raise ValueError('Malformed JSON window array')
+            chunk = text.read(READ_SIZE)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield value
+        position = end
+        if position > READ_SIZE:
+            buffer, position = buffer[position:], 0
+
+
+def _iter_ndjson(text: TextIO) -> Iterator[str]:
+    for line in text:
+        if line.strip():
+            yield line
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw stream wrapper that counts the bytes read from an upload"""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+
+class ScheduleImport:
+    """Incremental parse and validation of one uploaded schedule file
+
+    Iterate ``batches()`` to receive WindowSets; afterwards ``rows_read``,
+    ``rows_rejected``, ``errors`` (the first ``max_errors`` by row number),
+    ``satellites`` and ``bytes_read`` describe the upload.
+    """
+
+    def __init__(self, stream: BinaryIO, filename: str, batch_rows: int = IMPORT_BATCH_ROWS,
+                 max_errors: int = MAX_REPORTED_ERRORS):
+        name = filename.lower()
+        if name.endswith('.gz'):
+            name = name[:-3]
+        extension = name[name.rfind('.'):] if '.' in name else ''
+        if extension not in IMPORT_FORMATS:
+            raise ValueError('Unsupported file format')
+        self.format = IMPORT_FORMATS[extension]
+        self.filename = filename
+        self.batch_rows = batch_rows
+        self.max_errors = max_errors
+        self._reader = _CountingReader(stream)
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self._errors: List[Tuple[int, str]] = []
+        self.satellites: Set[str] = set()
+
+    @property
+    def bytes_read(self) -> int:
+        return self._reader.bytes_read
+
+    @property
+    def rows_imported(self) -> int:
+        return self.rows_read - self.rows_rejected
+
+    @property
+    def errors(self) -> List[str]:
+        return [f'Row {row}: {reason}' for row, reason in self._errors]
+
+    def _reject(self, row: int, reason: str) -> None:
+        self.rows_rejected += 1
+        self._report(row, reason)
+
+    def _report(self, row: int, reason: str) -> None:
+        """Keep the max_errors lowest-numbered errors (rows are rejected out of order across batches)"""
+        if len(self._errors) < self.max_errors or (self._errors and row < self._errors[-1][0]):
+            bisect.insort(self._errors, (row, reason))
+            del self._errors[self.max_errors:]
+
+    def batches(self) -> Iterator[WindowSet]:
+        try:
+            for window_set in self._parse():
+                self.satellites.update(window_set.satellite_names[i]
+                                       for i in np.unique(window_set.records['satellite']).tolist())
+                yield window_set
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            raise ValueError(f'Corrupt or truncated gzip upload: {e}') from e
+        except csv.Error as e:
+            raise ValueError(f'Malformed CSV after row {self.rows_read}: {e}') from e
+
+    def _parse(self) -> Iterator[WindowSet]:
+        binary = io.BufferedReader(self._reader, buffer_size=READ_SIZE)
+        if binary.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+            binary = gzip.GzipFile(fileobj=binary)
+        if self.format == 'columnar':
+            yield from self._columnar_batches(binary)
+            return
+
+        text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+        if self.format == 'csv':
+            records = csv.reader(text)
+            header = next(records, [])
+            positions = [None] * len(WINDOW_FIELDS)
+            for column, name in enumerate(header):
+                index = _field_index(name)
+                if index is not None and positions[index] is None:
+                    positions[index] = column
+
+            def to_values(row: List[str]) -> List[Any]:
+                return [row[column] if column is not None and column < len(row) else None
+                        for column in positions]
+        else:
+            records = iter_json_array(text) if self.format == 'json' else _iter_ndjson(text)
+            key_positions: Dict[Any, Optional[int]] = {}
+
+            def to_values(record: Any) -> List[Any]:
+                if isinstance(record, str):
+                    record = json.loads(record)
+                if not isinstance(record, dict):
+                    raise ValueError('expected a window object')
+                values = [None] * len(WINDOW_FIELDS)
+                for key, value in record.items():
+                    if key not in key_positions:
+                        key_positions[key] = _field_index(key)
+                    if key_positions[key] is not None:
+                        values[key_positions[key]] = value
+                return values
+
+        pending: List[List[Any]] = []
+        row_numbers: List[int] = []
+        for record in records:
+            self.rows_read += 1
+            try:
+                pending.append(to_values(record))
+                row_numbers.append(self.rows_read)
+            except (ValueError, TypeError) as e:
+                self._reject(self.rows_read, str(e))
+                continue
+            if len(pending) >= self.batch_rows:
+                batch = self._validate(pending, row_numbers)
+                pending, row_numbers = [], []
+                if batch is not None:
+                    yield batch
+        if pending:
+            batch = self._validate(pending, row_numbers)
+            if batch is not None:
+                yield batch
+
+    def _validate(self, rows: List[List[Any]], row_numbers: List[int]) -> Optional[WindowSet]:
+        """Clean batches are validated column-wise; a batch with bad rows is re-checked row by row"""
+        try:
+            return _vectorized_window_set(rows)
+        except (ValueError, TypeError, AttributeError):
+            pass
+        parsed = []
+        for values, row_number in zip(rows, row_numbers):
+            try:
+                parsed.append(parse_window(values))
+            except (ValueError, TypeError) as e:
+                self._reject(row_number, str(e))
+        return _window_set(parsed) if parsed else None
+
+    def _columnar_batches(self, binary: BinaryIO) -> Iterator[WindowSet]:
+        for window_set in read_columnar(binary):
+            records = window_set.records
+            valid = ((records['end'] > records['start'])
+                     & (records['max_elevation'] >= 0) & (records['max_elevation'] <= 90)
+                     & (records['duration_minutes'] > 0) & np.isfinite(records['duration_minutes']))
+            for offset in np.flatnonzero(~valid)[:self.max_errors].tolist():
+                self._report(self.rows_read + offset + 1, 'invalid window')
+            self.rows_read += len(window_set)
+            self.rows_rejected += int(np.count_nonzero(~valid))
+            if valid.any():
+                yield window_set if valid.all() else window_set.filter(valid)
@@ -0,0 +1,134 @@
+"""
+Scheduling Feature Extraction
+Vectorized observation builder for the AI scheduling policy
+
+Turns a set of communication windows into the policy's 50-feature
+observations (10 windows x 5 features: duration, elevation, ISS flag, ISRO
+flag, quality) for any number of overlapping window chunks at once. Only
+depends on NumPy so it can be shared by the API server and the training
+environment in colab_training_setup.py.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+WINDOWS_PER_OBSERVATION = 10
+FEATURES_PER_WINDOW = 5
+OBSERVATION_SIZE = WINDOWS_PER_OBSERVATION * FEATURES_PER_WINDOW
+DEFAULT_CHUNK_STRIDE = 5
+
+# Satellite class flags, in feature column order
+SATELLITE_CATEGORIES = ('ISS', 'ISRO')
+
+# Default weighting of the normalized duration and elevation terms in the quality score
+DEFAULT_QUALITY_WEIGHTS = {'duration': 0.6, 'elevation': 0.4}
+
+_category_cache: Dict[str, Tuple[float, float]] = {}
+
+
+def window_quality_score(duration_minutes, max_elevation, weights: Optional[Dict[str, float]] = None):
+    """Quality score for one window or, element-wise, for arrays of windows"""
+    weights = weights or DEFAULT_QUALITY_WEIGHTS
+    duration_score = np.minimum(np.divide(duration_minutes, 15.0), 1.0)  # Normalize to 15 min max
+    elevation_score = np.minimum(np.divide(max_elevation, 90.0), 1.0)    # Normalize to 90 degrees
+    return (weights['duration'] * duration_score) + (weights['elevation'] * elevation_score)
+
+
+def window_quality_sql(weights: Optional[Dict[str, float]] = None) -> Tuple[str, List[float]]:
+    """window_quality_score as an SQL expression over duration_minutes/max_elevation columns
+
+    Evaluates the same float operations in the same order, so scores match
+    the NumPy version exactly. Returns the expression and its parameters.
+    """
+    weights = weights or DEFAULT_QUALITY_WEIGHTS
+    return ('(? * MIN(duration_minutes / 15.0, 1.0)) + (? * MIN(max_elevation / 90.0, 1.0))',
+            [float(weights['duration']), float(weights['elevation'])])
+
+
+def satellite_category_flags(name: str) -> Tuple[float, float]:
+    """(is_iss, is_isro) flags for a satellite name, memoized per name"""
+    flags = _category_cache.get(name)
+    if flags is None:
+        upper = str(name).upper()
+        flags = (1.0 if upper.startswith('ISS') else 0.0,
+                 1.0 if 'ISRO' in upper else 0.0)
+        _category_cache[name] = flags
+    return flags
+
+
+def category_table(names: Sequence[str]) -> np.ndarray:
+    """(len(names), 2) float32 lookup table of category flags for interned names"""
+    table = np.zeros((len(names), len(SATELLITE_CATEGORIES)), dtype=np.float32)
+    for i, name in enumerate(names):
+        table[i] = satellite_category_flags(name)
+    return table
+
+
+def window_feature_matrix(duration_minutes: np.ndarray, max_elevation: np.ndarray,
+                          category_flags: np.ndarray, quality: np.ndarray) -> np.ndarray:
+    """(n, 5) float32 per-window feature rows"""
+    features = np.empty((len(duration_minutes), FEATURES_PER_WINDOW), dtype=np.float32)
+    features[:, 0] = np.asarray(duration_minutes, dtype=np.float64) / 15.0  # Normalize to [0,1]
+    features[:, 1] = np.asarray(max_elevation, dtype=np.float64) / 90.0     # Normalize to [0,1]
+    features[:, 2:4] = category_flags
+    features[:, 4] = quality                                                # Already normalized
+    return features
+
+
+def window_set_features(window_set) -> np.ndarray:
+    """Per-window features straight from a WindowSet's columns"""
+    flags = category_table(window_set.satellite_names)[window_set.records['satellite']]
+    return window_feature_matrix(
+        window_set.records['duration_minutes'], window_set.records['max_elevation'],
+        flags, window_set.records['quality_score']
+    )
+
+
+def record_features(windows: List[Dict]) -> np.ndarray:
+    """Per-window features from API-format window dicts"""
+    count = len(windows)
+    duration = np.fromiter((float(w.get('duration_minutes', 0)) for w in windows), np.float64, count)
+    elevation = np.fromiter((float(w.get('max_elevation_degrees', 0)) for w in windows), np.float64, count)
+    quality = np.fromiter((float(w.get('quality_score', 0.5)) for w in windows), np.float64, count)
+    flags = np.array([satellite_category_flags(w.get('satellite', '')) for w in windows],
+                     dtype=np.float32).reshape(count, len(SATELLITE_CATEGORIES))
+    return window_feature_matrix(duration, elevation, flags, quality)
+
+
+def time_order(start_keys: Sequence) -> np.ndarray:
+    """Stable start-time ordering (ties keep input order)"""
+    return np.argsort(np.asarray(start_keys), kind='stable')
+
+
+def chunk_starts(count: int, size: int = WINDOWS_PER_OBSERVATION,
+                 stride: int = DEFAULT_CHUNK_STRIDE) -> np.ndarray:
+    """Start offsets of overlapping chunks covering ``count`` windows
+
+    The final chunk is aligned to the end so every window is covered.
+    """
+    last_start = max(count - size, 0)
+    starts = np.arange(0, last_start + 1, stride, dtype=np.int64)
+    if starts[-1] != last_start:
+        starts = np.append(starts, last_start)
+    return starts
+
+
+def build_observations(features: np.ndarray, starts: np.ndarray,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Fill a (len(starts), 50) float32 observation block
+
+    Row b holds the feature rows ``features[starts[b]:starts[b] + 10]``
+    flattened, zero-padded where a chunk runs past the last window. ``out``
+    may be passed to reuse a preallocated buffer.
+    """
+    batch = len(starts)
+    if out is None:
+        out = np.zeros((batch, OBSERVATION_SIZE), dtype=np.float32)
+    else:
+        out[:batch] = 0.0
+    slots = out[:batch].reshape(batch, WINDOWS_PER_OBSERVATION, FEATURES_PER_WINDOW)
+
+    index = np.asarray(starts, dtype=np.int64)[:, None] + np.arange(WINDOWS_PER_OBSERVATION)
+    valid = index < len(features)
+    slots[valid] = features[index[valid]]
+    return out[:batch]
@@ -0,0 +1,137 @@
+"""
+API Response Serialization
+Sub-Phase 1.2: Fast JSON and MessagePack encoding for REST responses
+
+Installed as the Flask JSON provider so every ``jsonify`` call can emit NumPy
+arrays and scalars, datetimes and the columnar backend containers without a
+manual conversion pass. Uses orjson when available and falls back to the
+standard library; clients that send ``Accept: application/x-msgpack`` (or
+``application/msgpack``) receive MessagePack instead of JSON. ``iter_ndjson`` streams window sets as
+newline-delimited JSON.
+"""
+
+from datetime import datetime, date
+from typing import Any, Dict, Iterator, Optional
+import json
+import numpy as np
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+
+from trajectory import Trajectory
+from communication_windows import CommunicationWindow, WindowSet
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+# Also accepted in Accept headers; responses use the type the client asked for
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/msgpack', 'application/vnd.msgpack')
+NDJSON_MIMETYPE = 'application/x-ndjson'
+NDJSON_CHUNK_ROWS = 1000
+
+
+def to_serializable(obj: Any) -> Any:
+    """Fallback conversion for values the encoders do not handle natively"""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == 'M':
+            return [to_serializable(value) for value in obj]
+        return obj.tolist()
+    if isinstance(obj, np.datetime64):
+        # Via microseconds: finer units would .item() to an int, and MessagePack needs a string
+        return None if np.isnat(obj) else obj.astype('datetime64[us]').item().isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Trajectory):
+        return obj.to_dict()
+    if isinstance(obj, WindowSet):
+        return obj.to_records()
+    if isinstance(obj, CommunicationWindow):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps_json(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON bytes with the fastest available backend"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=to_serializable, option=option)
+        except TypeError:
+            pass  # orjson rejects some values natively (e.g. NaT) instead of calling default
+    return json.dumps(
+        obj, default=to_serializable, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    """Encode obj as MessagePack bytes"""
+    return msgpack.packb(obj, default=to_serializable, use_bin_type=True)
+
+
+def iter_ndjson(window_set: WindowSet, rename: Optional[Dict[str, str]] = None,
+                chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """Newline-delimited JSON for a WindowSet, one window per line
+
+    Rows are converted and encoded a chunk at a time, so a streaming
+    response never holds more than ``chunk_rows`` window dicts in memory.
+    """
+    for offset in range(0, len(window_set), chunk_rows):
+        rows = window_set[offset:offset + chunk_rows].to_records(rename)
+        yield b''.join(dumps_json(row) + b'\n' for row in rows)
+
+
+def msgpack_mimetype() -> Optional[str]:
+    """The MessagePack media type the current request explicitly prefers over JSON, if any"""
+    if not MSGPACK_AVAILABLE or not has_request_context():
+        return None
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, *MSGPACK_MIMETYPES])
+    return best if best in MSGPACK_MIMETYPES else None
+
+
+def wants_msgpack() -> bool:
+    """True when the current request explicitly prefers MessagePack"""
+    return msgpack_mimetype() is not None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson / MessagePack"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault('default', to_serializable)
+            return json.dumps(obj, **kwargs)
+        return dumps_json(obj, sort_keys=self.sort_keys).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+
+        mimetype = msgpack_mimetype()
+        if mimetype is not None:
+            response = self._app.response_class(dumps_msgpack(obj), mimetype=mimetype)
+        else:
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            body = dumps_json(obj, sort_keys=self.sort_keys, indent=indent) + b'\n'
+            response = self._app.response_class(body, mimetype=self.mimetype)
+
+        if MSGPACK_AVAILABLE:
+            response.vary.add('Accept')
+        return response
@@ -0,0 +1,121 @@
+"""
+Test Script for the AI performance calculator
+Validates cached training metadata and the memory-mapped scenario store
+"""
+
+import os
+import pickle
+import tempfile
+import numpy as np
+from ai_performance import AIPerformanceCalculator, summary_path_for
+from scenario_store import ScenarioStore
+
+def test_training_results_cached():
+    """Training metadata should be read once and refreshed when the file changes"""
+    print("[TRAINING] Testing cached training results...")
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        calculator = AIPerformanceCalculator()
+        calculator.model_path = model_dir
+
+        # No scenarios file: fallback results, nothing read
+        assert calculator.get_scenarios_count() == 0
+        assert calculator.load_training_results()['scenarios_count'] == 500
+
+        with open(calculator.scenarios_path, 'wb') as f:
+            pickle.dump([{'id': i} for i in range(7)], f)
+
+        # No sidecar yet: the request is answered at once and the summary is built in the background
+        pending = calculator.load_training_results()
+        assert pending['summary_status'] == 'PENDING' and pending['scenarios_count'] is None
+        assert calculator.get_scenarios_count() == 0
+        calculator._summary_thread.join(5)
+
+        for _ in range(5):
+            assert calculator.load_training_results()['scenarios_count'] == 7
+        assert calculator.scenario_file_reads == 1
+        assert os.path.exists(summary_path_for(calculator.scenarios_path))
+
+        # A fresh calculator reuses the sidecar summary instead of unpickling
+        other = AIPerformanceCalculator()
+        other.model_path = model_dir
+        assert other.get_scenarios_count() == 7
+        assert other.scenario_file_reads == 0
+
+        # Rewriting the scenarios file changes its mtime/size and the cache key
+        with open(calculator.scenarios_path, 'wb') as f:
+            pickle.dump([{'id': i} for i in range(12)], f)
+        calculator.invalidate_training_cache()
+        stale = calculator.load_training_results()
+        assert stale['summary_status'] == 'STALE' and stale['scenarios_count'] == 7
+        calculator._summary_thread.join(5)
+        assert calculator.get_scenarios_count() == 12
+        assert calculator.scenario_file_reads == 2
+
+    print("[SUCCESS] Scenarios file unpickled only when it changes, never on the request path")
+    return True
+
+def make_scenario(index, steps=6, satellites=3, stations=2):
+    """Small generator-format scenario with recognizable values"""
+    rng = np.random.default_rng(index)
+    return {
+        'index': index,
+        'satellites': [f"SAT_{i}" for i in range(satellites)],
+        'ground_stations': [f"GS_{i}" for i in range(stations)],
+        'duration_minutes': steps * 5,
+        'time_steps': np.arange(0, steps * 5, 5),
+        'visible': rng.random((steps, satellites, stations)) > 0.5,
+        'elevation': rng.uniform(0, 90, (steps, satellites, stations)).astype(np.float32),
+        'total_data_mb': rng.uniform(100, 1000, satellites),
+        'priority': rng.integers(0, 3, satellites).astype(np.int8),
+        'deadline_hours': rng.uniform(2, 8, satellites).astype(np.float32)
+    }
+
+def test_scenario_store():
+    """Scenarios should round-trip through the memory-mapped store"""
+    print("\n[STORE] Testing memory-mapped scenario store...")
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        scenarios = [make_scenario(i + 100) for i in range(5)]
+        ScenarioStore.from_scenarios(os.path.join(model_dir, 'training_scenarios'), scenarios, seed=7)
+
+        store = ScenarioStore(os.path.join(model_dir, 'training_scenarios'))
+        assert len(store) == 5
+        scenario = store[3]
+        assert isinstance(scenario['visible'], np.memmap)
+        assert scenario['index'] == 103
+        for field in ('visible', 'elevation', 'total_data_mb', 'priority', 'deadline_hours'):
+            assert np.array_equal(scenario[field], scenarios[3][field])
+
+        # The API only reads the store index for its metadata
+        calculator = AIPerformanceCalculator()
+        calculator.model_path = model_dir
+        assert calculator.get_scenarios_count() == 5
+        assert calculator.scenario_file_reads == 0
+
+    print("[SUCCESS] Store scenarios are zero-copy views of the on-disk arrays")
+    return True
+
+def run_all_tests():
+    """Run all AI performance tests"""
+    print("PROJECT ENTANGLEMENT - AI Performance Testing")
+    print("=" * 50)
+
+    tests = [
+        test_training_results_cached,
+        test_scenario_store
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"[ERROR] Test failed: {e}")
+
+    print(f"\n[RESULTS] Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,302 @@
+"""
+Test Script for the REST API
+Exercises the Flask endpoints in-process through the test client
+"""
+
+from datetime import datetime, timedelta, timezone
+import json
+import msgpack
+import numpy as np
+from flask import jsonify
+
+import api_server
+import scheduling_features
+import serialization
+from communication_windows import WindowSet, WINDOW_DTYPE
+from response_cache import ResponseCache
+from satellite_tracker import SAMPLE_TLE_DATA
+from trajectory import Trajectory
+
+client = api_server.app.test_client()
+
+def test_trajectory_errors():
+    """Unknown satellites should be 404s and bad query parameters 400s"""
+    print("[TRAJECTORY] Testing trajectory endpoint errors...")
+
+    satellite = next(iter(api_server.simulator.tracker.satellites))
+    response = client.get(f'/api/satellites/{satellite}/trajectory?start_time=2025-01-01T00:00:00Z&duration_hours=1')
+    assert response.status_code == 200 and response.get_json()['points_count'] == 7
+    assert client.get('/api/satellites/NO_SUCH_SAT/trajectory').status_code == 404
+    for query in ('start_time=garbage', 'duration_hours=soon', 'step_minutes=1.5'):
+        response = client.get(f'/api/satellites/{satellite}/trajectory?{query}')
+        assert response.status_code == 400, query
+
+    print("[SUCCESS] Trajectory errors map to 404 and 400")
+    return True
+
+def test_json_provider_types():
+    """jsonify should encode NumPy values, datetimes and trajectories with either JSON backend"""
+    print("\n[SERIALIZATION] Testing the JSON provider...")
+
+    grid = np.arange(12.0).reshape(3, 4)
+    satellite = next(iter(api_server.simulator.tracker.satellites))
+    trajectory = api_server.simulator.tracker.predict_trajectory(satellite, datetime(2025, 1, 1), 1, 10)
+    payload = {
+        'strided': grid[:, ::2], 'transposed': grid.T, 'float32': np.float32(1.5),
+        'int64': np.int64(3), 'bool': np.bool_(True),
+        'datetime64': np.datetime64('2025-01-01T06:00:00', 'us'),
+        'datetime64_ns': np.datetime64('2025-01-01T06:00:00.000001000', 'ns'),
+        'datetime64_array': np.array(['2025-01-01T06:00', '2025-01-01T07:00'], dtype='datetime64[s]'),
+        'nat': np.datetime64('NaT'),
+        'aware': datetime(2025, 1, 1, 11, 30, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        'trajectory': trajectory
+    }
+    expected = {
+        'strided': [[0.0, 2.0], [4.0, 6.0], [8.0, 10.0]], 'transposed': grid.T.tolist(),
+        'float32': 1.5, 'int64': 3, 'bool': True,
+        'datetime64': '2025-01-01T06:00:00', 'datetime64_ns': '2025-01-01T06:00:00.000001',
+        'datetime64_array': ['2025-01-01T06:00:00', '2025-01-01T07:00:00'], 'nat': None,
+        'aware': '2025-01-01T11:30:00+05:30'
+    }
+
+    orjson_available = serialization.ORJSON_AVAILABLE
+    try:
+        for use_orjson in sorted({False, orjson_available}):
+            serialization.ORJSON_AVAILABLE = use_orjson
+            with api_server.app.test_request_context():
+                decoded = json.loads(jsonify(payload).get_data())
+            rebuilt = Trajectory.from_dict(decoded.pop('trajectory'))
+            assert decoded == expected, (use_orjson, decoded)
+            assert rebuilt.epoch == trajectory.epoch
+            assert np.array_equal(rebuilt.position_km, trajectory.position_km)
+    finally:
+        serialization.ORJSON_AVAILABLE = orjson_available
+
+    # The MessagePack encoder needs the same conversions
+    with api_server.app.test_request_context(headers={'Accept': 'application/msgpack'}):
+        response = jsonify(payload)
+    assert response.mimetype == 'application/msgpack'
+    decoded = msgpack.unpackb(response.get_data())
+    rebuilt = Trajectory.from_dict(decoded.pop('trajectory'))
+    assert decoded == expected and np.array_equal(rebuilt.latitude, trajectory.latitude)
+
+    print(f"[SUCCESS] {len(payload)} value types encoded with JSON and MessagePack")
+    return True
+
+def test_msgpack_negotiation():
+    """Accept should select MessagePack, and every negotiated response should vary on it"""
+    print("\n[NEGOTIATION] Testing MessagePack content negotiation...")
+
+    satellite = next(iter(api_server.simulator.tracker.satellites))
+    positions = {'queries': [[satellite, '2025-01-01T00:00:00Z'], [satellite, '2025-01-01T01:00:00Z']]}
+    requests = [
+        lambda **kw: client.get('/api/ground-stations', **kw),  # Cached response
+        lambda **kw: client.post('/api/satellites/positions', json=positions, **kw)  # NumPy arrays, uncached
+    ]
+    for send in requests:
+        plain = send()
+        assert plain.mimetype == 'application/json' and 'Accept' in plain.vary
+        for accept in ('application/msgpack', 'application/x-msgpack',
+                       'application/json;q=0.5, application/msgpack'):
+            packed = send(headers={'Accept': accept})
+            assert packed.mimetype == accept.split(', ')[-1], accept
+            assert 'Accept' in packed.vary
+            assert msgpack.unpackb(packed.get_data()) == plain.get_json()
+        assert send(headers={'Accept': '*/*'}).mimetype == 'application/json'
+
+    print("[SUCCESS] MessagePack served on request with Vary: Accept")
+    return True
+
+def test_response_cache_eviction():
+    """The LRU should stay within both its entry and byte budgets, evicting least recently used first"""
+    print("\n[CACHE] Testing response cache eviction...")
+
+    cache = ResponseCache(max_entries=3, max_bytes=1000)
+    for key in 'abc':
+        cache.put((key,), b'x' * 100, 'application/json')
+    assert cache.get(('a',)) is not None  # 'b' is now least recently used
+    cache.put(('d',), b'x' * 100, 'application/json')
+    assert cache.get(('b',)) is None
+    assert all(cache.get((key,)) is not None for key in 'acd')
+
+    # A large body evicts as many old entries as it needs; one over budget is never stored
+    cache.put(('e',), b'x' * 850, 'application/json')
+    assert [cache.get((key,)) is not None for key in 'acde'] == [False, False, True, True]
+    assert cache.get_stats()['size_bytes'] == 950
+    entry = cache.put(('f',), b'x' * 1001, 'application/json')
+    assert entry.etag and cache.get(('f',)) is None and cache.get_stats()['entries'] == 2
+
+    print("[SUCCESS] Entries evicted by count and by size")
+    return True
+
+def test_cached_responses():
+    """Catalog endpoints should revalidate with strong ETags and follow catalog edits"""
+    print("\n[CACHE] Testing cached endpoints...")
+
+    tracker = api_server.simulator.tracker
+    cache = api_server.response_cache
+    first = client.get('/api/ground-stations')
+    etag, weak = first.get_etag()
+    assert first.status_code == 200 and etag and not weak
+    assert first.cache_control.no_cache
+    unchanged = client.get('/api/ground-stations', headers={'If-None-Match': f'"{etag}"'})
+    assert unchanged.status_code == 304 and not unchanged.get_data()
+
+    # Moving a station invalidates the cached list; moving it back renders it afresh
+    name = next(iter(tracker.ground_stations))
+    station = tracker.ground_stations[name]
+    latitude, longitude, elevation = station.latitude.degrees, station.longitude.degrees, station.elevation.m
+    tracker.add_ground_station(name, latitude + 1, longitude, elevation)
+    moved = client.get('/api/ground-stations', headers={'If-None-Match': f'"{etag}"'})
+    assert moved.status_code == 200 and moved.get_etag()[0] != etag
+    assert any(row['latitude'] > latitude + 0.5 for row in moved.get_json()['ground_stations'])
+    tracker.add_ground_station(name, latitude, longitude, elevation)
+    misses = cache.get_stats()['misses']
+    assert client.get('/api/ground-stations').get_etag()[0] == etag
+    assert cache.get_stats()['misses'] == misses + 1
+
+    # So does a new TLE; trajectories and CZML are only cached for an explicit start time
+    satellite = next(iter(tracker.satellites))
+    url = f'/api/satellites/{satellite}/trajectory?duration_hours=1&start_time=2025-01-01T00:00:00Z'
+    assert client.get(url).headers['Cache-Control'] == 'public, max-age=300'
+    hits = cache.get_stats()['hits']
+    assert client.get(url).status_code == 200 and cache.get_stats()['hits'] == hits + 1
+    tracker.add_satellite_from_tle(satellite, SAMPLE_TLE_DATA[satellite]['line1'],
+                                   SAMPLE_TLE_DATA[satellite]['line2'])
+    misses = cache.get_stats()['misses']
+    assert client.get(url).status_code == 200 and cache.get_stats()['misses'] == misses + 1
+    for url in (f'/api/satellites/{satellite}/trajectory?duration_hours=1',
+                '/api/satellites/czml?duration_hours=1&step_minutes=30'):
+        stats = cache.get_stats()
+        for _ in range(2):
+            response = client.get(url)
+            assert response.status_code == 200 and response.get_etag() == (None, None)
+        assert cache.get_stats() == stats, url
+
+    print("[SUCCESS] ETags revalidate and catalog edits invalidate the cache")
+    return True
+
+def test_chunked_observations():
+    """More than 10 windows should be scored in overlapping chunks and merged back per window"""
+    print("\n[CHUNKS] Testing chunked observations and priority merging...")
+
+    manager = api_server.ai_model_manager
+    rng = np.random.default_rng(4)
+    count = 23
+    records = np.zeros(count, dtype=WINDOW_DTYPE)
+    records['satellite'] = rng.integers(0, 3, count)
+    records['start'] = np.datetime64('2025-01-01T00:00', 'us') + rng.permutation(count) * np.timedelta64(20, 'm')
+    records['end'] = records['start'] + np.timedelta64(10, 'm')
+    records['duration_minutes'] = rng.uniform(5, 15, count)
+    records['max_elevation'] = rng.uniform(10, 90, count)
+    records['quality_score'] = rng.uniform(0, 1, count)
+    window_set = WindowSet(records, ['ISS', 'ISRO_SAT', 'OTHER'], ['GS'])
+
+    order, starts = manager._chunk_windows(window_set)
+    assert starts.tolist() == [0, 5, 10, 13]
+    assert np.array_equal(order, np.argsort(records['start']))
+    covered = np.zeros(count, dtype=bool)
+    for start in starts:
+        covered[start:start + 10] = True
+    assert covered.all()
+    # API-format dicts are ordered the same way
+    assert np.array_equal(manager._chunk_windows(window_set.to_records())[0], order)
+
+    observations = manager._convert_windows_to_observations(window_set, order, starts)
+    features = scheduling_features.window_set_features(window_set)[order]
+    assert observations.shape == (4, scheduling_features.OBSERVATION_SIZE)
+    for row, start in zip(observations, starts):
+        assert np.array_equal(row, features[start:start + 10].ravel())
+
+    # Fewer than 10 windows: one chunk, zero-padded
+    assert scheduling_features.chunk_starts(3).tolist() == [0]
+    short = scheduling_features.build_observations(features[:3], scheduling_features.chunk_starts(3))
+    assert np.array_equal(short[0, :15], features[:3].ravel()) and not short[0, 15:].any()
+
+    # Each window's priority is the mean over the chunks holding it, in the caller's order
+    actions = rng.uniform(-1, 1, (len(starts), 10))
+    priorities = manager._merge_chunk_priorities(actions, starts, order)
+    for position, window in enumerate(order):
+        values = [(actions[b, position - start] + 1) / 2 for b, start in enumerate(starts)
+                  if start <= position < start + 10]
+        assert np.isclose(priorities[window], np.mean(values))
+    assert np.array_equal(manager._merge_chunk_priorities(actions, starts, order), priorities)
+
+    print(f"[SUCCESS] {count} windows scored in {len(starts)} chunks")
+    return True
+
+def test_model_info_is_read_only():
+    """Polling the model status must not load the model or start a warm-up"""
+    print("\n[MODEL INFO] Testing that model-info has no side effects...")
+
+    manager = api_server.ai_model_manager
+    readiness, thread = manager.readiness, manager._warmup_thread
+    for _ in range(3):
+        response = client.get('/api/ai/model-info')
+        assert response.status_code == 200
+    assert manager.readiness == readiness and manager._warmup_thread is thread
+    if readiness == 'NOT_LOADED':
+        info = response.get_json()['model_info']
+        assert info['status'] == 'NOT_LOADED' and not info['model_loaded']
+
+    print(f"[SUCCESS] Model still {manager.readiness} after polling")
+    return True
+
+def test_window_pages_reuse_live_propagation():
+    """Later pages of a live (uncovered) window query should not propagate again"""
+    print("\n[WINDOW PAGES] Testing paging over live-propagated windows...")
+
+    detector = api_server.simulator.window_detector
+    propagate, calls = detector.find_window_set, []
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return propagate(*args, **kwargs)
+    detector.find_window_set = counting
+    try:
+        # The store's rolling horizon never covers 2025, so this range is propagated
+        query = '/api/communication-windows?start_time=2025-01-01T00:00:00&duration_hours=24&limit=3'
+        response = client.get(query).get_json()
+        seen, total = [], response['total']
+        while True:
+            seen.extend((w['satellite'], w['station'], w['start_time']) for w in response['windows'])
+            if not response['next_cursor']:
+                break
+            response = client.get(f"{query}&cursor={response['next_cursor']}").get_json()
+            assert response['total'] == total
+    finally:
+        detector.find_window_set = propagate
+    assert total and len(seen) == len(set(seen)) == total
+    assert len(calls) == 1
+
+    print(f"[SUCCESS] {total} windows paged with one propagation")
+    return True
+
+def run_all_tests():
+    """Run all REST API tests"""
+    print("PROJECT ENTANGLEMENT - REST API Testing")
+    print("=" * 50)
+
+    tests = [
+        test_trajectory_errors,
+        test_json_provider_types,
+        test_msgpack_negotiation,
+        test_response_cache_eviction,
+        test_cached_responses,
+        test_chunked_observations,
+        test_model_info_is_read_only,
+        test_window_pages_reuse_live_propagation
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"[ERROR] Test failed: {e}")
+
+    print(f"\n[RESULTS] Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,163 @@
+"""
+Test Script for the batched AI inference service
+Validates micro-batching, per-caller result routing and statistics
+"""
+
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+from inference_service import BatchedInferenceService
+from numpy_policy import NumpyPolicy
+
+def test_concurrent_requests_share_batches():
+    """Concurrent callers should be coalesced into few forward passes"""
+    print("[BATCHING] Testing micro-batched inference...")
+
+    forward_batches = []
+
+    def predict_fn(observations):
+        forward_batches.append(len(observations))
+        time.sleep(0.005)  # Simulate a small forward pass
+        # Action echoes the first feature so routing can be verified
+        return np.repeat(observations[:, :1], 3, axis=1)
+
+    service = BatchedInferenceService(predict_fn, max_batch_size=64, max_wait_ms=20.0)
+    results = {}
+
+    def caller(i):
+        obs = np.full(50, float(i), dtype=np.float32)
+        actions, info = service.predict(obs)
+        results[i] = (actions, info)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service.stop()
+
+    assert len(results) == 32
+    for i, (actions, info) in results.items():
+        assert actions.shape == (3,)
+        assert np.all(actions == float(i))
+        assert info['batch_size'] >= 1
+
+    stats = service.get_stats()
+    assert stats['requests_served'] == 32
+    assert sum(forward_batches) == 32
+    assert len(forward_batches) < 32
+
+    print(f"[SUCCESS] 32 requests served in {len(forward_batches)} forward passes "
+          f"(avg batch {stats['avg_batch_size']})")
+    return True
+
+def test_errors_propagate_to_callers():
+    """A failing forward pass should raise in every waiting caller"""
+    print("\n[ERRORS] Testing error propagation...")
+
+    def predict_fn(observations):
+        raise RuntimeError("model unavailable")
+
+    service = BatchedInferenceService(predict_fn, max_wait_ms=1.0)
+    try:
+        service.predict(np.zeros(50, dtype=np.float32), timeout=5)
+        raised = False
+    except RuntimeError:
+        raised = True
+    service.stop()
+
+    assert raised
+    print("[SUCCESS] Forward-pass errors reach the caller")
+    return True
+
+def test_bad_shapes_do_not_kill_worker():
+    """Mismatched observations should fail their own callers, not the worker"""
+    print("\n[SHAPES] Testing mismatched observation handling...")
+
+    def predict_fn(observations):
+        return observations[:, :3]
+
+    # With a declared width, wrong shapes are rejected before queueing
+    service = BatchedInferenceService(predict_fn, max_wait_ms=1.0, n_features=50)
+    try:
+        service.submit(np.zeros(49, dtype=np.float32))
+        rejected = False
+    except ValueError:
+        rejected = True
+    assert rejected
+    actions, _ = service.predict(np.ones(50, dtype=np.float32), timeout=5)
+    assert actions.shape == (3,)
+    service.stop()
+
+    # Without one, a batch that cannot be stacked fails and the worker keeps serving
+    service = BatchedInferenceService(predict_fn, max_wait_ms=50.0)
+    good = service.submit(np.zeros(50, dtype=np.float32))
+    bad = service.submit(np.zeros(49, dtype=np.float32))
+    try:
+        bad.result(timeout=5)
+        failed = False
+    except ValueError:
+        failed = True
+    assert failed
+    good.exception(timeout=5)
+    actions, info = service.predict(np.full(50, 2.0, dtype=np.float32), timeout=5)
+    assert np.all(actions == 2.0)
+    assert service.get_stats()['running']
+    service.stop()
+
+    print("[SUCCESS] Bad requests fail alone and later requests still succeed")
+    return True
+
+def test_numpy_policy_forward():
+    """NumPy policy should match a reference MLP forward pass and survive save/load"""
+    print("\n[NUMPY POLICY] Testing torch-free policy forward pass...")
+
+    rng = np.random.default_rng(0)
+    w1, b1 = rng.normal(size=(64, 50)), rng.normal(size=64)
+    w2, b2 = rng.normal(size=(64, 64)) * 0.1, rng.normal(size=64)
+    wa, ba = rng.normal(size=(3, 64)), rng.normal(size=3)
+    low, high = np.array([0, 0, 5]), np.array([7, 3, 15])
+    policy = NumpyPolicy([(w1, b1), (w2, b2)], wa, ba, low, high, fingerprint='abc')
+
+    obs = rng.random((20, 50)).astype(np.float32)
+    expected = np.clip(np.tanh(np.tanh(obs @ w1.T + b1) @ w2.T + b2) @ wa.T + ba, low, high)
+    assert np.allclose(policy.predict(obs), expected, atol=1e-4)
+    assert policy.predict(obs[0]).shape == (1, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'policy.npz')
+        policy.save(path)
+        loaded = NumpyPolicy.load(path)
+    assert loaded.fingerprint == 'abc'
+    assert np.array_equal(loaded.predict(obs), policy.predict(obs))
+
+    print("[SUCCESS] NumPy forward pass matches the reference MLP")
+    return True
+
+def run_all_tests():
+    """Run all inference service tests"""
+    print("PROJECT ENTANGLEMENT - Batched Inference Testing")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_requests_share_batches,
+        test_errors_propagate_to_callers,
+        test_bad_shapes_do_not_kill_worker,
+        test_numpy_policy_forward
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"[ERROR] Test failed: {e}")
+
+    print(f"\n[RESULTS] Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -3,10 +3,18 @@ Test Script for Sub-Phase 1.1 - Backend Foundation
 Validates core simulation engine functionality
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from skyfield.api import utc
+import numpy as np
 from orbital_simulator import SatelliteConstellationSimulator
+from satellite_tracker import SAMPLE_TLE_DATA
+from communication_windows import (CommunicationWindow, CommunicationWindowDetector,
+                                   WindowSet, SOCKET_WINDOW_FIELDS)
+from coverage_stats import coverage_statistics
+from pass_store import PassStore
 import json
+import os
+import tempfile
 
 def test_satellite_position_prediction():
     """Test satellite position prediction functionality"""
@@ -82,6 +90,258 @@ def test_ground_station_visibility():
     
     return True
 
+def test_trajectory_container():
+    """Test columnar trajectory prediction against scalar propagation"""
+    print("\n[TRAJECTORY] Testing Columnar Trajectory Container...")
+    
+    simulator = SatelliteConstellationSimulator()
+    simulator.initialize_sample_constellation()
+    
+    start = datetime(2024, 9, 5, 0, 0, tzinfo=utc)
+    trajectory = simulator.tracker.predict_trajectory('ISS', start, 6, step_minutes=10)
+    
+    # 6 hours at 10-minute steps, both ends inclusive
+    assert len(trajectory) == 37
+    assert trajectory.position_km.shape == (37, 3)
+    
+    # Vectorized samples must match the scalar position call
+    check_time = start + timedelta(minutes=120)
+    expected = simulator.tracker.get_satellite_position('ISS', check_time)
+    sample = trajectory[12]
+    assert sample['time'] == check_time
+    assert abs(sample['latitude'] - expected['latitude']) < 1e-6
+    assert abs(sample['longitude'] - expected['longitude']) < 1e-6
+    assert abs(sample['altitude_km'] - expected['altitude_km']) < 1e-6
+    
+    # Slices share memory with the parent trajectory
+    window = trajectory[6:18]
+    assert len(window) == 12
+    assert np.shares_memory(window.latitude, trajectory.latitude)
+    
+    czml = trajectory.czml_cartographic_degrees()
+    assert len(czml) == 4 * len(trajectory)
+    assert czml[4] == 600.0
+    
+    # Timestamps keep their UTC offset, and non-UTC inputs are converted, not relabelled
+    assert trajectory.isoformat_times()[12] == check_time.isoformat()
+    local_start = start.astimezone(timezone(timedelta(hours=5, minutes=30)))
+    shifted = simulator.tracker.predict_trajectory('ISS', local_start, 6, step_minutes=10)
+    assert shifted.isoformat_times() == trajectory.isoformat_times()
+    assert np.array_equal(shifted.latitude, trajectory.latitude)
+    
+    print(f"[SUCCESS] {trajectory} ({trajectory.position_km.nbytes} bytes of positions)")
+    return True
+
+def test_batch_queries():
+    """Test grouped batch positions and look angles against the scalar calls"""
+    print("\n[BATCH] Testing Batch Position and Visibility Queries...")
+    
+    simulator = SatelliteConstellationSimulator()
+    simulator.initialize_sample_constellation()
+    tracker = simulator.tracker
+    
+    satellites = list(tracker.satellites)
+    stations = list(tracker.ground_stations)
+    start = datetime(2025, 1, 1, tzinfo=utc)
+    # Interleaved satellites, stations and times so grouping has to restore query order
+    queries = [(satellites[i % len(satellites)], stations[(i // 2) % len(stations)],
+                start + timedelta(minutes=7 * i)) for i in range(200)]
+    names, station_names, times = zip(*queries)
+    
+    positions = tracker.get_positions(names, times)
+    angles = tracker.get_look_angles(names, station_names, times)
+    assert len(positions['latitude']) == len(angles['elevation_degrees']) == len(queries)
+    
+    for i in range(0, len(queries), 13):
+        expected = tracker.get_satellite_position(names[i], times[i])
+        assert abs(positions['latitude'][i] - expected['latitude']) < 1e-6
+        assert abs(positions['longitude'][i] - expected['longitude']) < 1e-6
+        assert abs(positions['altitude_km'][i] - expected['altitude_km']) < 1e-6
+        elevation = tracker.calculate_elevation_angle(names[i], station_names[i], times[i])
+        assert abs(angles['elevation_degrees'][i] - elevation) < 1e-6
+    
+    try:
+        tracker.get_positions(['NOT_A_SATELLITE'], [start])
+        raise AssertionError("Unknown satellite should raise ValueError")
+    except ValueError:
+        pass
+    
+    visible = int(np.count_nonzero(angles['elevation_degrees'] >= 10))
+    print(f"[SUCCESS] {len(queries)} batched queries match scalar propagation ({visible} visible)")
+    return True
+
+def test_window_set():
+    """Test compact WindowSet round-trip, filtering and serialization"""
+    print("\n[WINDOWS] Testing Compact Window Set...")
+    
+    base = datetime(2024, 9, 5, 0, 0)
+    windows = [
+        CommunicationWindow('ISS', 'ISRO_Bangalore', base + timedelta(minutes=40),
+                            base + timedelta(minutes=48), 62.0, 8.0),
+        CommunicationWindow('ISS', 'NASA_Houston', base + timedelta(minutes=5),
+                            base + timedelta(minutes=20), 85.0, 15.0),
+        CommunicationWindow('STARLINK_1', 'ISRO_Bangalore', base + timedelta(minutes=90),
+                            base + timedelta(minutes=95), 12.0, 5.0)
+    ]
+    window_set = WindowSet.from_windows(windows)
+    
+    assert len(window_set) == 3
+    assert window_set.satellite_names == ['ISS', 'STARLINK_1']
+    assert window_set[1].station_name == 'NASA_Houston'
+    assert window_set[1].start_time == base + timedelta(minutes=5)
+    
+    # Vectorized scores match the per-window detector score
+    detector = CommunicationWindowDetector(None)
+    scores = window_set.quality_scores()
+    for window, score in zip(windows, scores):
+        assert abs(detector.get_window_quality_score(window) - score) < 1e-12
+    
+    high_quality = detector.filter_high_quality_windows(window_set, min_quality=0.5)
+    assert [w.satellite_name for w in high_quality] == ['ISS', 'ISS']
+    
+    # Scores are cached in the set and reused by ranking
+    assert window_set.score_weights is not None
+    best = detector.rank_windows(window_set, 2)
+    assert [w.station_name for w in best] == ['NASA_Houston', 'ISRO_Bangalore']
+    
+    # Rescoring a slice with other weights leaves the parent's scores alone,
+    # and returned scores are snapshots rather than live views
+    parent_scores = window_set.quality_scores()
+    view = window_set[0:2]
+    view.quality_scores({'duration': 1.0, 'elevation': 0.0})
+    assert np.array_equal(window_set.quality_score, parent_scores)
+    assert not np.array_equal(view.quality_score, parent_scores[:2])
+    window_set.quality_scores({'duration': 0.0, 'elevation': 1.0})
+    assert not np.array_equal(window_set.quality_score, parent_scores)
+    window_set.quality_scores()
+    assert np.array_equal(window_set.quality_score, parent_scores)
+    
+    ordered = window_set.sort_by('start')
+    assert [w.station_name for w in ordered][0] == 'NASA_Houston'
+    
+    records = ordered.to_records(rename=SOCKET_WINDOW_FIELDS)
+    assert records[0]['ground_station'] == 'NASA_Houston'
+    assert records[0]['start_time'] == (base + timedelta(minutes=5)).isoformat()
+    
+    print(f"[SUCCESS] {window_set} in {window_set.records.nbytes} bytes")
+    return True
+
+def test_coverage_statistics():
+    """Test sweep-line coverage against hand-computed windows"""
+    print("\n[COVERAGE] Testing Coverage Statistics...")
+    
+    t0 = datetime(2025, 1, 1)
+    def window(satellite, station, start, end):
+        return CommunicationWindow(satellite, station, t0 + timedelta(minutes=start),
+                                   t0 + timedelta(minutes=end), 45.0, end - start)
+    
+    # GS_A: 10-30 and 20-40 overlap, then 70-80; GS_B: 35-50. Horizon is 0-100 minutes.
+    windows = WindowSet.from_windows([
+        window('SAT_1', 'GS_A', 10, 30),
+        window('SAT_2', 'GS_A', 20, 40),
+        window('SAT_1', 'GS_A', 70, 80),
+        window('SAT_2', 'GS_B', 35, 50)
+    ])
+    stats = coverage_statistics(windows, t0, t0 + timedelta(minutes=100), station_names=['GS_A', 'GS_B', 'GS_C'])
+    
+    station = stats['stations']['GS_A']
+    assert station['coverage_minutes'] == 40.0  # Overlap counted once, not 50
+    assert station['max_gap_minutes'] == 30.0
+    assert station['revisits'] == 1 and station['mean_revisit_minutes'] == 30.0
+    assert station['concurrency_minutes'] == [60.0, 30.0, 10.0]
+    assert stats['stations']['GS_C']['coverage_minutes'] == 0.0
+    assert stats['stations']['GS_C']['max_gap_minutes'] == 100.0
+    
+    network = stats['network']
+    assert network['coverage_minutes'] == 50.0  # 10-50 and 70-80
+    assert network['max_gap_minutes'] == 20.0
+    assert network['max_concurrency'] == 2
+    assert stats['satellites']['SAT_2']['coverage_minutes'] == 30.0  # 20-40 and 35-50 overlap
+    
+    print(f"[SUCCESS] Network coverage {network['coverage_percent']}%, "
+          f"GS_A concurrency {station['concurrency_minutes']}")
+    return True
+
+def test_pass_store():
+    """Test the precomputed pass store against live propagation"""
+    print("\n[PASS STORE] Testing Precomputed Pass Store...")
+    
+    simulator = SatelliteConstellationSimulator()
+    simulator.initialize_sample_constellation()
+    tracker, detector = simulator.tracker, simulator.window_detector
+    pairs = len(tracker.satellites) * len(tracker.ground_stations)
+    now = datetime(2025, 1, 1, 4, 20)  # The stored span below includes ISS passes
+    
+    def signature(windows):
+        return sorted(zip(windows.satellite_array().tolist(), windows.station_array().tolist(),
+                          windows.records['start'].tolist(), windows.records['end'].tolist()))
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = PassStore(os.path.join(directory, 'passes.sqlite'), horizon_hours=3)
+        assert store.find_window_set(tracker, now, 3) is None  # Empty store: caller propagates
+        assert store.refresh(detector, now)['pairs_rebuilt'] == pairs
+        
+        # Rolling forward extends every pair and matches one long live propagation
+        summary = store.refresh(detector, now + timedelta(hours=2))
+        assert summary['pairs_extended'] == pairs and summary['pairs_rebuilt'] == 0
+        stored = store.find_window_set(tracker, now + timedelta(hours=2), 3)
+        live = detector.find_window_set(datetime(2025, 1, 1, 4), 6)
+        low, high = np.datetime64('2025-01-01T06:20', 'us'), np.datetime64('2025-01-01T09:20', 'us')
+        live = live.filter((live.records['end'] > low) & (live.records['start'] < high))
+        assert len(stored) and signature(stored) == signature(live)
+        assert store.find_window_set(tracker, now + timedelta(hours=2), 24) is None
+        
+        # Chunked reads return the same passes, in start order
+        chunks = list(store.iter_window_sets(tracker, now + timedelta(hours=2), 3, chunk_rows=4))
+        assert all(len(chunk) <= 4 for chunk in chunks)
+        starts = [start for chunk in chunks for start in chunk.records['start'].tolist()]
+        assert starts == sorted(starts)
+        assert sorted(item for chunk in chunks for item in signature(chunk)) == signature(stored)
+        assert store.iter_window_sets(tracker, now + timedelta(hours=2), 24) is None
+        
+        # Coverage is keyed on content: re-adding the same TLE, or another process
+        # (worker or restart) with the same catalog, reuses the stored passes
+        name = stored.satellite_array()[0]
+        other_name = next(sat for sat in tracker.satellites if sat != name)
+        tracker.add_satellite_from_tle(name, SAMPLE_TLE_DATA[name]['line1'], SAMPLE_TLE_DATA[name]['line2'])
+        worker = SatelliteConstellationSimulator()
+        worker.initialize_sample_constellation()
+        assert worker.tracker.satellite_fingerprints == tracker.satellite_fingerprints
+        assert store.find_window_set(worker.tracker, now + timedelta(hours=2), 3) is not None
+        summary = store.refresh(worker.window_detector, now + timedelta(hours=2))
+        assert summary['pairs_rebuilt'] == summary['pairs_extended'] == 0
+        
+        # A new TLE invalidates only that satellite's pairs, and only for the process that loaded it;
+        # the other process keeps its own version instead of rebuilding it back
+        tracker.add_satellite_from_tle(name, SAMPLE_TLE_DATA[other_name]['line1'], SAMPLE_TLE_DATA[other_name]['line2'])
+        assert store.find_window_set(tracker, now + timedelta(hours=2), 3) is None
+        assert store.refresh(detector, now + timedelta(hours=2))['pairs_rebuilt'] == len(tracker.ground_stations)
+        assert store.refresh(worker.window_detector, now + timedelta(hours=2))['pairs_rebuilt'] == 0
+        updated = store.find_window_set(tracker, now + timedelta(hours=2), 3, satellites=[name])
+        original = store.find_window_set(worker.tracker, now + timedelta(hours=2), 3, satellites=[name])
+        assert signature(original) == signature(stored.filter(stored.satellite_array() == name))
+        assert signature(updated) != signature(original)
+        
+        # Versions no process extends any more are dropped
+        store.refresh(detector, now + timedelta(hours=5))
+        assert store.find_window_set(worker.tracker, now + timedelta(hours=5), 3) is None
+        assert store.find_window_set(tracker, now + timedelta(hours=5), 3) is not None
+        
+        # Cached coverage follows writes made through another worker's connection
+        later = now + timedelta(hours=5)
+        stations = list(tracker.ground_stations)
+        assert store.find_window_set(tracker, later, 3, satellites=[name, name], stations=stations) is not None
+        other = PassStore(store.path, horizon_hours=3)
+        with other._lock:
+            other._db().execute('DELETE FROM coverage WHERE satellite = ?', (name,))
+        assert store.find_window_set(tracker, later, 3) is None
+        assert store.find_window_set(tracker, later, 3, satellites=[other_name]) is not None
+        assert store.refresh(detector, later)['pairs_rebuilt'] == len(stations)
+        assert store.find_window_set(tracker, later, 3) is not None
+    
+    print(f"[SUCCESS] {len(stored)} stored passes match live propagation")
+    return True
+
 def run_all_tests():
     """Run all Sub-Phase 1.1 tests"""
     print("PROJECT ENTANGLEMENT - Sub-Phase 1.1 Testing")
@@ -91,7 +351,12 @@ def run_all_tests():
         test_satellite_position_prediction,
         test_communication_windows,
         test_orbital_mechanics,
-        test_ground_station_visibility
+        test_ground_station_visibility,
+        test_trajectory_container,
+        test_batch_queries,
+        test_window_set,
+        test_coverage_statistics,
+        test_pass_store
     ]
     
     passed = 0
@@ -0,0 +1,162 @@
+"""
+Test Script for the DRL training environments
+Validates parallel scenario generation, the scenario store round trip and
+the batched VecEnv against the single-scenario environment
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+
+# The training script lives at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import colab_training_setup as training
+from scheduling_features import OBSERVATION_SIZE, WINDOWS_PER_OBSERVATION
+
+def test_parallel_generation_reproducible():
+    """Scenarios should not depend on the worker count or on how they are stored"""
+    print("[GENERATION] Testing parallel scenario generation...")
+
+    generator = training.SatelliteSchedulingDataGenerator(seed=11)
+    serial = generator.generate_training_dataset(6, workers=1, duration_hours=1)
+    parallel = generator.generate_training_dataset(6, workers=2, duration_hours=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = generator.write_training_store(os.path.join(tmp, 'scenarios'), 6, workers=2,
+                                               duration_hours=1, chunk_size=2)
+        for index in range(6):
+            single = generator.generate_scenario(1, index=index)
+            for field in ('visible', 'elevation', 'total_data_mb', 'priority'):
+                assert np.array_equal(serial[index][field], single[field])
+                assert np.array_equal(parallel[index][field], single[field])
+                assert np.array_equal(store[index][field], single[field])
+
+    print("[SUCCESS] Scenario i is the same serially, in parallel and in the store")
+    return True
+
+def test_batched_env_matches_single_env():
+    """The batched VecEnv should reproduce SatelliteSchedulingEnv step for step"""
+    print("\n[VECENV] Testing batched environment against the single env...")
+
+    generator = training.SatelliteSchedulingDataGenerator(seed=5)
+    scenarios = generator.generate_training_dataset(5, workers=1, duration_hours=1)
+    num_steps = len(scenarios[0]['time_steps'])
+
+    batched = training.BatchedSatelliteSchedulingEnv(scenarios, num_envs=4, seed=3)
+    assert batched.observation_space.shape == (OBSERVATION_SIZE,)
+    obs = batched.reset()
+    singles = [training.SatelliteSchedulingEnv(scenarios[i]) for i in batched.scenario_ids]
+    expected = np.stack([env.reset()[0] for env in singles])
+    assert np.array_equal(obs, expected)
+
+    rng = np.random.default_rng(0)
+    episodes_finished = 0
+    transferred = 0.0
+    # Long enough for every env to auto-reset twice
+    for _ in range(2 * num_steps + 3):
+        actions = rng.uniform(-1, 1, (4, WINDOWS_PER_OBSERVATION))
+        obs, rewards, dones, infos = batched.step(actions)
+
+        for i, env in enumerate(singles):
+            single_obs, reward, done, _, info = env.step(actions[i])
+            assert done == dones[i]
+            assert np.isclose(reward, rewards[i], rtol=1e-4, atol=1e-5)
+            assert np.isclose(info['data_transferred'], infos[i]['data_transferred'], rtol=1e-4)
+            assert info['conflicts'] == infos[i]['conflicts']
+            transferred += info['data_transferred']
+            if done:
+                episodes_finished += 1
+                assert np.allclose(single_obs, infos[i]['terminal_observation'])
+                singles[i] = training.SatelliteSchedulingEnv(scenarios[batched.scenario_ids[i]])
+                single_obs, _ = singles[i].reset()
+            assert np.allclose(single_obs, obs[i])
+    assert episodes_finished == 8
+    assert transferred > 0  # Some random actions must have been valid transfers
+
+    # Shared state can only be changed for all envs at once
+    batched.set_attr('render_mode', None)
+    assert batched.env_method('_get_observations')[0].shape == (4, OBSERVATION_SIZE)
+    for call in (lambda: batched.set_attr('render_mode', None, indices=[1]),
+                 lambda: batched.env_method('reset', indices=0)):
+        try:
+            call()
+            rejected = False
+        except ValueError:
+            rejected = True
+        assert rejected
+
+    print(f"[SUCCESS] {episodes_finished} batched episodes matched the single env")
+    return True
+
+def test_policy_avoids_busy_station():
+    """Observation slots should hold only schedulable passes, so acting on them never double-books"""
+    print("\n[SLOTS] Testing that the observation and action slots line up...")
+
+    # SAT_A and SAT_B both pass over GS_0 from t=0; SAT_B is also over GS_1 at t=5 only
+    visible = np.zeros((4, 2, 2), dtype=bool)
+    visible[0:3, 0, 0] = visible[0:3, 1, 0] = visible[1, 1, 1] = True
+    scenario = {
+        'satellites': ['ISS', 'SAT_B'], 'ground_stations': ['GS_0', 'GS_1'],
+        'time_steps': np.arange(0, 20, 5), 'visible': visible,
+        'elevation': np.where(visible, 45.0, 0.0).astype(np.float32),
+        'total_data_mb': np.array([1000.0, 1000.0]), 'priority': np.array([1, 1], dtype=np.int8)
+    }
+    always_first = np.eye(WINDOWS_PER_OBSERVATION)[0]  # Fixed policy: top priority on slot 0
+
+    env = training.SatelliteSchedulingEnv(scenario)
+    obs, _ = env.reset()
+    assert env.slots[:2].tolist() == [0, 2] and (env.slots[2:] == -1).all()  # ISS@GS_0, SAT_B@GS_0
+    assert obs[2] == 1.0 and not obs[10:].any()  # ISS flag in slot 0, nothing past slot 1
+
+    # ISS takes GS_0 for the rest of its 15-minute pass
+    obs, reward, _, _, _ = env.step(always_first)
+    assert reward > 0 and env.station_busy_until.tolist() == [15, 0]
+    # SAT_B is still over the busy GS_0, so slot 0 now offers it GS_1
+    assert env.slots[0] == 3 and (env.slots[1:] == -1).all()
+    obs, reward, _, _, _ = env.step(always_first)
+    assert reward > 0 and env.station_busy_until.tolist() == [15, 10]
+    # Only busy-station passes are left: nothing to schedule, and idling is not a conflict
+    assert (env.slots == -1).all() and not obs.any()
+    _, reward, _, _, info = env.step(always_first)
+    assert reward == 0 and info['conflicts'] == 0
+
+    # An empty slot while a pass is offered is a conflict
+    env.reset()
+    _, reward, _, _, info = env.step(np.eye(WINDOWS_PER_OBSERVATION)[5])
+    assert reward == -0.1 and info['conflicts'] == 1
+
+    batched = training.BatchedSatelliteSchedulingEnv([scenario], num_envs=2, seed=0)
+    batched.reset()
+    steps = [batched.step(np.stack([always_first] * 2)) for _ in range(4)]
+    rewards = [rewards for _, rewards, _, _ in steps]
+    assert (rewards[0] > 0).all() and (rewards[1] > 0).all() and not rewards[2].any()
+    assert steps[3][2].all() and all(info['conflicts'] == 0 for info in steps[3][3])
+
+    print("[SUCCESS] A fixed slot-0 policy never schedules onto a busy station")
+    return True
+
+def run_all_tests():
+    """Run all training environment tests"""
+    print("PROJECT ENTANGLEMENT - Training Environment Testing")
+    print("=" * 50)
+
+    tests = [
+        test_parallel_generation_reproducible,
+        test_batched_env_matches_single_env,
+        test_policy_avoids_busy_station
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"[ERROR] Test failed: {e}")
+
+    print(f"\n[RESULTS] Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    run_all_tests()
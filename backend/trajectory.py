@@ -0,0 +1,130 @@
+"""
+Columnar Trajectory Container
+Sub-Phase 1.1: Compact storage for predicted satellite orbital paths
+
+A trajectory is held as a handful of contiguous NumPy arrays (one per field)
+instead of a list of per-sample dictionaries, so long predictions for many
+satellites stay cheap to build, slice and serialize.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Dict, Union
+import numpy as np
+from skyfield.api import utc
+
+
+class Trajectory:
+    """Columnar orbital path for a single satellite
+
+    Sample times are stored as int64 second offsets from ``epoch``; geodetic
+    coordinates and the GCRS position are float64 columns of equal length.
+    Slicing with a ``slice`` returns a new Trajectory sharing the same memory.
+    """
+
+    __slots__ = ('satellite_name', 'epoch', 'offsets_s', 'latitude',
+                 'longitude', 'altitude_km', 'position_km')
+
+    def __init__(self, satellite_name: str, epoch: datetime, offsets_s: np.ndarray,
+                 latitude: np.ndarray, longitude: np.ndarray,
+                 altitude_km: np.ndarray, position_km: np.ndarray):
+        if epoch.tzinfo is None:
+            epoch = epoch.replace(tzinfo=utc)
+        else:
+            epoch = epoch.astimezone(utc)
+        self.satellite_name = satellite_name
+        self.epoch = epoch
+        self.offsets_s = np.asarray(offsets_s, dtype=np.int64)
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.altitude_km = np.asarray(altitude_km, dtype=np.float64)
+        self.position_km = np.asarray(position_km, dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.offsets_s)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, 'Trajectory']:
+        """Return a single sample as a dict, or a zero-copy sub-trajectory"""
+        if isinstance(index, slice):
+            return Trajectory(
+                self.satellite_name, self.epoch, self.offsets_s[index],
+                self.latitude[index], self.longitude[index],
+                self.altitude_km[index], self.position_km[index]
+            )
+        return {
+            'time': self.time_at(index),
+            'latitude': self.latitude[index],
+            'longitude': self.longitude[index],
+            'altitude_km': self.altitude_km[index],
+            'position_km': self.position_km[index]
+        }
+
+    def __repr__(self):
+        return (f"Trajectory({self.satellite_name}, {len(self)} samples "
+                f"from {self.epoch.strftime('%Y-%m-%d %H:%M')})")
+
+    @property
+    def end_time(self) -> datetime:
+        """Time of the last sample (epoch if empty)"""
+        if len(self) == 0:
+            return self.epoch
+        return self.time_at(-1)
+
+    def time_at(self, index: int) -> datetime:
+        """Datetime of a single sample"""
+        return self.epoch + timedelta(seconds=int(self.offsets_s[index]))
+
+    def times(self) -> List[datetime]:
+        """Materialize all sample times as datetime objects"""
+        return [self.epoch + timedelta(seconds=int(s)) for s in self.offsets_s]
+
+    def isoformat_times(self, suffix: str = '+00:00') -> List[str]:
+        """ISO-8601 UTC strings for every sample, formatted in one vectorized call
+
+        Matches ``time_at(i).isoformat()`` with the default suffix; pass
+        ``suffix='Z'`` (or ``''``) for other UTC spellings.
+        """
+        epoch64 = np.datetime64(self.epoch.astimezone(utc).replace(tzinfo=None), 'us')
+        stamps = epoch64 + self.offsets_s.astype('timedelta64[s]')
+        unit = 'us' if self.epoch.microsecond else 's'
+        strings = np.datetime_as_string(stamps, unit=unit)
+        if suffix:
+            return [s + suffix for s in strings.tolist()]
+        return strings.tolist()
+
+    def to_records(self) -> List[Dict]:
+        """Row-oriented view matching SatelliteTracker.get_satellite_position"""
+        return [self[i] for i in range(len(self))]
+
+    def to_dict(self) -> Dict:
+        """Columnar, serialization-ready representation (arrays are not copied)"""
+        return {
+            'satellite': self.satellite_name,
+            'epoch': self.epoch.isoformat(),
+            'offsets_s': self.offsets_s,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'altitude_km': self.altitude_km,
+            'position_km': self.position_km
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Trajectory':
+        """Rebuild a trajectory from the output of to_dict"""
+        return cls(
+            data['satellite'], datetime.fromisoformat(data['epoch']),
+            data['offsets_s'], data['latitude'], data['longitude'],
+            data['altitude_km'], data['position_km']
+        )
+
+    def czml_cartographic_degrees(self, epoch_offset_s: float = 0.0) -> np.ndarray:
+        """Flattened [t, lon, lat, height_m, ...] samples for a CZML position packet
+
+        Times are seconds relative to the packet epoch (plus ``epoch_offset_s``
+        when the packet epoch differs from this trajectory's epoch).
+        """
+        samples = np.empty((len(self), 4), dtype=np.float64)
+        samples[:, 0] = self.offsets_s + epoch_offset_s
+        samples[:, 1] = self.longitude
+        samples[:, 2] = self.latitude
+        samples[:, 3] = self.altitude_km * 1000.0
+        return samples.ravel()
@@ -245,7 +245,7 @@ class RealTimeServer:
                             'start_time': window.start_time.isoformat() + 'Z',
                             'end_time': window.end_time.isoformat() + 'Z',
                             'duration_minutes': window.duration_minutes,
-                            'max_elevation': round(window.max_elevation_degrees, 2),
+                            'max_elevation': round(window.max_elevation, 2),
                             'quality_score': round(window.quality_score, 3)
                         })
         except Exception as e:
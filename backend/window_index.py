@@ -0,0 +1,257 @@
+"""
+Window Index
+Per-station and per-satellite interval index over communication windows
+
+Each ground station and each satellite keeps its windows in start-sorted
+lists. Contact windows have a bounded length (a LEO pass lasts minutes), so
+every window overlapping [t1, t2) starts in (t1 - longest window, t2). Two
+bisections find that run, making overlap and range queries O(log n + k).
+Conflict detection is a sweep over the same lists: O(n + conflicts).
+
+Windows can be inserted incrementally and expired as the horizon rolls
+forward. Rows live in a growable WINDOW_DTYPE array, so query results come
+back as ordinary WindowSets.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+
+from communication_windows import CommunicationWindow, WindowSet, WINDOW_DTYPE, _to_datetime64
+
+
+def _microseconds(moment: Union[datetime, np.datetime64]) -> int:
+    if isinstance(moment, datetime):
+        moment = _to_datetime64(moment)
+    return int(np.datetime64(moment, 'us').view(np.int64))
+
+
+class _IntervalList:
+    """Windows of one station or satellite, sorted by start (microseconds)"""
+
+    __slots__ = ('starts', 'ends', 'rows', 'max_length')
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.rows: List[int] = []
+        self.max_length = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def insert_many(self, starts: np.ndarray, ends: np.ndarray, rows: np.ndarray) -> None:
+        """Insert start-sorted windows; appending past the current end is O(m)"""
+        if len(rows) == 0:
+            return
+        self.max_length = max(self.max_length, int((ends - starts).max()))
+        if not self.starts or int(starts[0]) >= self.starts[-1]:
+            self.starts.extend(starts.tolist())
+            self.ends.extend(ends.tolist())
+            self.rows.extend(rows.tolist())
+            return
+        merged_starts = np.concatenate([np.array(self.starts, dtype=np.int64), starts])
+        order = np.argsort(merged_starts, kind='stable')
+        self.starts = merged_starts[order].tolist()
+        self.ends = np.concatenate([np.array(self.ends, dtype=np.int64), ends])[order].tolist()
+        self.rows = np.concatenate([np.array(self.rows, dtype=np.int64), rows])[order].tolist()
+
+    def query(self, start: int, end: int) -> List[int]:
+        """Rows of windows overlapping [start, end)"""
+        lo = bisect_right(self.starts, start - self.max_length)
+        hi = bisect_left(self.starts, end)
+        ends = self.ends
+        return [self.rows[i] for i in range(lo, hi) if ends[i] > start]
+
+    def expire(self, cutoff: int) -> List[int]:
+        """Drop windows that ended at or before cutoff, returning their rows"""
+        # Everything starting before cutoff - max_length has certainly ended
+        certain = bisect_right(self.starts, cutoff - self.max_length)
+        band = bisect_left(self.starts, cutoff)
+        keep = [i for i in range(certain, band) if self.ends[i] > cutoff]
+        removed = self.rows[:certain] + [self.rows[i] for i in range(certain, band) if self.ends[i] <= cutoff]
+
+        self.starts = [self.starts[i] for i in keep] + self.starts[band:]
+        self.ends = [self.ends[i] for i in keep] + self.ends[band:]
+        self.rows = [self.rows[i] for i in keep] + self.rows[band:]
+        return removed
+
+    def conflicts(self) -> List[tuple]:
+        """(row, row) pairs of overlapping windows"""
+        pairs = []
+        starts, ends, rows = self.starts, self.ends, self.rows
+        for i in range(len(rows)):
+            j = i + 1
+            while j < len(rows) and starts[j] < ends[i]:
+                pairs.append((rows[i], rows[j]))
+                j += 1
+        return pairs
+
+
+class WindowIndex:
+    """Interval index over communication windows, keyed by station and satellite
+
+    ``WindowIndex.from_window_set(ws)`` numbers rows in ``ws`` order, so row
+    ids returned by ``conflict_pairs`` are positions in ``ws``.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.satellite_names: List[str] = []
+        self.station_names: List[str] = []
+        self.tz_aware = False  # Taken from the first windows inserted, as WindowSet results carry it
+        self._satellite_ids: Dict[str, int] = {}
+        self._station_ids: Dict[str, int] = {}
+        self._records = np.empty(self.INITIAL_CAPACITY, dtype=WINDOW_DTYPE)
+        self._alive = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._count = 0
+        self._by_station: Dict[int, _IntervalList] = {}
+        self._by_satellite: Dict[int, _IntervalList] = {}
+
+    @classmethod
+    def from_window_set(cls, window_set: WindowSet) -> 'WindowIndex':
+        index = cls()
+        index.insert(window_set)
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self):
+        return (f"WindowIndex({len(self)} windows, {len(self._by_satellite)} satellites, "
+                f"{len(self._by_station)} stations)")
+
+    @staticmethod
+    def _intern(names: List[str], ids: Dict[str, int], incoming: List[str]) -> np.ndarray:
+        """Map another WindowSet's name table onto this index's ids"""
+        mapping = np.empty(len(incoming), dtype=np.int32)
+        for i, name in enumerate(incoming):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            mapping[i] = ids[name]
+        return mapping
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._records):
+            return
+        capacity = max(needed, 2 * len(self._records))
+        records = np.empty(capacity, dtype=WINDOW_DTYPE)
+        records[:self._size] = self._records[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._records, self._alive = records, alive
+
+    def insert(self, windows: Union[WindowSet, CommunicationWindow, Iterable[CommunicationWindow]]) -> np.ndarray:
+        """Add windows to the index, returning their row ids"""
+        if isinstance(windows, CommunicationWindow):
+            windows = [windows]
+        if not isinstance(windows, WindowSet):
+            windows = WindowSet.from_windows(windows)
+        count = len(windows)
+        rows = np.arange(self._size, self._size + count, dtype=np.int64)
+        if count == 0:
+            return rows
+        if self._count == 0:
+            self.tz_aware = windows.tz_aware
+
+        block = windows.records.copy()
+        block['satellite'] = self._intern(self.satellite_names, self._satellite_ids,
+                                          windows.satellite_names)[block['satellite']]
+        block['station'] = self._intern(self.station_names, self._station_ids,
+                                        windows.station_names)[block['station']]
+        self._reserve(count)
+        self._records[self._size:self._size + count] = block
+        self._alive[self._size:self._size + count] = True
+        self._size += count
+        self._count += count
+
+        starts = block['start'].view(np.int64)
+        ends = block['end'].view(np.int64)
+        for field, lists in (('station', self._by_station), ('satellite', self._by_satellite)):
+            resources = block[field]
+            order = np.lexsort((starts, resources))
+            boundaries = np.flatnonzero(np.diff(resources[order])) + 1
+            for group in np.split(order, boundaries):
+                resource = int(resources[group[0]])
+                lists.setdefault(resource, _IntervalList()).insert_many(starts[group], ends[group], rows[group])
+        return rows
+
+    def expire(self, before: Union[datetime, np.datetime64]) -> int:
+        """Remove windows that ended at or before ``before``; returns how many"""
+        cutoff = _microseconds(before)
+        removed: List[int] = []
+        for lists in (self._by_station, self._by_satellite):
+            for resource, intervals in list(lists.items()):
+                rows = intervals.expire(cutoff)
+                if lists is self._by_station:
+                    removed.extend(rows)
+                if not intervals:
+                    del lists[resource]
+        self._alive[removed] = False
+        self._count -= len(removed)
+        if self._size > self.INITIAL_CAPACITY and self._count < self._size // 2:
+            self._compact()
+        return len(removed)
+
+    def _compact(self) -> None:
+        """Rebuild with only live rows (row ids are renumbered)"""
+        live = self._records[:self._size][self._alive[:self._size]]
+        rebuilt = WindowIndex.from_window_set(WindowSet(live, self.satellite_names, self.station_names,
+                                                        self.tz_aware))
+        self.__dict__.update(rebuilt.__dict__)
+
+    def _rows(self, start: Union[datetime, np.datetime64], end: Union[datetime, np.datetime64],
+              station: Optional[str] = None, satellite: Optional[str] = None) -> np.ndarray:
+        low, high = _microseconds(start), _microseconds(end)
+        if station is not None and satellite is not None:
+            by_station = self._by_station.get(self._station_ids.get(station))
+            if by_station is None or satellite not in self._satellite_ids:
+                return np.empty(0, dtype=np.int64)
+            rows = np.array(by_station.query(low, high), dtype=np.int64)
+            return rows[self._records['satellite'][rows] == self._satellite_ids[satellite]]
+        if station is not None:
+            lists = [self._by_station.get(self._station_ids.get(station))]
+        elif satellite is not None:
+            lists = [self._by_satellite.get(self._satellite_ids.get(satellite))]
+        else:
+            lists = list(self._by_station.values())
+        rows = [row for intervals in lists if intervals is not None for row in intervals.query(low, high)]
+        return np.array(rows, dtype=np.int64)
+
+    def overlapping(self, start: Union[datetime, np.datetime64], end: Union[datetime, np.datetime64],
+                    station: Optional[str] = None, satellite: Optional[str] = None) -> WindowSet:
+        """Windows overlapping [start, end), optionally on one station and/or satellite, by start time"""
+        rows = self._rows(start, end, station, satellite)
+        records = self._records[rows]
+        return WindowSet(records[np.argsort(records['start'], kind='stable')],
+                         self.satellite_names, self.station_names, self.tz_aware)
+
+    def conflicts_with(self, window: CommunicationWindow) -> WindowSet:
+        """Indexed windows that would clash with ``window`` on its station or satellite"""
+        station_rows = self._rows(window.start_time, window.end_time, station=window.station_name)
+        satellite_rows = self._rows(window.start_time, window.end_time, satellite=window.satellite_name)
+        rows = np.union1d(station_rows, satellite_rows)
+        records = self._records[rows]
+        return WindowSet(records[np.argsort(records['start'], kind='stable')],
+                         self.satellite_names, self.station_names, self.tz_aware)
+
+    def conflict_pairs(self, field: str = 'station') -> np.ndarray:
+        """(P, 2) row pairs of windows overlapping on the same station or satellite"""
+        lists = self._by_station if field == 'station' else self._by_satellite
+        pairs = [pair for intervals in lists.values() for pair in intervals.conflicts()]
+        return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+    def conflict_counts(self) -> np.ndarray:
+        """Per-row number of station plus satellite conflicts"""
+        pairs = np.concatenate([self.conflict_pairs('station'), self.conflict_pairs('satellite')])
+        return np.bincount(pairs.ravel(), minlength=self._size)
+
+    def window_set(self) -> WindowSet:
+        """Every live window, in row order"""
+        return WindowSet(self._records[:self._size][self._alive[:self._size]],
+                         self.satellite_names, self.station_names, self.tz_aware)
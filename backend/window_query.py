@@ -0,0 +1,151 @@
+"""
+Window Query
+Server-side filtering and cursor pagination over a WindowSet
+
+Pages are cut with keyset pagination: windows are ordered by
+(sort field, satellite, station, start), and the cursor is the key of the
+last window on the previous page. The next page is everything strictly after
+that key. Cursors therefore stay valid when the underlying windows change
+between requests (a pass store refresh, for example). Nothing is skipped or
+repeated among windows that existed on both pages.
+
+``paginate`` cuts pages from an in-memory WindowSet; ``keyset_sql`` gives
+the same ordering and cut as SQL, so the pass store can return a page with
+``ORDER BY ... LIMIT`` without loading the rest of the range. Cursors from
+either are interchangeable.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import base64
+import json
+import numpy as np
+
+from communication_windows import WindowSet
+
+SORT_FIELDS = ('start', 'end', 'duration_minutes', 'max_elevation', 'quality_score')
+# Column holding each sort field in a pass store page query (quality_score is computed in the query)
+SORT_COLUMNS = {'start': 'start_us', 'end': 'end_us', 'duration_minutes': 'duration_minutes',
+                'max_elevation': 'max_elevation', 'quality_score': 'quality_score'}
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+
+def encode_cursor(sort: str, descending: bool, key: List) -> str:
+    payload = json.dumps({'sort': sort, 'desc': descending, 'key': key}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+# Cursor key types (primary, satellite, station, start); bool is rejected separately as it subclasses int
+CURSOR_KEY_TYPES = ((int, float), str, str, int)
+
+
+def decode_cursor(cursor: str) -> Dict:
+    """Parse a cursor from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        key = payload.get('key')
+        if not isinstance(key, list) or len(key) != 4:
+            raise ValueError
+        if any(isinstance(value, bool) or not isinstance(value, types)
+               for value, types in zip(key, CURSOR_KEY_TYPES)):
+            raise ValueError
+        return payload
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def cursor_key(cursor: str, sort: str, descending: bool) -> List:
+    """Key of a cursor, raising ValueError if it is malformed or was issued for another sort order"""
+    payload = decode_cursor(cursor)
+    if payload.get('sort') != sort or bool(payload.get('desc')) != descending:
+        raise ValueError('Cursor does not match the requested sort order')
+    return payload['key']
+
+
+def _check_sort(sort: str) -> None:
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Unknown sort field '{sort}' (expected one of {', '.join(SORT_FIELDS)})")
+
+
+def keyset_sql(sort: str = 'start', descending: bool = False,
+               cursor: Optional[str] = None) -> Tuple[Optional[str], List, str]:
+    """(WHERE condition or None, its parameters, ORDER BY) for the page after ``cursor`` in SQL
+
+    Orders like paginate: the sort column (descending if requested), then
+    satellite, station and start ascending. The query must expose the
+    columns named in SORT_COLUMNS plus satellite and station.
+    """
+    _check_sort(sort)
+    column = SORT_COLUMNS[sort]
+    order_by = f'{column}{" DESC" if descending else ""}, satellite, station, start_us'
+    if not cursor:
+        return None, [], order_by
+    key = cursor_key(cursor, sort, descending)
+    if descending:
+        # Cursor keys hold the negated primary value (see _sort_keys)
+        return (f'({column} < ? OR ({column} = ? AND (satellite, station, start_us) > (?, ?, ?)))',
+                [-key[0], -key[0], *key[1:]], order_by)
+    return f'({column}, satellite, station, start_us) > (?, ?, ?, ?)', list(key), order_by
+
+
+def row_cursor(sort: str, descending: bool, value, satellite: str, station: str, start_us: int) -> str:
+    """Cursor continuing after a row of a keyset_sql page (``value`` is the row's sort column)"""
+    return encode_cursor(sort, descending, [-value if descending else value, satellite, station, start_us])
+
+
+def filter_windows(window_set: WindowSet, min_elevation: Optional[float] = None,
+                   min_quality: Optional[float] = None) -> WindowSet:
+    """Keep windows peaking at min_elevation or higher and scoring at least min_quality
+
+    Quality is read from the set's quality_score column, so score the set first.
+    """
+    mask = np.ones(len(window_set), dtype=bool)
+    if min_elevation is not None:
+        mask &= window_set.records['max_elevation'] >= min_elevation
+    if min_quality is not None:
+        mask &= window_set.records['quality_score'] >= min_quality
+    return window_set if mask.all() else window_set.filter(mask)
+
+
+def _sort_keys(window_set: WindowSet, sort: str, descending: bool) -> Tuple[np.ndarray, ...]:
+    """(primary, satellite name, station name, start) keys, primary negated for descending order"""
+    values = window_set.records[sort]
+    if values.dtype.kind == 'M':
+        values = values.view(np.int64)
+    primary = -values if descending else values
+    # Unicode (not object) name columns so lexsort and comparisons stay vectorized
+    satellites = np.asarray(window_set.satellite_names, dtype=str)[window_set.records['satellite']]
+    stations = np.asarray(window_set.station_names, dtype=str)[window_set.records['station']]
+    return primary, satellites, stations, window_set.records['start'].view(np.int64)
+
+
+def _after(keys: Tuple[np.ndarray, ...], cursor_key: List) -> np.ndarray:
+    """Vectorized lexicographic keys > cursor_key"""
+    greater = np.zeros(len(keys[0]), dtype=bool)
+    equal = np.ones(len(keys[0]), dtype=bool)
+    for column, value in zip(keys, cursor_key):
+        greater |= equal & (column > value)
+        equal &= column == value
+    return greater
+
+
+def paginate(window_set: WindowSet, sort: str = 'start', descending: bool = False,
+             limit: Optional[int] = DEFAULT_PAGE_SIZE,
+             cursor: Optional[str] = None) -> Tuple[WindowSet, Optional[str]]:
+    """One page of windows in sort order and the cursor for the next (None on the last page)
+
+    ``limit=None`` returns everything after the cursor.
+    """
+    _check_sort(sort)
+    keys = _sort_keys(window_set, sort, descending)
+    order = np.lexsort(keys[::-1])
+    if cursor:
+        order = order[_after(keys, cursor_key(cursor, sort, descending))[order]]
+
+    if limit is None or len(order) <= limit:
+        return window_set[order], None
+    page = order[:limit]
+    last = page[-1]
+    next_cursor = encode_cursor(sort, descending, [keys[0][last].item(), str(keys[1][last]),
+                                                   str(keys[2][last]), int(keys[3][last])])
+    return window_set[page], next_cursor
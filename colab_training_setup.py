@@ -20,23 +20,47 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 import gymnasium as gym
 from gymnasium import spaces
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import pickle
 import random
+import sys
+
+# Run from a repository checkout, the shared modules are imported from backend/;
+# in Colab they are uploaded next to the notebook instead
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(globals().get('__file__', 'notebook'))), 'backend')
+if os.path.isdir(BACKEND_DIR) and BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Memory-mapped scenario store (pure NumPy) - upload backend/scenario_store.py next to this notebook
+from scenario_store import ScenarioStore, PRIORITY_LEVELS
+# Observation features shared with the API server - upload backend/scheduling_features.py as well
+from scheduling_features import (OBSERVATION_SIZE, WINDOWS_PER_OBSERVATION, FEATURES_PER_WINDOW,
+                                 build_observations, category_table, window_feature_matrix,
+                                 window_quality_score)
+
+# Simplified pass model: each satellite is visible for ~15 minutes every orbit
+VISIBILITY_WINDOW_MINUTES = 15
+MIN_ELEVATION_DEGREES = 10
+PRIORITY_BONUS = np.array([1.0, 1.5, 2.0], dtype=np.float32)  # Reward multiplier per level
 
 # Simplified satellite tracker for Colab (no external dependencies)
 class SimpleSatelliteTracker:
     """Simplified satellite simulation for training data generation"""
     
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
         self.satellites = {}
         self.ground_stations = {}
+        self.rng = rng if rng is not None else np.random.default_rng()
         
     def add_satellite(self, name: str, orbit_period_minutes: float = 90):
         """Add satellite with simplified orbital parameters"""
         self.satellites[name] = {
             'orbit_period': orbit_period_minutes,
-            'phase_offset': random.uniform(0, 360),  # Random starting position
-            'inclination': random.uniform(45, 90),   # Orbital inclination
-            'data_priority': random.choice(['low', 'medium', 'high'])
+            'phase_offset': self.rng.uniform(0, 360),  # Random starting position
+            'inclination': self.rng.uniform(45, 90),   # Orbital inclination
+            'data_priority': PRIORITY_LEVELS[self.rng.integers(len(PRIORITY_LEVELS))]
         }
         
     def add_ground_station(self, name: str, lat: float, lon: float):
@@ -44,48 +68,97 @@ class SimpleSatelliteTracker:
         self.ground_stations[name] = {
             'lat': lat, 'lon': lon,
             'availability': 1.0,  # 100% available initially
-            'capacity': random.uniform(0.8, 1.2)  # Relative capacity
+            'capacity': self.rng.uniform(0.8, 1.2)  # Relative capacity
         }
         
-    def get_satellite_visibility(self, sat_name: str, station_name: str, time_minutes: float) -> Dict:
-        """Calculate if satellite is visible from ground station"""
-        sat = self.satellites[sat_name]
+    def _orbit_times(self, time_minutes: np.ndarray, satellite_names: List[str]) -> np.ndarray:
+        """(T, S) minutes elapsed in each satellite's current orbit"""
+        periods = np.array([self.satellites[s]['orbit_period'] for s in satellite_names], dtype=np.float64)
+        phases = np.array([self.satellites[s]['phase_offset'] for s in satellite_names], dtype=np.float64)
+        t = np.asarray(time_minutes, dtype=np.float64)[:, None]
         
         # Simplified orbital position calculation
-        orbital_position = (time_minutes / sat['orbit_period']) * 360 + sat['phase_offset']
-        orbital_position = orbital_position % 360
+        orbital_position = ((t / periods) * 360 + phases) % 360
+        return ((orbital_position / 360) * periods) % periods
         
-        # Simplified visibility calculation (realistic enough for training)
-        # Satellite is visible for ~15 minutes every orbit
-        visibility_window = 15  # minutes
-        orbit_fraction = (orbital_position % 360) / 360
+    def visibility_tensors(self, time_minutes: np.ndarray,
+                           satellite_names: Optional[List[str]] = None,
+                           station_names: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense visibility for every (time, satellite, station) cell in one pass
         
-        # Check if we're in a visibility window
-        is_visible = (orbit_fraction * sat['orbit_period']) % sat['orbit_period'] < visibility_window
+        Returns ``visible`` as a (T, S, G) bool array and ``elevation`` as a
+        (T, S, G) float32 array in degrees (0 outside a pass).
+        """
+        satellite_names = list(self.satellites) if satellite_names is None else satellite_names
+        station_names = list(self.ground_stations) if station_names is None else station_names
+        orbit_time = self._orbit_times(time_minutes, satellite_names)
+        
+        # Satellite is visible for the first ~15 minutes of every orbit, peaking mid-pass
+        in_window = orbit_time < VISIBILITY_WINDOW_MINUTES
+        window_progress = (orbit_time % VISIBILITY_WINDOW_MINUTES) / VISIBILITY_WINDOW_MINUTES
+        elevation = np.where(in_window, 90 * np.sin(window_progress * np.pi), 0.0)
+        visible = in_window & (elevation > MIN_ELEVATION_DEGREES)
+        
+        # The simplified model has no station geometry, so every station sees the same pass
+        shape = orbit_time.shape + (len(station_names),)
+        return (np.ascontiguousarray(np.broadcast_to(visible[:, :, None], shape)),
+                np.ascontiguousarray(np.broadcast_to(elevation.astype(np.float32)[:, :, None], shape)))
+        
+    def get_satellite_visibility(self, sat_name: str, station_name: str, time_minutes: float) -> Dict:
+        """Calculate if satellite is visible from ground station (single cell)"""
+        times = np.array([time_minutes], dtype=np.float64)
+        visible, elevation = self.visibility_tensors(times, [sat_name], [station_name])
+        orbit_time = float(self._orbit_times(times, [sat_name])[0, 0])
         
-        # Calculate elevation (simplified)
-        if is_visible:
-            window_progress = ((orbit_fraction * sat['orbit_period']) % visibility_window) / visibility_window
-            elevation = 90 * np.sin(window_progress * np.pi)  # Peak at middle of window
-        else:
-            elevation = 0
-            
         return {
-            'visible': is_visible and elevation > 10,  # Minimum 10° elevation
-            'elevation': elevation,
-            'duration_remaining': visibility_window - (window_progress * visibility_window) if is_visible else 0
+            'visible': bool(visible[0, 0, 0]),  # Minimum 10° elevation
+            'elevation': float(elevation[0, 0, 0]),
+            'duration_remaining': VISIBILITY_WINDOW_MINUTES - orbit_time if orbit_time < VISIBILITY_WINDOW_MINUTES else 0
         }
 
 # ============================================================================
 # CELL 3: Training Data Generator
 # ============================================================================
 
+def _generate_scenario_range(seed: int, start: int, stop: int, duration_hours: int) -> List[Dict]:
+    """Worker task: scenarios [start, stop) of the dataset seeded by ``seed``"""
+    generator = SatelliteSchedulingDataGenerator(seed)
+    return [generator.generate_scenario(duration_hours, index=i) for i in range(start, stop)]
+
+def _write_scenario_shard(seed: int, start: int, stop: int, duration_hours: int, path: str) -> int:
+    """Worker task: generate scenarios [start, stop) straight into a shard file"""
+    scenarios = _generate_scenario_range(seed, start, stop, duration_hours)
+    with open(path, 'wb') as f:
+        pickle.dump(scenarios, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(scenarios)
+
+def _fill_store_range(seed: int, start: int, stop: int, duration_hours: int, path: str) -> int:
+    """Worker task: generate scenarios [start, stop) into a preallocated store"""
+    generator = SatelliteSchedulingDataGenerator(seed)
+    store = ScenarioStore(path, mode='r+')
+    for i in range(start, stop):
+        store.write(i, generator.generate_scenario(duration_hours, index=i))
+    store.flush()
+    return stop - start
+
 class SatelliteSchedulingDataGenerator:
-    """Generate training scenarios for DRL"""
+    """Generate training scenarios for DRL
     
-    def __init__(self):
-        self.tracker = SimpleSatelliteTracker()
+    All randomness is derived from one master ``seed``: the constellation
+    from one child seed and scenario ``i`` from its own child seed, so any
+    scenario can be regenerated by index, in any process, in any order.
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        # Draw (and remember) fresh entropy when no seed is given
+        self.seed = int(np.random.SeedSequence(seed).entropy)
+        self.tracker = SimpleSatelliteTracker(np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(0,))))
         self.setup_constellation()
+        self._adhoc_rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(2,)))
+        
+    def scenario_rng(self, index: int) -> np.random.Generator:
+        """Independent random stream for scenario ``index``"""
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(1, index)))
         
     def setup_constellation(self):
         """Setup sample satellite constellation"""
@@ -109,177 +182,284 @@ class SatelliteSchedulingDataGenerator:
         for station_name, lat, lon in stations:
             self.tracker.add_ground_station(station_name, lat, lon)
             
-    def generate_scenario(self, duration_hours: int = 6) -> Dict:
-        """Generate one training scenario"""
+    def generate_scenario(self, duration_hours: int = 6, index: Optional[int] = None) -> Dict:
+        """Generate one training scenario (reproducible when ``index`` is given)
+        
+        Visibility is stored as dense tensors indexed [time step, satellite,
+        station]: ``visible`` (T, S, G) bool and ``elevation`` (T, S, G)
+        float32. Per-satellite data requirements are also kept as (S,) arrays
+        so the environment never has to walk dictionaries.
+        """
         duration_minutes = duration_hours * 60
-        time_steps = list(range(0, duration_minutes, 5))  # 5-minute intervals
+        time_steps = np.arange(0, duration_minutes, 5, dtype=np.int32)  # 5-minute intervals
+        satellites = list(self.tracker.satellites.keys())
+        stations = list(self.tracker.ground_stations.keys())
+        
+        visible, elevation = self.tracker.visibility_tensors(time_steps, satellites, stations)
+        rng = self.scenario_rng(index) if index is not None else self._adhoc_rng
         
         scenario = {
-            'satellites': list(self.tracker.satellites.keys()),
-            'ground_stations': list(self.tracker.ground_stations.keys()),
+            'index': index,
+            'seed': self.seed,
+            'satellites': satellites,
+            'ground_stations': stations,
             'duration_minutes': duration_minutes,
             'time_steps': time_steps,
-            'visibility_matrix': {},
+            'visible': visible,
+            'elevation': elevation,
             'data_requirements': {}
         }
-        
-        # Generate visibility data for each time step
-        for t in time_steps:
-            scenario['visibility_matrix'][t] = {}
-            for sat_name in scenario['satellites']:
-                scenario['visibility_matrix'][t][sat_name] = {}
-                for station_name in scenario['ground_stations']:
-                    visibility = self.tracker.get_satellite_visibility(sat_name, station_name, t)
-                    scenario['visibility_matrix'][t][sat_name][station_name] = visibility
                     
         # Generate data requirements for each satellite
-        for sat_name in scenario['satellites']:
+        for sat_name in satellites:
             sat_data = self.tracker.satellites[sat_name]
             priority_multiplier = {'low': 0.5, 'medium': 1.0, 'high': 2.0}[sat_data['data_priority']]
             
             scenario['data_requirements'][sat_name] = {
-                'total_data_mb': random.uniform(100, 1000) * priority_multiplier,
+                'total_data_mb': rng.uniform(100, 1000) * priority_multiplier,
                 'priority': sat_data['data_priority'],
-                'deadline_hours': random.uniform(2, 8)
+                'deadline_hours': rng.uniform(2, 8)
             }
+        
+        requirements = scenario['data_requirements']
+        scenario['total_data_mb'] = np.array([requirements[s]['total_data_mb'] for s in satellites])
+        scenario['priority'] = np.array([PRIORITY_LEVELS.index(requirements[s]['priority']) for s in satellites],
+                                        dtype=np.int8)
             
         return scenario
         
-    def generate_training_dataset(self, num_scenarios: int = 1000) -> List[Dict]:
-        """Generate multiple training scenarios"""
-        print(f"Generating {num_scenarios} training scenarios...")
-        scenarios = []
+    def _ranges(self, num_scenarios: int, chunk_size: int) -> List[Tuple[int, int]]:
+        return [(start, min(start + chunk_size, num_scenarios))
+                for start in range(0, num_scenarios, chunk_size)]
+        
+    def generate_training_dataset(self, num_scenarios: int = 1000, workers: Optional[int] = None,
+                                  duration_hours: int = 6) -> List[Dict]:
+        """Generate scenarios 0..num_scenarios-1 across a process pool
+        
+        The result is identical for any ``workers`` count (1 runs serially).
+        """
+        workers = workers or os.cpu_count() or 1
+        print(f"Generating {num_scenarios} training scenarios on {workers} worker(s)...")
         
-        for i in range(num_scenarios):
-            if i % 100 == 0:
-                print(f"Generated {i}/{num_scenarios} scenarios")
-            scenario = self.generate_scenario()
-            scenarios.append(scenario)
+        if workers == 1:
+            scenarios = _generate_scenario_range(self.seed, 0, num_scenarios, duration_hours)
+        else:
+            chunk_size = max(1, -(-num_scenarios // (workers * 4)))
+            ranges = self._ranges(num_scenarios, chunk_size)
+            scenarios = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk in pool.map(_generate_scenario_range, [self.seed] * len(ranges),
+                                      [start for start, _ in ranges], [stop for _, stop in ranges],
+                                      [duration_hours] * len(ranges)):
+                    scenarios.extend(chunk)
             
         print(f"Dataset generation complete: {len(scenarios)} scenarios")
         return scenarios
+        
+    def write_training_shards(self, output_dir: str, num_scenarios: int, shard_size: int = 1000,
+                              workers: Optional[int] = None, duration_hours: int = 6) -> Dict:
+        """Generate scenarios in parallel straight into on-disk shards
+        
+        Each worker writes ``scenarios_<start>.pkl`` holding scenarios
+        [start, start + shard_size), so memory stays bounded by the shard
+        size. A ``manifest.json`` records the seed and shard layout.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        workers = workers or os.cpu_count() or 1
+        ranges = self._ranges(num_scenarios, shard_size)
+        shards = [{'start': start, 'stop': stop, 'file': f"scenarios_{start:08d}.pkl"} for start, stop in ranges]
+        print(f"Writing {num_scenarios} scenarios to {len(shards)} shard(s) on {workers} worker(s)...")
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_write_scenario_shard, self.seed, shard['start'], shard['stop'],
+                                   duration_hours, os.path.join(output_dir, shard['file']))
+                       for shard in shards]
+            for done, future in enumerate(futures, 1):
+                future.result()
+                if done % 10 == 0 or done == len(futures):
+                    print(f"Wrote {done}/{len(futures)} shards")
+        
+        manifest = {
+            'seed': self.seed,
+            'num_scenarios': num_scenarios,
+            'duration_hours': duration_hours,
+            'shard_size': shard_size,
+            'shards': shards
+        }
+        with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+        
+    def write_training_store(self, path: str, num_scenarios: int, workers: Optional[int] = None,
+                             duration_hours: int = 6, chunk_size: int = 1000) -> ScenarioStore:
+        """Generate scenarios in parallel into a memory-mapped ScenarioStore
+        
+        The store's arrays are preallocated here; workers open them in place
+        and fill disjoint index ranges, so nothing is held in RAM.
+        """
+        template = self.generate_scenario(duration_hours, index=0)
+        ScenarioStore.create(path, num_scenarios, template['satellites'], template['ground_stations'],
+                             template['time_steps'], template['duration_minutes'], self.seed)
+        workers = workers or os.cpu_count() or 1
+        ranges = self._ranges(num_scenarios, chunk_size)
+        print(f"Writing {num_scenarios} scenarios to {path} on {workers} worker(s)...")
+        
+        if workers == 1:
+            for start, stop in ranges:
+                _fill_store_range(self.seed, start, stop, duration_hours, path)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_fill_store_range, [self.seed] * len(ranges),
+                              [start for start, _ in ranges], [stop for _, stop in ranges],
+                              [duration_hours] * len(ranges), [path] * len(ranges)))
+        
+        print(f"Dataset generation complete: {num_scenarios} scenarios")
+        return ScenarioStore(path)
 
 # ============================================================================
 # CELL 4: DRL Environment Definition
 # ============================================================================
 
+def pass_minutes_remaining(visible: np.ndarray, step_minutes: float) -> np.ndarray:
+    """Minutes left in the current pass for every (..., T, S, G) visibility cell
+
+    0 where the satellite is not visible; otherwise the length of the visible
+    run from that step on, capped at VISIBILITY_WINDOW_MINUTES.
+    """
+    remaining = np.zeros(visible.shape, dtype=np.float32)
+    running = np.zeros(visible.shape[:-3] + visible.shape[-2:], dtype=np.float32)
+    for t in range(visible.shape[-3] - 1, -1, -1):
+        running = (running + step_minutes) * visible[..., t, :, :]
+        remaining[..., t, :, :] = running
+    return np.minimum(remaining, VISIBILITY_WINDOW_MINUTES)
+
+def candidate_slots(candidates: np.ndarray) -> np.ndarray:
+    """(B, WINDOWS_PER_OBSERVATION) flat (satellite, station) pair index per observation slot
+
+    ``candidates`` is a (B, S, G) mask of the passes that could be scheduled
+    right now. They fill the slots in catalog order (satellite-major); slots
+    past the last candidate hold -1.
+    """
+    num_envs = candidates.shape[0]
+    flat = candidates.reshape(num_envs, -1)
+    slots = np.full((num_envs, WINDOWS_PER_OBSERVATION), -1, dtype=np.int64)
+    order = np.argsort(~flat, axis=1, kind='stable')[:, :WINDOWS_PER_OBSERVATION]  # Candidates first
+    slots[:, :order.shape[1]] = np.where(np.take_along_axis(flat, order, axis=1), order, -1)
+    return slots
+
+def slot_observations(slots: np.ndarray, elevation: np.ndarray, pass_minutes: np.ndarray,
+                      satellite_flags: np.ndarray) -> np.ndarray:
+    """(B, OBSERVATION_SIZE) policy observations for the candidate passes in ``slots``
+
+    Each slot is encoded with the API server's feature builder (pass minutes
+    left, elevation, satellite class, quality), so training and serving
+    observations cannot drift apart. Empty slots are zero.
+    """
+    num_envs, _, num_stations = elevation.shape
+    filled = slots >= 0
+    pairs = np.where(filled, slots, 0)
+    duration = np.take_along_axis(pass_minutes.reshape(num_envs, -1), pairs, axis=1).ravel()
+    max_elevation = np.take_along_axis(elevation.reshape(num_envs, -1), pairs, axis=1).ravel()
+    features = window_feature_matrix(duration, max_elevation, satellite_flags[pairs.ravel() // num_stations],
+                                     window_quality_score(duration, max_elevation))
+    features *= filled.reshape(-1, 1)
+    return build_observations(features, np.arange(num_envs) * WINDOWS_PER_OBSERVATION)
+
+def scenario_step_minutes(time_steps: np.ndarray) -> float:
+    """Spacing of a scenario's time steps in minutes"""
+    return float(time_steps[1] - time_steps[0]) if len(time_steps) > 1 else 5.0
+
 class SatelliteSchedulingEnv(gym.Env):
-    """Gymnasium environment for satellite scheduling"""
+    """Gymnasium environment for satellite scheduling
+    
+    Each step the passes that could be scheduled now (visible, station free,
+    satellite data left) fill the observation's 10 window slots. The action
+    is one priority in [-1, 1] per slot, the same output the API server
+    reads from the policy; the env transmits on the highest-priority slot for
+    the rest of that pass (5-15 minutes). Picking an empty slot while
+    candidates exist is a conflict.
+    """
     
     def __init__(self, scenario: Dict):
         super().__init__()
         self.scenario = scenario
-        self.reset()
-        
-        # Define action and observation spaces
-        num_satellites = len(scenario['satellites'])
-        num_stations = len(scenario['ground_stations'])
         
-        # Action: [satellite_id, station_id, duration_minutes]
+        # Action: priority of each observation slot
         self.action_space = spaces.Box(
-            low=np.array([0, 0, 5]),  # Min: sat 0, station 0, 5 min duration
-            high=np.array([num_satellites-1, num_stations-1, 15]),  # Max: last sat/station, 15 min
-            dtype=np.float32
+            low=-1, high=1, shape=(WINDOWS_PER_OBSERVATION,), dtype=np.float32
         )
         
-        # Observation: [satellite_data_remaining, station_availability, current_time, visibility_matrix]
-        obs_size = num_satellites + num_stations + 1 + (num_satellites * num_stations)
+        # Observation: the API server's 10 windows x 5 features over the schedulable passes
         self.observation_space = spaces.Box(
-            low=0, high=1, shape=(obs_size,), dtype=np.float32
+            low=0, high=1, shape=(OBSERVATION_SIZE,), dtype=np.float32
         )
+        self.satellite_flags = category_table(scenario['satellites'])
+        self.pass_minutes = pass_minutes_remaining(scenario['visible'],
+                                                   scenario_step_minutes(scenario['time_steps']))
+        self.reset()
         
     def reset(self, seed=None, options=None):
         """Reset environment to initial state"""
         super().reset(seed=seed)
         
         self.current_time_step = 0
-        self.satellite_data_remaining = {}
-        self.station_busy_until = {}
         self.total_data_transferred = 0
         self.scheduling_conflicts = 0
         
-        # Initialize satellite data requirements
-        for sat_name in self.scenario['satellites']:
-            req = self.scenario['data_requirements'][sat_name]
-            self.satellite_data_remaining[sat_name] = req['total_data_mb']
-            
-        # Initialize station availability
-        for station_name in self.scenario['ground_stations']:
-            self.station_busy_until[station_name] = 0
+        # Satellite data requirements and station availability as arrays
+        self.satellite_data_remaining = self.scenario['total_data_mb'].astype(np.float64)
+        self.station_busy_until = np.zeros(len(self.scenario['ground_stations']), dtype=np.float64)
             
         return self._get_observation(), {}
         
-    def _get_observation(self) -> np.ndarray:
-        """Get current state observation"""
-        obs = []
-        
-        # Satellite data remaining (normalized)
-        for sat_name in self.scenario['satellites']:
-            original_data = self.scenario['data_requirements'][sat_name]['total_data_mb']
-            remaining_ratio = self.satellite_data_remaining[sat_name] / original_data
-            obs.append(remaining_ratio)
-            
-        # Station availability (0 = busy, 1 = available)
-        current_time = self.scenario['time_steps'][self.current_time_step]
-        for station_name in self.scenario['ground_stations']:
-            available = 1.0 if self.station_busy_until[station_name] <= current_time else 0.0
-            obs.append(available)
-            
-        # Current time (normalized)
-        time_progress = self.current_time_step / len(self.scenario['time_steps'])
-        obs.append(time_progress)
+    def _time_index(self) -> int:
+        """Current time step, held at the last step once the episode has ended"""
+        return min(self.current_time_step, len(self.scenario['time_steps']) - 1)
         
-        # Visibility matrix (flattened)
-        current_time = self.scenario['time_steps'][self.current_time_step]
-        visibility_data = self.scenario['visibility_matrix'][current_time]
-        
-        for sat_name in self.scenario['satellites']:
-            for station_name in self.scenario['ground_stations']:
-                visible = 1.0 if visibility_data[sat_name][station_name]['visible'] else 0.0
-                obs.append(visible)
-                
-        return np.array(obs, dtype=np.float32)
+    def _get_observation(self) -> np.ndarray:
+        """Get current state observation (and remember which pass each slot holds)"""
+        t = self._time_index()
+        candidates = (self.scenario['visible'][t]
+                      & (self.station_busy_until <= self.scenario['time_steps'][t])[None, :]
+                      & (self.satellite_data_remaining > 0)[:, None])
+        self.slots = candidate_slots(candidates[None])[0]
+        return slot_observations(self.slots[None], self.scenario['elevation'][t][None],
+                                 self.pass_minutes[t][None], self.satellite_flags)[0]
         
     def step(self, action):
         """Execute action and return next state"""
-        sat_idx = int(action[0])
-        station_idx = int(action[1])
-        duration = max(5, min(15, action[2]))  # Clamp duration between 5-15 minutes
+        pair = self.slots[int(np.argmax(action))]
         
-        sat_name = self.scenario['satellites'][sat_idx]
-        station_name = self.scenario['ground_stations'][station_idx]
-        current_time = self.scenario['time_steps'][self.current_time_step]
+        t = self._time_index()
+        current_time = self.scenario['time_steps'][t]
         
         reward = 0
         done = False
         
-        # Check if action is valid
-        visibility_data = self.scenario['visibility_matrix'][current_time]
-        is_visible = visibility_data[sat_name][station_name]['visible']
-        station_available = self.station_busy_until[station_name] <= current_time
-        has_data = self.satellite_data_remaining[sat_name] > 0
-        
-        if is_visible and station_available and has_data:
+        # Slots only hold schedulable passes: visible, station free, data left
+        if pair >= 0:
+            sat_idx, station_idx = divmod(int(pair), len(self.station_busy_until))
+            duration = max(5, min(15, self.pass_minutes[t, sat_idx, station_idx]))  # Rest of the pass
+            
             # Valid communication - calculate data transfer
-            elevation = visibility_data[sat_name][station_name]['elevation']
+            elevation = self.scenario['elevation'][t, sat_idx, station_idx]
             transfer_rate = 10 + (elevation / 90) * 20  # 10-30 MB/min based on elevation
             
             data_transferred = min(
                 transfer_rate * duration,
-                self.satellite_data_remaining[sat_name]
+                self.satellite_data_remaining[sat_idx]
             )
             
-            self.satellite_data_remaining[sat_name] -= data_transferred
-            self.station_busy_until[station_name] = current_time + duration
+            self.satellite_data_remaining[sat_idx] -= data_transferred
+            self.station_busy_until[station_idx] = current_time + duration
             self.total_data_transferred += data_transferred
             
             # Reward based on data transferred and priority
-            priority_bonus = {'low': 1.0, 'medium': 1.5, 'high': 2.0}
-            sat_priority = self.scenario['data_requirements'][sat_name]['priority']
-            reward = data_transferred * priority_bonus[sat_priority] / 100  # Normalize
+            priority_bonus = PRIORITY_BONUS[self.scenario['priority'][sat_idx]]
+            reward = float(data_transferred * priority_bonus / 100)  # Normalize
             
-        else:
-            # Invalid action - penalty
+        elif (self.slots >= 0).any():
+            # Empty slot picked while passes were available - penalty
             reward = -0.1
             self.scheduling_conflicts += 1
             
@@ -290,9 +470,7 @@ class SatelliteSchedulingEnv(gym.Env):
         if self.current_time_step >= len(self.scenario['time_steps']):
             done = True
             # Bonus for completing all data transfers
-            total_original_data = sum(
-                req['total_data_mb'] for req in self.scenario['data_requirements'].values()
-            )
+            total_original_data = float(self.scenario['total_data_mb'].sum())
             completion_ratio = self.total_data_transferred / total_original_data
             reward += completion_ratio * 10  # Completion bonus
             
@@ -308,29 +486,194 @@ class SatelliteSchedulingEnv(gym.Env):
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import EvalCallback
+from stable_baselines3.common.vec_env import VecEnv, VecMonitor
+
+class BatchedSatelliteSchedulingEnv(VecEnv):
+    """SatelliteSchedulingEnv stepped for B scenarios at once on array state
+    
+    Same observations, rewards and episode rules as SatelliteSchedulingEnv,
+    but the whole batch lives in arrays: data remaining (B, S), station
+    busy-until (B, G), visibility (B, T, S, G), so one step is a handful of
+    NumPy ops regardless of B. Finished episodes are reset in place onto a
+    new randomly drawn scenario, following the VecEnv auto-reset convention.
+    """
+    
+    def __init__(self, scenarios, num_envs: int = 256, seed: Optional[int] = None):
+        self.scenarios = scenarios  # Scenario list or ScenarioStore
+        self.render_mode = None
+        self.rng = np.random.default_rng(seed)
+        
+        template = scenarios[0]
+        self.time_steps = np.asarray(template['time_steps'], dtype=np.float64)
+        num_steps = len(self.time_steps)
+        num_satellites = len(template['satellites'])
+        num_stations = len(template['ground_stations'])
+        
+        # Per-episode scenario data
+        self.scenario_ids = np.zeros(num_envs, dtype=np.int64)
+        self.visible = np.zeros((num_envs, num_steps, num_satellites, num_stations), dtype=bool)
+        self.elevation = np.zeros((num_envs, num_steps, num_satellites, num_stations), dtype=np.float32)
+        self.pass_minutes = np.zeros((num_envs, num_steps, num_satellites, num_stations), dtype=np.float32)
+        self.satellite_flags = category_table(template['satellites'])
+        self.total_data_mb = np.ones((num_envs, num_satellites))
+        self.priority_bonus = np.ones((num_envs, num_satellites), dtype=np.float32)
+        
+        # Episode state
+        self.current_time_step = np.zeros(num_envs, dtype=np.int64)
+        self.satellite_data_remaining = np.zeros((num_envs, num_satellites))
+        self.station_busy_until = np.zeros((num_envs, num_stations))
+        self.total_data_transferred = np.zeros(num_envs)
+        self.scheduling_conflicts = np.zeros(num_envs, dtype=np.int64)
+        self.slots = np.full((num_envs, WINDOWS_PER_OBSERVATION), -1, dtype=np.int64)
+        self._actions = None
+        
+        single_env = SatelliteSchedulingEnv(template)
+        super().__init__(num_envs, single_env.observation_space, single_env.action_space)
+        
+    def _load_scenarios(self, env_ids: np.ndarray):
+        """Start new episodes for ``env_ids`` on randomly drawn scenarios"""
+        draws = self.rng.integers(len(self.scenarios), size=len(env_ids))
+        for env_id, scenario_id in zip(env_ids, draws):
+            scenario = self.scenarios[int(scenario_id)]
+            self.scenario_ids[env_id] = scenario_id
+            self.visible[env_id] = scenario['visible']
+            self.elevation[env_id] = scenario['elevation']
+            self.total_data_mb[env_id] = scenario['total_data_mb']
+            self.priority_bonus[env_id] = PRIORITY_BONUS[scenario['priority']]
+        self.pass_minutes[env_ids] = pass_minutes_remaining(self.visible[env_ids],
+                                                            scenario_step_minutes(self.time_steps))
+        
+        self.current_time_step[env_ids] = 0
+        self.satellite_data_remaining[env_ids] = self.total_data_mb[env_ids]
+        self.station_busy_until[env_ids] = 0
+        self.total_data_transferred[env_ids] = 0
+        self.scheduling_conflicts[env_ids] = 0
+        
+    def _get_observations(self) -> np.ndarray:
+        """(B, OBSERVATION_SIZE) observations, same layout as SatelliteSchedulingEnv"""
+        envs = np.arange(self.num_envs)
+        t = np.minimum(self.current_time_step, len(self.time_steps) - 1)
+        candidates = (self.visible[envs, t]
+                      & (self.station_busy_until <= self.time_steps[t][:, None])[:, None, :]
+                      & (self.satellite_data_remaining > 0)[:, :, None])
+        self.slots = candidate_slots(candidates)
+        return slot_observations(self.slots, self.elevation[envs, t],
+                                 self.pass_minutes[envs, t], self.satellite_flags)
+        
+    def reset(self) -> np.ndarray:
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self._load_scenarios(np.arange(self.num_envs))
+        return self._get_observations()
+        
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions)
+        
+    def step_wait(self):
+        actions = self._actions
+        num_envs, num_steps, _, num_stations = self.visible.shape
+        envs = np.arange(num_envs)
+        t = np.minimum(self.current_time_step, num_steps - 1)
+        current_time = self.time_steps[t]
+        
+        # Slots only hold schedulable passes: visible, station free, data left
+        pair = self.slots[envs, np.argmax(actions, axis=1)]
+        valid = pair >= 0
+        conflict = ~valid & (self.slots >= 0).any(axis=1)  # Empty slot picked while passes were available
+        sat_idx, station_idx = np.divmod(np.maximum(pair, 0), num_stations)
+        duration = np.clip(self.pass_minutes[envs, t, sat_idx, station_idx], 5, 15)  # Rest of the pass
+        remaining = self.satellite_data_remaining[envs, sat_idx]
+        
+        transfer_rate = 10 + (self.elevation[envs, t, sat_idx, station_idx] / 90) * 20  # 10-30 MB/min
+        data_transferred = np.where(valid, np.minimum(transfer_rate * duration, remaining), 0.0)
+        
+        self.satellite_data_remaining[envs, sat_idx] = remaining - data_transferred
+        self.station_busy_until[envs, station_idx] = np.where(
+            valid, current_time + duration, self.station_busy_until[envs, station_idx])
+        self.total_data_transferred += data_transferred
+        self.scheduling_conflicts += conflict
+        
+        rewards = np.where(valid, data_transferred * self.priority_bonus[envs, sat_idx] / 100,
+                           np.where(conflict, -0.1, 0.0))
+        
+        self.current_time_step += 1
+        dones = self.current_time_step >= num_steps
+        # Completion bonus for finished episodes
+        rewards[dones] += self.total_data_transferred[dones] / self.total_data_mb[dones].sum(axis=1) * 10
+        
+        obs = self._get_observations()
+        infos = [{'data_transferred': float(self.total_data_transferred[i]),
+                  'conflicts': int(self.scheduling_conflicts[i])} for i in range(num_envs)]
+        
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            for i in finished:
+                infos[i]['terminal_observation'] = obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = False
+            self._load_scenarios(finished)
+            obs = self._get_observations()
+            
+        return obs, rewards.astype(np.float32), dones, infos
+        
+    def close(self) -> None:
+        pass
+        
+    def _indices(self, indices) -> List[int]:
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+        
+    def _require_all(self, indices, operation: str) -> List[int]:
+        """Indices for an operation on state shared by every env (partial subsets are rejected)"""
+        selected = self._indices(indices)
+        if sorted(selected) != list(range(self.num_envs)):
+            raise ValueError(f"{operation} applies to all {self.num_envs} batched envs at once, "
+                             f"not to a subset")
+        return selected
+        
+    def get_attr(self, attr_name: str, indices=None) -> List:
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+        
+    def set_attr(self, attr_name: str, value, indices=None) -> None:
+        self._require_all(indices, 'set_attr')
+        setattr(self, attr_name, value)
+        
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List:
+        """Call a method of the batched env once, returning its result for each index"""
+        selected = self._require_all(indices, 'env_method')
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in selected]
+        
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._indices(indices)]
 
-def create_training_env(scenarios: List[Dict]):
-    """Create environment factory for training"""
+def create_training_env(scenarios):
+    """Create environment factory for training (a scenario list or ScenarioStore)"""
     def _init():
         # Randomly select a scenario for each episode
         scenario = random.choice(scenarios)
         return SatelliteSchedulingEnv(scenario)
     return _init
 
-def train_satellite_scheduler(scenarios: List[Dict], total_timesteps: int = 100000):
+def train_satellite_scheduler(scenarios, total_timesteps: int = 100000, n_envs: int = 256,
+                              seed: Optional[int] = None):
     """Train the DRL agent"""
     print("Setting up training environment...")
     
-    # Create vectorized environment
-    env = make_vec_env(create_training_env(scenarios), n_envs=4)
+    # One batched environment steps all n_envs scenarios together
+    env = VecMonitor(BatchedSatelliteSchedulingEnv(scenarios, num_envs=n_envs, seed=seed))
     
-    # Create PPO agent
+    # Create PPO agent (rollouts stay at ~8192 transitions per update whatever n_envs is)
     model = PPO(
         "MlpPolicy",
         env,
         verbose=1,
         learning_rate=3e-4,
-        n_steps=2048,
+        n_steps=max(8, 8192 // n_envs),
         batch_size=64,
         n_epochs=10,
         gamma=0.99,
@@ -354,49 +697,51 @@ def train_satellite_scheduler(scenarios: List[Dict], total_timesteps: int = 1000
 # CELL 6: Execute Training and Save Model
 # ============================================================================
 
-# Generate training data
-print("Step 1: Generating training scenarios...")
-data_generator = SatelliteSchedulingDataGenerator()
-training_scenarios = data_generator.generate_training_dataset(num_scenarios=500)
-
-# Train the model
-print("\nStep 2: Training DRL agent...")
-trained_model = train_satellite_scheduler(training_scenarios, total_timesteps=100000)
-
-# Test the trained model
-print("\nStep 3: Testing trained model...")
-test_scenario = data_generator.generate_scenario()
-test_env = SatelliteSchedulingEnv(test_scenario)
-
-obs, _ = test_env.reset()
-total_reward = 0
-steps = 0
-
-while steps < 50:  # Test for 50 steps
-    action, _ = trained_model.predict(obs, deterministic=True)
-    obs, reward, done, truncated, info = test_env.step(action)
-    total_reward += reward
-    steps += 1
-    
-    if done:
-        break
+TRAINING_SEED = 42  # Scenario i can be regenerated with generate_scenario(index=i)
+NUM_TRAINING_SCENARIOS = 500
 
-print(f"Test completed: {steps} steps, total reward: {total_reward:.2f}")
-print(f"Data transferred: {info.get('data_transferred', 0):.1f} MB")
-print(f"Scheduling conflicts: {info.get('conflicts', 0)}")
+# The guard keeps process-pool workers from re-running training on spawn-based platforms
+if __name__ == "__main__":
+    # Generate training data
+    print("Step 1: Generating training scenarios...")
+    data_generator = SatelliteSchedulingDataGenerator(seed=TRAINING_SEED)
+    # Memory-mapped on disk: envs read scenarios by index, nothing is loaded up front
+    training_scenarios = data_generator.write_training_store("training_scenarios", NUM_TRAINING_SCENARIOS)
 
-# Save the model
-print("\nStep 4: Saving trained model...")
-trained_model.save("satellite_scheduler_model")
+    # Train the model
+    print("\nStep 2: Training DRL agent...")
+    trained_model = train_satellite_scheduler(training_scenarios, total_timesteps=100000, seed=TRAINING_SEED)
 
-# Save training scenarios for later use
-import pickle
-with open("training_scenarios.pkl", "wb") as f:
-    pickle.dump(training_scenarios, f)
+    # Test the trained model
+    print("\nStep 3: Testing trained model...")
+    test_scenario = data_generator.generate_scenario(index=NUM_TRAINING_SCENARIOS)  # Held out from training
+    test_env = SatelliteSchedulingEnv(test_scenario)
+
+    obs, _ = test_env.reset()
+    total_reward = 0
+    steps = 0
+
+    while steps < 50:  # Test for 50 steps
+        action, _ = trained_model.predict(obs, deterministic=True)
+        obs, reward, done, truncated, info = test_env.step(action)
+        total_reward += reward
+        steps += 1
+
+        if done:
+            break
+
+    print(f"Test completed: {steps} steps, total reward: {total_reward:.2f}")
+    print(f"Data transferred: {info.get('data_transferred', 0):.1f} MB")
+    print(f"Scheduling conflicts: {info.get('conflicts', 0)}")
+
+    # Save the model
+    print("\nStep 4: Saving trained model...")
+    trained_model.save("satellite_scheduler_model")
 
-print("\nTraining complete! Download these files:")
-print("1. satellite_scheduler_model.zip (the trained AI model)")
-print("2. training_scenarios.pkl (training data for testing)")
+    # Training scenarios are already saved in the training_scenarios/ store
+    print("\nTraining complete! Download these files:")
+    print("1. satellite_scheduler_model.zip (the trained AI model)")
+    print("2. training_scenarios/ (memory-mapped training data, zip the folder)")
 
 # ============================================================================
 # INSTRUCTIONS FOR COLAB USER
@@ -404,12 +749,13 @@ print("2. training_scenarios.pkl (training data for testing)")
 """
 INSTRUCTIONS:
 1. Copy each section above into separate Colab cells
-2. Run cells 1-6 in order
-3. Training will take 30-60 minutes
-4. Download the generated files:
+2. Upload backend/scenario_store.py and backend/scheduling_features.py to the Colab session
+3. Run cells 1-6 in order
+4. Training will take 30-60 minutes
+5. Download the generated files:
    - satellite_scheduler_model.zip
-   - training_scenarios.pkl
-5. Send these files back to your local project
+   - training_scenarios/ (zip the folder; only its index.json is read by the API)
+6. Send these files back to your local project
 
 The model will learn to:
 - Prioritize high-priority satellite data